@@ -0,0 +1,195 @@
+import sys
+import os
+import re
+import getopt
+import heapq
+import tempfile
+from collections import Counter
+from multiprocessing import Pool
+from dictionary.word_frequency import WordFrequency
+from dictionary.base_dictionary import BaseDictionary
+
+
+# -------------------------------------------------------------------
+# Builds a word frequency data file (the format dictionary_file_based.py reads) from raw text corpora.
+#
+# The corpora are cut into chunks of bytes, which a pool of processes tokenizes and counts independently. The main
+# process merges the partial counts, and whenever the merged vocabulary outgrows a threshold it spills it to disk as
+# a sorted run, so memory stays bounded however large the vocabulary gets. The runs are merged at the end.
+# -------------------------------------------------------------------
+
+# A word is a run of letters, lower-cased, as in the data files.
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+DEFAULT_CHUNK_SIZE_MB = 16
+DEFAULT_MAX_VOCABULARY = 1000000
+
+
+def usage():
+    """
+    Print help/usage message.
+    """
+    print('python3 corpus_ingestion.py', '[-p processes] [-c chunk size in MB] [-m max vocabulary in memory]',
+          '[-n min frequency] <output fileName> <corpus fileName> [corpus fileName ...]')
+    print('defaults: -p <number of CPUs> -c ' + str(DEFAULT_CHUNK_SIZE_MB) + ' -m ' + str(DEFAULT_MAX_VOCABULARY) +
+          ' -n 1')
+    sys.exit(1)
+
+
+def get_chunks(corpus_paths: list, chunk_size: int) -> list:
+    """
+    cut the corpora into byte ranges of about 'chunk_size' bytes, each ending on whitespace so no word is split
+    @param corpus_paths: files to cut
+    @param chunk_size: target number of bytes per chunk
+    @return: list of (path, start offset, end offset)
+    """
+    chunks = []
+
+    for corpus_path in corpus_paths:
+        file_size = os.path.getsize(corpus_path)
+
+        with open(corpus_path, 'rb') as corpus_file:
+            start = 0
+
+            while start < file_size:
+                end = min(start + chunk_size, file_size)
+                corpus_file.seek(end)
+
+                # Move the end forward to the next whitespace byte. A multi-byte character never contains one, so the
+                # cut never falls inside a character either.
+                while end < file_size and not corpus_file.read(1).isspace():
+                    end += 1
+
+                chunks.append((corpus_path, start, end))
+                start = end
+
+    return chunks
+
+
+def count_chunk(chunk: tuple) -> Counter:
+    """
+    count the words in one chunk, run in a worker process
+    @param chunk: (path, start offset, end offset)
+    @return: word counts of the chunk
+    """
+    corpus_path, start, end = chunk
+
+    # Each worker reads its own byte range, so only the offsets and the counts cross between processes.
+    with open(corpus_path, 'rb') as corpus_file:
+        corpus_file.seek(start)
+        text = corpus_file.read(end - start).decode('utf-8', errors='ignore')
+
+    return Counter(WORD_PATTERN.findall(text.lower()))
+
+
+def spill(counts: Counter, spill_directory: str, run_paths: list):
+    # Write the counts as a run sorted by word, so that all runs can later be merged in one streaming pass.
+    run_path = os.path.join(spill_directory, 'run' + str(len(run_paths)))
+
+    with open(run_path, 'w') as run_file:
+        for word in sorted(counts):
+            run_file.write(word + ' ' + str(counts[word]) + '\n')
+
+    run_paths.append(run_path)
+
+
+def read_run(run_path: str):
+    with open(run_path, 'r') as run_file:
+        for line in run_file:
+            word, count = line.split()
+            yield word, int(count)
+
+
+def iter_word_frequencies(corpus_paths: list, processes: int = None, chunk_size_mb: int = DEFAULT_CHUNK_SIZE_MB,
+                          max_vocabulary: int = DEFAULT_MAX_VOCABULARY, min_frequency: int = 1):
+    """
+    count the words of the corpora in parallel
+    @param corpus_paths: raw text files
+    @param processes: number of worker processes, by default one per CPU
+    @param chunk_size_mb: size of the chunks handed to the workers
+    @param max_vocabulary: number of distinct words held in memory before they are spilled to disk
+    @param min_frequency: words counted fewer times than this are left out
+    @return: generator of WordFrequency, in alphabetical order
+    """
+    chunks = get_chunks(corpus_paths, int(chunk_size_mb * 1024 * 1024))
+    counts = Counter()
+    run_paths = []
+
+    with tempfile.TemporaryDirectory() as spill_directory:
+        with Pool(processes) as pool:
+            for chunk_counts in pool.imap_unordered(count_chunk, chunks):
+                counts.update(chunk_counts)
+
+                if len(counts) > max_vocabulary:
+                    spill(counts, spill_directory, run_paths)
+                    counts = Counter()
+
+        if len(run_paths) > 0:
+            spill(counts, spill_directory, run_paths)
+            counts = Counter()
+            merged_counts = heapq.merge(*[read_run(run_path) for run_path in run_paths])
+        else:
+            merged_counts = ((word, counts[word]) for word in sorted(counts))
+
+        # Equal words from different runs come out of the merge next to each other.
+        word, frequency = None, 0
+
+        for next_word, count in merged_counts:
+            if next_word != word:
+                if word is not None and frequency >= min_frequency:
+                    yield WordFrequency(word, frequency)
+
+                word, frequency = next_word, 0
+
+            frequency += count
+
+        if word is not None and frequency >= min_frequency:
+            yield WordFrequency(word, frequency)
+
+
+def write_frequency_file(output_path: str, words_frequencies) -> int:
+    """
+    write words and frequencies in the data file format, one "word  frequency" per line
+    @param output_path: file to write
+    @param words_frequencies: iterable of WordFrequency
+    @return: number of words written
+    """
+    num_of_words = 0
+
+    with open(output_path, 'w') as output_file:
+        for word_freq in words_frequencies:
+            output_file.write(word_freq.word + '  ' + str(word_freq.frequency) + '\n')
+            num_of_words += 1
+
+    return num_of_words
+
+
+def build_from_corpus(dictionary: BaseDictionary, corpus_paths: list, **options):
+    """
+    build a dictionary straight from raw text corpora, without writing a data file
+    @param dictionary: the dictionary to build
+    @param corpus_paths: raw text files
+    @param options: passed on to iter_word_frequencies()
+    """
+    dictionary.build_dictionary(list(iter_word_frequencies(corpus_paths, **options)))
+
+
+if __name__ == '__main__':
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], 'p:c:m:n:')
+        options = dict((opt, int(value)) for opt, value in opts)
+    except (getopt.GetoptError, ValueError):
+        usage()
+
+    if len(args) < 2:
+        print('Incorrect number of arguments.')
+        usage()
+
+    for corpus_filename in args[1:]:
+        if not os.path.isfile(corpus_filename):
+            print("Corpus file " + corpus_filename + " doesn't exist.")
+            usage()
+
+    words_written = write_frequency_file(args[0], iter_word_frequencies(
+        args[1:], processes=options.get('-p'), chunk_size_mb=options.get('-c', DEFAULT_CHUNK_SIZE_MB),
+        max_vocabulary=options.get('-m', DEFAULT_MAX_VOCABULARY), min_frequency=options.get('-n', 1)))
+    print('Wrote ' + str(words_written) + ' words to ' + args[0])
@@ -0,0 +1,155 @@
+from typing import List
+import heapq
+from dictionary.word_frequency import WordFrequency
+from dictionary.list_dictionary import ListDictionary
+from dictionary.ternarysearchtree_dictionary import TernarySearchTreeDictionary
+
+
+# ------------------------------------------------------------------------
+# Type-ahead sessions. A user types one letter at a time, so a session keeps the state reached for the current
+# prefix and advances it by one letter per keystroke, instead of autocompleting every prefix from scratch. Every
+# state reached is kept on a stack, so a backspace only pops back to the previous one.
+#
+# The first keystrokes of a word are the expensive ones, since their prefixes are shared by the most words, and
+# also the ones that repeat the most from word to word. A session therefore keeps the states of its shortest
+# prefixes across words. A session reads the dictionary as it was when each state was reached, so call
+# invalidate() after modifying the dictionary.
+# ------------------------------------------------------------------------
+
+class AutocompleteSession:
+
+    def __init__(self, cached_prefix_length: int = 1):
+        """
+        @param cached_prefix_length: states of prefixes up to this length are kept across words
+        """
+        self.prefix = ""
+        # One state per typed letter. Each state ends with the 3 most-frequent words for its prefix.
+        self.states = []
+        self.cached_prefix_length = cached_prefix_length
+        self.cached_states = dict()
+
+    def type_letter(self, letter: str) -> List[WordFrequency]:
+        """
+        append a letter to the current prefix
+        @param letter: the letter typed
+        @return: a list (could be empty) of (at most) 3 most-frequent words with the new prefix
+        """
+        previous_state = self.states[-1] if len(self.states) > 0 else None
+        self.prefix += letter
+
+        if len(self.prefix) > self.cached_prefix_length:
+            self.states.append(self.advance(previous_state, letter))
+        else:
+            if self.prefix not in self.cached_states:
+                self.cached_states[self.prefix] = self.advance(previous_state, letter)
+
+            self.states.append(self.cached_states[self.prefix])
+
+        return self.states[-1][-1]
+
+    def backspace(self) -> List[WordFrequency]:
+        """
+        remove the last letter of the current prefix
+        @return: a list (could be empty) of (at most) 3 most-frequent words with the shortened prefix
+        """
+        if len(self.states) > 0:
+            self.states.pop()
+            self.prefix = self.prefix[0:-1]
+
+        return self.states[-1][-1] if len(self.states) > 0 else []
+
+    def reset(self):
+        """
+        clear the current prefix when the user starts a new word
+        """
+        self.prefix = ""
+        self.states = []
+
+    def invalidate(self):
+        """
+        clear the current prefix and every cached state, which must be done after the dictionary has changed
+        """
+        self.reset()
+        self.cached_states = dict()
+
+    def advance(self, previous_state, letter: str):
+        # Returns the state for self.prefix, which already ends with 'letter', from the state of the prefix without
+        # it (None for the first letter).
+        pass
+
+    @staticmethod
+    def select_most_frequent(candidates, frequency_key) -> list:
+        # The stable selection keeps the first of several candidates with equal frequency, as autocomplete does.
+        return heapq.nsmallest(3, candidates, key=lambda candidate: -frequency_key(candidate))
+
+
+class TernarySearchTreeAutocompleteSession(AutocompleteSession):
+
+    def __init__(self, dictionary: TernarySearchTreeDictionary, cached_prefix_length: int = 1):
+        """
+        @param dictionary: the ternary search tree to autocomplete from
+        @param cached_prefix_length: states of prefixes up to this length are kept across words
+        """
+        super().__init__(cached_prefix_length)
+        self.dictionary = dictionary
+
+    def advance(self, previous_state, letter: str):
+        # A state is (node of the prefix's last letter, [word, frequency] candidates, most frequent). The node is
+        # found in one step from the previous one, by searching only the level below it for the new letter.
+        if previous_state is None:
+            cur_node = self.dictionary.root_node
+        elif previous_state[0] is None:
+            return None, [], []
+        else:
+            cur_node = previous_state[0].middle
+
+        while cur_node is not None and cur_node.letter != letter:
+            cur_node = cur_node.left if letter < cur_node.letter else cur_node.right
+
+        if cur_node is None:
+            return None, [], []
+
+        candidates = []
+
+        # The prefix itself comes first, followed by the words below it in the order get_all_children_words()
+        # collects them, which is the order autocomplete() breaks frequency ties in.
+        if cur_node.end_word:
+            candidates.append([self.prefix, cur_node.frequency])
+
+        if previous_state is None:
+            self.dictionary.get_all_children_words(cur_node.middle, self.prefix, candidates)
+        else:
+            # The longer words with the new prefix are a subset of the previous candidates, in the same relative
+            # order, so the candidates narrow with every letter instead of the subtree being collected again.
+            prefix_length = len(self.prefix)
+            candidates.extend(candidate for candidate in previous_state[1]
+                              if len(candidate[0]) > prefix_length and candidate[0].startswith(self.prefix))
+
+        most_frequent = [WordFrequency(candidate[0], candidate[1])
+                         for candidate in self.select_most_frequent(candidates, lambda candidate: candidate[1])]
+
+        return cur_node, candidates, most_frequent
+
+
+class ListAutocompleteSession(AutocompleteSession):
+
+    def __init__(self, dictionary: ListDictionary, cached_prefix_length: int = 1):
+        """
+        @param dictionary: the sorted list to autocomplete from
+        @param cached_prefix_length: states of prefixes up to this length are kept across words
+        """
+        super().__init__(cached_prefix_length)
+        self.dictionary = dictionary
+
+    def advance(self, previous_state, letter: str):
+        # A state is (low, high, most frequent), where [low, high) is the prefix's run of the sorted list. The run
+        # for the new prefix lies inside the previous one, so the binary searches are confined to it.
+        if previous_state is None:
+            low, high = self.dictionary.get_prefix_range(self.prefix)
+        else:
+            low, high = self.dictionary.get_prefix_range(self.prefix, previous_state[0], previous_state[1])
+
+        most_frequent = self.select_most_frequent(self.dictionary.iter_positions(low, high),
+                                                  lambda word_freq: word_freq.frequency)
+
+        return low, high, most_frequent
@@ -40,6 +40,23 @@ class BaseDictionary:
         """
         pass
 
+    def add_many(self, words_frequencies: [WordFrequency]) -> [bool]:
+        """
+        add a batch of words and their frequencies to the dictionary, as if added one at a time in order
+        @param words_frequencies: list of (word, frequency) to be added
+        @return: for each item, True whether succeeded, False when word is already in the dictionary (or earlier in
+        the batch)
+        """
+        return [self.add_word_frequency(word_frequency) for word_frequency in words_frequencies]
+
+    def delete_many(self, words: [str]) -> [bool]:
+        """
+        delete a batch of words from the dictionary, as if deleted one at a time in order
+        @param words: words to be deleted
+        @return: for each word, whether succeeded, e.g. False when word not found (or deleted earlier in the batch)
+        """
+        return [self.delete_word(word) for word in words]
+
     def autocomplete(self, prefix_word: str) -> [str]:
         """
         return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
@@ -0,0 +1,171 @@
+from typing import List
+import math
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+
+
+# ------------------------------------------------------------------------
+# Counting Bloom filter, and a dictionary wrapper that puts one in front of any other dictionary implementation so
+# that lookups of absent words are answered from k hashes instead of a full descent or binary search.
+# ------------------------------------------------------------------------
+
+class CountingBloomFilter:
+    # Counters are single bytes. A counter that reaches the maximum is never decremented again, because the true
+    # count is no longer known, which can only ever cost a false positive and never a false negative.
+    MAX_COUNT = 255
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        """
+        @param capacity: number of words the filter is sized for
+        @param false_positive_rate: target false positive rate when the filter holds 'capacity' words
+        """
+        capacity = max(capacity, 1)
+        # Standard optimal sizing: m = -n ln(p) / ln(2)^2 counters and k = (m / n) ln(2) hash functions.
+        self.num_of_counters = max(int(math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))), 1)
+        self.num_of_hashes = max(int(round(self.num_of_counters / capacity * math.log(2))), 1)
+        self.counters = bytearray(self.num_of_counters)
+
+    def get_indices(self, word: str) -> List[int]:
+        # Double hashing (Kirsch-Mitzenmacher): the two halves of one 64-bit hash generate all k indices, so each
+        # operation costs a single string hash however large k is.
+        word_hash = hash(word) & 0xFFFFFFFFFFFFFFFF
+        first_hash = word_hash & 0xFFFFFFFF
+        second_hash = (word_hash >> 32) | 1
+
+        return [(first_hash + i * second_hash) % self.num_of_counters for i in range(0, self.num_of_hashes)]
+
+    def add(self, word: str):
+        for index in self.get_indices(word):
+            if self.counters[index] < self.MAX_COUNT:
+                self.counters[index] += 1
+
+    def remove(self, word: str):
+        # Only call this for a word that was added, otherwise other words' counters get decremented.
+        for index in self.get_indices(word):
+            if 0 < self.counters[index] < self.MAX_COUNT:
+                self.counters[index] -= 1
+
+    def might_contain(self, word: str) -> bool:
+        # Probe the counters one index at a time rather than through get_indices, so that a miss (the common case
+        # this filter exists for) stops at the first empty counter, usually after one or two probes.
+        word_hash = hash(word) & 0xFFFFFFFFFFFFFFFF
+        first_hash = word_hash & 0xFFFFFFFF
+        second_hash = (word_hash >> 32) | 1
+        counters = self.counters
+        num_of_counters = self.num_of_counters
+
+        for i in range(0, self.num_of_hashes):
+            if counters[(first_hash + i * second_hash) % num_of_counters] == 0:
+                return False
+
+        return True
+
+
+class BloomFilterDictionary(BaseDictionary):
+
+    def __init__(self, dictionary: BaseDictionary, false_positive_rate: float = 0.01, capacity: int = None):
+        """
+        @param dictionary: the dictionary implementation to put the filter in front of
+        @param false_positive_rate: target false positive rate of the filter
+        @param capacity: number of words to size the filter for, by default twice the size of the initial build
+        """
+        self.dictionary = dictionary
+        self.false_positive_rate = false_positive_rate
+        self.capacity = capacity
+        self.bloom_filter = CountingBloomFilter(1 if capacity is None else capacity, false_positive_rate)
+        # Lookups the filter answered on its own, and lookups it let through for words that turned out to be absent.
+        self.filtered_lookups = 0
+        self.definite_misses = 0
+        self.false_positives = 0
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        self.dictionary.build_dictionary(words_frequencies)
+
+        # Leave headroom for later adds, since the false positive rate climbs once the filter holds more words
+        # than it was sized for.
+        capacity = 2 * len(words_frequencies) if self.capacity is None else self.capacity
+        self.bloom_filter = CountingBloomFilter(capacity, self.false_positive_rate)
+
+        for word_freq in words_frequencies:
+            self.bloom_filter.add(word_freq.word)
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        self.filtered_lookups += 1
+
+        if not self.bloom_filter.might_contain(word):
+            self.definite_misses += 1
+            return 0
+
+        frequency = self.dictionary.search(word)
+
+        if frequency == 0:
+            self.false_positives += 1
+
+        return frequency
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        # The underlying dictionary still has to insert the word, and its add performs its own presence check, so
+        # the filter can't save any work here. It only has to learn about the word once the add has succeeded.
+        word_added = self.dictionary.add_word_frequency(word_frequency)
+
+        if word_added:
+            self.bloom_filter.add(word_frequency.word)
+
+        return word_added
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        self.filtered_lookups += 1
+
+        if not self.bloom_filter.might_contain(word):
+            self.definite_misses += 1
+            return False
+
+        word_deleted = self.dictionary.delete_word(word)
+
+        # Decrementing the counters keeps the filter exact with respect to deletes: a deleted word becomes a
+        # definite miss again, unless its counters are still held up by other words.
+        if word_deleted:
+            self.bloom_filter.remove(word)
+        else:
+            self.false_positives += 1
+
+        return word_deleted
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        return self.dictionary.autocomplete(prefix_word)
+
+    def bloom_stats(self) -> dict:
+        """
+        return statistics about the lookups the filter has answered
+        @return: dictionary of lookups, definite misses, false positives and the observed false positive rate
+        """
+        absent_lookups = self.definite_misses + self.false_positives
+
+        return {'lookups': self.filtered_lookups,
+                'definite_misses': self.definite_misses,
+                'false_positives': self.false_positives,
+                'false_positive_rate': self.false_positives / absent_lookups if absent_lookups > 0 else 0.0}
@@ -0,0 +1,225 @@
+from typing import List
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+
+
+# ------------------------------------------------------------------------
+# Double-array trie implementation. Every transition is a pair of integer array lookups
+# (base/check), rather than the per-node letter comparisons of the TST's left/right chains.
+# ------------------------------------------------------------------------
+
+class DoubleArrayTrieDictionary(BaseDictionary):
+    # Value stored in the check array for a slot that is not owned by any state.
+    FREE_SLOT = -1
+
+    def __init__(self):
+        # State 0 is the root and owns itself, every other slot starts out free.
+        self.base = [0]
+        self.check = [0]
+        # Frequency of the word ending at a state, 0 when the state is not the end of a word.
+        self.frequencies = [0]
+        # Letters are mapped to codes 1..n in the order they are first seen, so the arrays are only as wide as
+        # the alphabet that actually occurs in the input.
+        self.letter_codes = dict()
+        self.code_letters = [None]
+        # All slots below this index are known to be occupied, which bounds the search for a free base.
+        self.first_free_slot = 1
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        # Inserting in sorted order means each state receives its children in one burst, before its
+        # neighbours fill up the surrounding slots, which keeps the number of relocations low.
+        for word_freq in sorted(words_frequencies, key=lambda word_frequency: word_frequency.word):
+            self.insert_word(word_freq.word, word_freq.frequency)
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        state = self.find_state(word)
+
+        return 0 if state is None else self.frequencies[state]
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word_not_present = self.search(word_frequency.word) == 0
+
+        if word_not_present:
+            self.insert_word(word_frequency.word, word_frequency.frequency)
+
+        return word_not_present
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        state = self.find_state(word)
+
+        if state is None or self.frequencies[state] == 0:
+            return False
+
+        self.frequencies[state] = 0
+
+        # Give back every slot on the path that no longer leads to a word, so that the arrays do not keep growing
+        # under add/delete churn. We stop at the first state that is still the end of a word or has other children.
+        while state != 0 and self.frequencies[state] == 0 and not self.get_children_codes(state):
+            parent = self.check[state]
+            self.free_slot(state)
+            state = parent
+
+        return True
+
+    def autocomplete(self, word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'word' as a prefix
+        @param word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'word'
+        """
+        state = self.find_state(word)
+
+        if state is None:
+            return []
+
+        descendants = []
+        self.get_all_descendant_words(state, word, descendants)
+        # Ties are broken alphabetically, which is the order the list approach reports them in.
+        descendants.sort(key=lambda word_freq: (-word_freq.frequency, word_freq.word))
+
+        return descendants[0:3]
+
+    def find_state(self, word: str):
+        # Follow one base/check transition per letter, giving up as soon as a slot is not owned by the current state.
+        state = 0
+        check = self.check
+
+        for letter in word:
+            code = self.letter_codes.get(letter)
+
+            if code is None:
+                return None
+
+            next_state = self.base[state] + code
+
+            if next_state >= len(check) or check[next_state] != state:
+                return None
+
+            state = next_state
+
+        return state
+
+    def insert_word(self, word: str, frequency: int):
+        state = 0
+
+        for letter in word:
+            code = self.letter_codes.get(letter)
+
+            if code is None:
+                code = len(self.code_letters)
+                self.letter_codes[letter] = code
+                self.code_letters.append(letter)
+
+            next_state = self.base[state] + code
+            self.ensure_capacity(next_state)
+
+            if self.check[next_state] != state:
+                # The slot belongs to another state, so this state's children have to move to a base where the
+                # new letter fits alongside all of them.
+                if self.check[next_state] != self.FREE_SLOT:
+                    self.relocate(state, self.find_base(self.get_children_codes(state) + [code]))
+                    next_state = self.base[state] + code
+
+                self.claim_slot(next_state, state)
+
+            state = next_state
+
+        self.frequencies[state] = frequency
+
+    def get_children_codes(self, state: int) -> List[int]:
+        base = self.base[state]
+        check = self.check
+        upper = min(base + len(self.code_letters), len(check))
+
+        return [slot - base for slot in range(base + 1, upper) if check[slot] == state]
+
+    def find_base(self, codes: List[int]) -> int:
+        # Only free slots can hold the first child, so jump between them with list.index (a C-level scan) rather
+        # than testing every slot. The occupied prefix of the arrays is skipped once and remembered.
+        self.first_free_slot = self.find_free_slot(self.first_free_slot)
+        first_code = min(codes)
+        slot = self.first_free_slot
+
+        while True:
+            base = slot - first_code
+            # Every child of the new base lies within one alphabet's width of the slot being tried.
+            self.ensure_capacity(slot + len(self.code_letters))
+
+            if base >= 0 and all(self.check[base + code] == self.FREE_SLOT for code in codes):
+                return base
+
+            slot = self.find_free_slot(slot + 1)
+
+    def find_free_slot(self, start: int) -> int:
+        try:
+            return self.check.index(self.FREE_SLOT, start)
+        except ValueError:
+            return max(start, len(self.check))
+
+    def relocate(self, state: int, new_base: int):
+        old_base = self.base[state]
+
+        for code in self.get_children_codes(state):
+            old_slot = old_base + code
+            new_slot = new_base + code
+            self.claim_slot(new_slot, state)
+            self.base[new_slot] = self.base[old_slot]
+            self.frequencies[new_slot] = self.frequencies[old_slot]
+
+            # The grandchildren still name the old slot as their owner, so point them at the new one.
+            for grandchild_code in self.get_children_codes(old_slot):
+                self.check[self.base[old_slot] + grandchild_code] = new_slot
+
+            self.free_slot(old_slot)
+
+        self.base[state] = new_base
+
+    def claim_slot(self, slot: int, owner: int):
+        self.check[slot] = owner
+        self.base[slot] = 0
+        self.frequencies[slot] = 0
+
+    def free_slot(self, slot: int):
+        self.check[slot] = self.FREE_SLOT
+        self.base[slot] = 0
+        self.frequencies[slot] = 0
+
+        if slot < self.first_free_slot:
+            self.first_free_slot = slot
+
+    def ensure_capacity(self, slot: int):
+        # Grow geometrically so that appends are amortised O(1) during the build.
+        if slot >= len(self.check):
+            extra = max(slot + 1 - len(self.check), len(self.check))
+            self.base.extend([0] * extra)
+            self.check.extend([self.FREE_SLOT] * extra)
+            self.frequencies.extend([0] * extra)
+
+    def get_all_descendant_words(self, state: int, prefix: str, descendants: list):
+        # Walk every state below the prefix, recording the words that end along the way.
+        if self.frequencies[state] != 0:
+            descendants.append(WordFrequency(prefix, self.frequencies[state]))
+
+        base = self.base[state]
+
+        for code in self.get_children_codes(state):
+            self.get_all_descendant_words(base + code, prefix + self.code_letters[code], descendants)
@@ -0,0 +1,60 @@
+from typing import List
+
+
+# ------------------------------------------------------------------------
+# Fenwick (binary indexed) tree over a fixed-length list of integers. Supports point updates and prefix sums in
+# O(log n), which lets a sorted list answer range sums without scanning the range.
+# ------------------------------------------------------------------------
+
+class FenwickTree:
+
+    def __init__(self, values: List[int]):
+        """
+        construct the tree in O(n) from the initial values
+        @param values: the values at positions 0..n-1
+        """
+        # tree[i] (1-based) holds the sum of the values in (i - lowbit(i), i]. Each partial sum is pushed up to the
+        # single parent that covers it, which avoids the O(n log n) cost of n separate updates.
+        self.tree = [0] + list(values)
+
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def add(self, index: int, delta: int):
+        """
+        add delta to the value at position index
+        @param index: 0-based position to update
+        @param delta: amount to add
+        """
+        i = index + 1
+
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """
+        sum of the values at positions 0..index-1
+        @param index: number of leading positions to sum
+        @return: the sum
+        """
+        total = 0
+        i = index
+
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+
+        return total
+
+    def range_sum(self, low: int, high: int) -> int:
+        """
+        sum of the values at positions low..high-1
+        @param low: first position in the range
+        @param high: one past the last position in the range
+        @return: the sum
+        """
+        return self.prefix_sum(high) - self.prefix_sum(low)
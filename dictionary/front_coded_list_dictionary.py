@@ -0,0 +1,234 @@
+from typing import List
+from array import array
+import bisect
+from dictionary.word_frequency import WordFrequency
+from dictionary.base_dictionary import BaseDictionary
+
+
+# ------------------------------------------------------------------------
+# Front-coded sorted-list dictionary. Neighbouring words in sorted order share long prefixes, so the words are kept
+# in blocks, each one a single bytes object in which every word is stored as the length of the prefix it shares with
+# the word before it, followed by the rest of its UTF-8 bytes. The first word of a block shares nothing, so it is
+# stored in full and a block can be decoded on its own. Frequencies are kept in a parallel array per block, and a
+# list of each block's first word is binary searched to find the block a word belongs to.
+#
+# This replaces a WordFrequency object and a str per word with a few bytes, at the cost of decoding a block on
+# every operation. UTF-8 preserves code point order, so the blocks are ordered exactly like the str-based approaches.
+# ------------------------------------------------------------------------
+
+class FrontCodedListDictionary(BaseDictionary):
+    # Target number of words per block. Blocks are split once they reach twice this size and merged with a
+    # neighbour once they fall below half of it, as in the blocked list approach.
+    BLOCK_SIZE = 32
+    # A record is [shared length byte][suffix bytes][terminator]. UTF-8 never produces a zero byte for any
+    # character but NUL, which words don't contain. Shared lengths are capped to fit in their byte.
+    TERMINATOR = 0
+    MAX_SHARED = 255
+
+    def __init__(self):
+        self.blocks = []
+        self.block_frequencies = []
+        self.block_heads = []
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        sorted_words_frequencies = sorted(words_frequencies, key=lambda word_freq: word_freq.word)
+        self.blocks = []
+        self.block_frequencies = []
+        self.block_heads = []
+
+        for i in range(0, len(sorted_words_frequencies), self.BLOCK_SIZE):
+            block_words_frequencies = sorted_words_frequencies[i:i + self.BLOCK_SIZE]
+            self.blocks.append(self.encode_block([word_freq.word.encode('utf-8')
+                                                  for word_freq in block_words_frequencies]))
+            self.block_frequencies.append(array('q', [word_freq.frequency for word_freq in block_words_frequencies]))
+            self.block_heads.append(block_words_frequencies[0].word)
+
+    def encode_block(self, words: List[bytes]) -> bytes:
+        records = []
+        previous_word = b''
+
+        for word in words:
+            shared = 0
+            max_shared = min(len(previous_word), len(word), self.MAX_SHARED)
+
+            while shared < max_shared and previous_word[shared] == word[shared]:
+                shared += 1
+
+            records.append(bytes([shared]) + word[shared:] + bytes([self.TERMINATOR]))
+            previous_word = word
+
+        return b''.join(records)
+
+    def decode_block(self, block: bytes) -> List[bytes]:
+        words = []
+        word = b''
+        position = 0
+
+        while position < len(block):
+            end = block.index(self.TERMINATOR, position + 1)
+            word = word[0:block[position]] + block[position + 1:end]
+            words.append(word)
+            position = end + 1
+
+        return words
+
+    def find_block(self, word: str) -> int:
+        # The block whose first word is the last one <= word, or the first block for a word smaller than every
+        # block's first word.
+        return max(bisect.bisect_right(self.block_heads, word) - 1, 0)
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        if len(self.blocks) == 0:
+            return 0
+
+        block_index = self.find_block(word)
+        block = self.blocks[block_index]
+        encoded_word = word.encode('utf-8')
+        cur_word = b''
+        position = 0
+        index = 0
+
+        # Decode only as far as the word's position, since the block is sorted.
+        while position < len(block):
+            end = block.index(self.TERMINATOR, position + 1)
+            cur_word = cur_word[0:block[position]] + block[position + 1:end]
+
+            if cur_word >= encoded_word:
+                return self.block_frequencies[block_index][index] if cur_word == encoded_word else 0
+
+            position = end + 1
+            index += 1
+
+        return 0
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word = word_frequency.word
+
+        if len(self.blocks) == 0:
+            self.blocks.append(self.encode_block([word.encode('utf-8')]))
+            self.block_frequencies.append(array('q', [word_frequency.frequency]))
+            self.block_heads.append(word)
+            return True
+
+        block_index = self.find_block(word)
+        words = self.decode_block(self.blocks[block_index])
+        encoded_word = word.encode('utf-8')
+        index = bisect.bisect_left(words, encoded_word)
+
+        if index < len(words) and words[index] == encoded_word:
+            return False
+
+        # The block is re-encoded whole, since every record after the new word may share a different prefix.
+        words.insert(index, encoded_word)
+        self.blocks[block_index] = self.encode_block(words)
+        self.block_frequencies[block_index].insert(index, word_frequency.frequency)
+
+        if index == 0:
+            self.block_heads[block_index] = word
+
+        if len(words) >= 2 * self.BLOCK_SIZE:
+            self.split_block(block_index, words)
+
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        if len(self.blocks) == 0:
+            return False
+
+        block_index = self.find_block(word)
+        words = self.decode_block(self.blocks[block_index])
+        encoded_word = word.encode('utf-8')
+        index = bisect.bisect_left(words, encoded_word)
+
+        if index >= len(words) or words[index] != encoded_word:
+            return False
+
+        del words[index]
+        del self.block_frequencies[block_index][index]
+
+        if len(words) == 0:
+            del self.blocks[block_index]
+            del self.block_frequencies[block_index]
+            del self.block_heads[block_index]
+            return True
+
+        self.blocks[block_index] = self.encode_block(words)
+
+        if index == 0:
+            self.block_heads[block_index] = words[0].decode('utf-8')
+
+        if len(words) < self.BLOCK_SIZE // 2 and len(self.blocks) > 1:
+            self.merge_block(block_index)
+
+        return True
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        # The words with the prefix form one contiguous run from the block the prefix falls in, which may span
+        # several blocks. Only that run is decoded, and only the 3 winners are turned back into str.
+        most_frequent = []
+        encoded_prefix = prefix_word.encode('utf-8')
+        block_index = self.find_block(prefix_word)
+
+        while block_index < len(self.blocks):
+            frequencies = self.block_frequencies[block_index]
+
+            for index, word in enumerate(self.decode_block(self.blocks[block_index])):
+                if word.startswith(encoded_prefix):
+                    # Strictly greater, so that equally frequent words keep alphabetical order, as in the list
+                    # approach.
+                    if len(most_frequent) < 3 or frequencies[index] > most_frequent[-1][0]:
+                        most_frequent.append((frequencies[index], word))
+                        most_frequent.sort(key=lambda frequency_word: -frequency_word[0])
+                        del most_frequent[3:]
+                elif word > encoded_prefix:
+                    return [WordFrequency(word.decode('utf-8'), frequency) for frequency, word in most_frequent]
+
+            block_index += 1
+
+        return [WordFrequency(word.decode('utf-8'), frequency) for frequency, word in most_frequent]
+
+    def split_block(self, block_index: int, words: List[bytes]):
+        half = len(words) // 2
+        frequencies = self.block_frequencies[block_index]
+        self.blocks[block_index:block_index + 1] = [self.encode_block(words[:half]), self.encode_block(words[half:])]
+        self.block_frequencies[block_index:block_index + 1] = [frequencies[:half], frequencies[half:]]
+        self.block_heads[block_index:block_index + 1] = [self.block_heads[block_index], words[half].decode('utf-8')]
+
+    def merge_block(self, block_index: int):
+        # Fold the undersized block into its left neighbour (or its right one, if it is the first block), then
+        # split the result again if the merge pushed it over the size limit.
+        if block_index == 0:
+            block_index = 1
+
+        words = self.decode_block(self.blocks[block_index - 1]) + self.decode_block(self.blocks[block_index])
+        self.blocks[block_index - 1:block_index + 1] = [self.encode_block(words)]
+        self.block_frequencies[block_index - 1:block_index + 1] = [self.block_frequencies[block_index - 1] +
+                                                                   self.block_frequencies[block_index]]
+        del self.block_heads[block_index]
+
+        if len(words) >= 2 * self.BLOCK_SIZE:
+            self.split_block(block_index - 1, words)
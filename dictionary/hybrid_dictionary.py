@@ -0,0 +1,328 @@
+from typing import List
+import heapq
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+from dictionary.list_dictionary import ListDictionary
+from dictionary.hashtable_dictionary import HashTableDictionary
+from dictionary.ternarysearchtree_dictionary import TernarySearchTreeDictionary
+
+
+# ------------------------------------------------------------------------
+# Dictionary that keeps its words in whichever of the list, hashtable or TST approaches suits the current workload,
+# and moves them to another when the workload changes enough to pay for the move.
+#
+# The operation mix is sampled over a window of operations, and at the end of each window a cost model (per-operation
+# costs measured with generation/replay_benchmark.py, as a fixed part plus a part growing with the dictionary size)
+# predicts the cost per operation of every approach. The words move to the cheapest one only if the time it would
+# save over the next 'payoff_horizon' operations is more than the time the move itself costs.
+#
+# A move is incremental: every operation copies a few words into the new approach, so no single call stalls. Until
+# the copy is done, the old approach stays frozen and serves reads. Adds and deletes go to an overlay, which reads
+# consult first, and straight to the new approach; the copy skips the words in the overlay, as they are already
+# up to date there. A hashtable has no order to stream its words in, so a move from it to the list sorts the keys in
+# short runs and merges them lazily, spread over the same operations, rather than sorting them all in one call.
+# ------------------------------------------------------------------------
+
+class HybridDictionary(BaseDictionary):
+    # Approach -> operation -> (fixed ns, ns per word in the dictionary), fitted at 10k and 100k words.
+    OPERATION_COSTS = {'list': {'S': (2100, 0.055), 'A': (3900, 0.3), 'D': (1200, 0.21), 'AC': (0, 270)},
+                       'hashtable': {'S': (250, 0.005), 'A': (900, 0.009), 'D': (400, 0.013), 'AC': (0, 105)},
+                       'tst': {'S': (2500, 0.04), 'A': (17900, 0.15), 'D': (14000, 0.17), 'AC': (0, 30)}}
+    # Approach -> ns to copy one word into it during a move, fitted at 100k words.
+    MIGRATION_COSTS = {'list': 6000, 'hashtable': 2000, 'tst': 27000}
+    # Number of hashtable keys sorted together in one step of a move to the list.
+    MIGRATION_RUN_SIZE = 256
+
+    def __init__(self, representation: str = 'hashtable', window_size: int = 500, payoff_horizon: int = 50000,
+                 migration_step: int = 16):
+        """
+        @param representation: approach to start with, 'list', 'hashtable' or 'tst'
+        @param window_size: number of operations the mix is sampled over before each decision
+        @param payoff_horizon: number of operations a move has to pay for itself within
+        @param migration_step: number of words copied (or sorted, when leaving a hashtable for a list) by each
+            operation during a move
+        """
+        self.representation = representation
+        self.primary = self.create_representation(representation)
+        self.window_size = window_size
+        self.payoff_horizon = payoff_horizon
+        self.migration_step = migration_step
+        self.word_count = 0
+        self.operation_counts = {'S': 0, 'A': 0, 'D': 0, 'AC': 0}
+        self.window_operations = 0
+        # State of a move in progress: the approach being filled, the words still to copy from the frozen primary
+        # and the words added (word -> WordFrequency) or deleted (word -> None) since the move started.
+        self.target_representation = None
+        self.target = None
+        self.migration_source = None
+        self.overlay = dict()
+        self.migrations = []
+        # Nodes of a retired tree still to be unlinked.
+        self.retired_nodes = []
+
+    @staticmethod
+    def create_representation(representation: str) -> BaseDictionary:
+        if representation == 'list':
+            return ListDictionary()
+        elif representation == 'hashtable':
+            return HashTableDictionary()
+        elif representation == 'tst':
+            # A move from the list or a tree copies the words in sorted order, which would leave every level of a
+            # plain tree a chain.
+            return TernarySearchTreeDictionary(rebalance=True)
+
+        raise ValueError("Unknown representation '" + representation + "'")
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        self.target_representation = None
+        self.target = None
+        self.migration_source = None
+        self.overlay = dict()
+        self.primary = self.create_representation(self.representation)
+        self.primary.build_dictionary(words_frequencies)
+        self.word_count = len(words_frequencies)
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        self.sample('S')
+
+        return self.lookup(word)
+
+    def lookup(self, word: str) -> int:
+        if word in self.overlay:
+            return self.overlay[word].frequency if self.overlay[word] is not None else 0
+
+        return self.primary.search(word)
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        self.sample('A')
+
+        if self.target is None:
+            word_added = self.primary.add_word_frequency(word_frequency)
+        else:
+            word_added = self.lookup(word_frequency.word) == 0
+
+            if word_added:
+                self.overlay[word_frequency.word] = word_frequency
+                self.target.add_word_frequency(word_frequency)
+
+        if word_added:
+            self.word_count += 1
+
+        return word_added
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        self.sample('D')
+
+        if self.target is None:
+            word_deleted = self.primary.delete_word(word)
+        else:
+            word_deleted = self.lookup(word) > 0
+
+            if word_deleted:
+                # The word may not have been copied yet, in which case the target simply doesn't have it.
+                self.overlay[word] = None
+                self.target.delete_word(word)
+
+        if word_deleted:
+            self.word_count -= 1
+
+        return word_deleted
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        self.sample('AC')
+
+        if self.target is None:
+            return self.primary.autocomplete(prefix_word)
+
+        # The frozen primary's top 3 stay the top 3 of its words outside the overlay, unless the overlay has
+        # changed one of them. Only then does every word with the prefix have to be gathered.
+        most_frequent = self.primary.autocomplete(prefix_word)
+
+        if any(word_freq.word in self.overlay for word_freq in most_frequent):
+            if isinstance(self.primary, HashTableDictionary):
+                # Its ordered iteration would sort every key, and the candidates are sorted below anyway.
+                most_frequent = [WordFrequency(word, frequency)
+                                 for word, frequency in self.primary.word_frequencies.items()
+                                 if word.startswith(prefix_word) and word not in self.overlay]
+            else:
+                most_frequent = [word_freq for word_freq in self.primary.iter_prefix(prefix_word)
+                                 if word_freq.word not in self.overlay]
+
+        candidates = most_frequent + [word_freq for word_freq in self.overlay.values()
+                                      if word_freq is not None and word_freq.word.startswith(prefix_word)]
+
+        # Equally frequent words come out in alphabetical order, as in the other approaches.
+        return sorted(candidates, key=lambda word_freq: (-word_freq.frequency, word_freq.word))[0:3]
+
+    def sample(self, operation: str):
+        # Every operation first moves the copy along, then counts towards the current window.
+        if self.target is not None:
+            self.migrate_words(self.migration_step)
+        elif len(self.retired_nodes) > 0:
+            self.unlink_retired_nodes(4 * self.migration_step)
+
+        self.operation_counts[operation] += 1
+        self.window_operations += 1
+
+        if self.window_operations >= self.window_size:
+            if self.target is None:
+                self.choose_representation()
+
+            self.operation_counts = dict((operation, 0) for operation in self.operation_counts)
+            self.window_operations = 0
+
+    def get_operation_cost(self, representation: str) -> float:
+        """
+        predict the cost per operation of an approach under the mix sampled in the current window
+        @param representation: 'list', 'hashtable' or 'tst'
+        @return: predicted ns per operation
+        """
+        num_of_operations = max(self.window_operations, 1)
+
+        return sum(count / num_of_operations * (self.OPERATION_COSTS[representation][operation][0] +
+                                                self.OPERATION_COSTS[representation][operation][1] * self.word_count)
+                   for operation, count in self.operation_counts.items())
+
+    def choose_representation(self):
+        current_cost = self.get_operation_cost(self.representation)
+        best_representation = min(self.OPERATION_COSTS, key=self.get_operation_cost)
+        saving = (current_cost - self.get_operation_cost(best_representation)) * self.payoff_horizon
+
+        if best_representation != self.representation and \
+                saving > self.MIGRATION_COSTS[best_representation] * self.word_count:
+            self.start_migration(best_representation)
+
+    def start_migration(self, representation: str):
+        """
+        start moving the words to another approach, one migration_step at a time
+        @param representation: 'list', 'hashtable' or 'tst'
+        """
+        self.target_representation = representation
+        self.target = self.create_representation(representation)
+        self.target.build_dictionary([])
+        self.migration_source = self.iter_primary_words()
+        self.overlay = dict()
+
+    def iter_primary_words(self):
+        # Yields the frozen primary's words, or None for a step that only sorts. The list and the tree stream their
+        # words in order as they go, but the hashtable's ordered iteration would sort every key on the first step.
+        # Its dict is iterated directly instead, which is safe as the primary is not changed during a move.
+        if not isinstance(self.primary, HashTableDictionary):
+            yield from self.primary.iter_range()
+            return
+
+        word_frequencies = self.primary.word_frequencies
+
+        # A tree in rebalance mode and the hashtable take words in any order.
+        if self.target_representation != 'list':
+            for word, frequency in word_frequencies.items():
+                yield WordFrequency(word, frequency)
+            return
+
+        # The list inserts in O(1) only at its end, so it is fed in sorted order: short sorted runs first, one key
+        # per step, then a lazy merge of the runs. The runs hold the keys themselves, so nothing is allocated per
+        # word that would all be freed in the last step.
+        runs = []
+        run = []
+
+        for word in word_frequencies:
+            run.append(word)
+
+            if len(run) == self.MIGRATION_RUN_SIZE:
+                run.sort()
+                runs.append(run)
+                run = []
+
+            yield None
+
+        run.sort()
+        runs.append(run)
+
+        for word in heapq.merge(*runs):
+            yield WordFrequency(word, word_frequencies[word])
+
+    def migrate_words(self, num_of_words: int):
+        """
+        copy words from the frozen primary to the target, and switch to the target once all of them are copied
+        @param num_of_words: maximum number of words to copy (or sort)
+        """
+        for word_freq in self.migration_source:
+            # Words in the overlay were added to or deleted from the target directly.
+            if word_freq is not None and word_freq.word not in self.overlay:
+                self.target.add_word_frequency(word_freq)
+
+            num_of_words -= 1
+
+            if num_of_words <= 0:
+                return
+
+        self.migrations.append((self.representation, self.target_representation))
+        self.retire(self.primary)
+        self.representation = self.target_representation
+        self.primary = self.target
+        self.target_representation = None
+        self.target = None
+        self.migration_source = None
+        self.overlay = dict()
+
+    def retire(self, dictionary: BaseDictionary):
+        # Dropping the last reference to a tree frees all of its nodes in one cascade, which takes tens of ms at
+        # 100k words. Its nodes are unlinked a few per operation instead. The other approaches keep their words in
+        # a handful of containers, which are freed at C speed.
+        if isinstance(dictionary, TernarySearchTreeDictionary) and dictionary.root_node is not None:
+            self.retired_nodes.append(dictionary.root_node)
+            dictionary.root_node = None
+
+    def unlink_retired_nodes(self, num_of_nodes: int):
+        # Each node is freed as soon as it is unlinked from its children and dropped from the stack.
+        while len(self.retired_nodes) > 0 and num_of_nodes > 0:
+            cur_node = self.retired_nodes.pop()
+
+            for child in (cur_node.left, cur_node.middle, cur_node.right):
+                if child is not None:
+                    self.retired_nodes.append(child)
+
+            cur_node.left = cur_node.middle = cur_node.right = None
+            num_of_nodes -= 1
+
+    def finish_migration(self):
+        """
+        complete a move in progress at once
+        """
+        # A move from the hashtable to the list takes a step per key to sort and another to copy, so the budget
+        # isn't tied to the number of words; the move simply runs until it has switched over.
+        while self.target is not None:
+            self.migrate_words(self.word_count + len(self.overlay) + 1)
+
+    def hybrid_stats(self) -> dict:
+        """
+        return statistics about the approach in use and the moves between approaches
+        @return: dictionary of the current approach, the approach being moved to (or None) and the moves made
+        """
+        return {'representation': self.representation,
+                'migrating_to': self.target_representation,
+                'migrations': list(self.migrations)}
@@ -0,0 +1,110 @@
+from typing import List
+
+
+# ------------------------------------------------------------------------
+# Log-bucketed latency histogram. Every power of two is split into 4 buckets, so a recorded latency is off by at most
+# 25% from the bounds of its bucket, and the histogram stays a few dozen buckets whether the latencies span
+# nanoseconds or seconds. Percentiles are read from the bucket bounds; the minimum, maximum and mean are exact.
+# ------------------------------------------------------------------------
+
+class LatencyHistogram:
+    SUB_BUCKETS = 4
+    SUB_BUCKET_BITS = 2
+
+    def __init__(self):
+        # Bucket index -> count, holding only the buckets that have been hit.
+        self.buckets = dict()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def get_bucket(cls, value: int) -> int:
+        # Values below 2 * SUB_BUCKETS have a bucket each. Above that, the top SUB_BUCKET_BITS + 1 bits of the value
+        # select the bucket within its power of two.
+        shift = max(value.bit_length() - cls.SUB_BUCKET_BITS - 1, 0)
+
+        return cls.SUB_BUCKETS * shift + (value >> shift)
+
+    @classmethod
+    def get_bucket_bounds(cls, bucket: int) -> tuple:
+        shift = max(bucket // cls.SUB_BUCKETS - 1, 0)
+        top = bucket - cls.SUB_BUCKETS * shift
+
+        return top << shift, ((top + 1) << shift) - 1
+
+    def record(self, value: int):
+        """
+        add a latency to the histogram
+        @param value: latency in ns
+        """
+        bucket = self.get_bucket(value)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percentile: float) -> int:
+        """
+        estimate a percentile of the recorded latencies
+        @param percentile: percentile between 0 and 100
+        @return: upper bound of the bucket holding the percentile (capped by the maximum), 0 if nothing is recorded
+        """
+        if self.count == 0:
+            return 0
+
+        # Nearest rank, counted through the buckets in order.
+        rank = max(int(-(-percentile * self.count // 100)), 1)
+        seen = 0
+
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+
+            if seen >= rank:
+                return min(self.get_bucket_bounds(bucket)[1], self.max)
+
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def summary_lines(self, title: str) -> List[str]:
+        """
+        format the histogram for the summary file
+        @param title: name of what was timed
+        @return: lines of the summary, a table of statistics followed by one line per bucket hit
+        """
+        lines = ["{:<14} {:<10} {:<14} {:<12} {:<12} {:<12} {:<12} {:<12} {:<12}".format(
+            title, self.count, round(self.total / 1000000, 3), round(self.mean(), 1), self.min or 0,
+            self.percentile(50), self.percentile(90), self.percentile(99), self.max or 0)]
+
+        for bucket in sorted(self.buckets):
+            lower, upper = self.get_bucket_bounds(bucket)
+            share = self.buckets[bucket] / self.count
+            lines.append("    {:>12} - {:<12} {:<10} {}".format(lower, upper, self.buckets[bucket],
+                                                                 '#' * max(int(round(share * 50)), 1)))
+
+        return lines
+
+
+def write_latency_summary(summary_path: str, phases: List[tuple], histograms: dict):
+    """
+    write the timings of a run to a summary file
+    @param summary_path: file to write
+    @param phases: list of (phase name, duration in ns) timed once per run, e.g. loading the data file
+    @param histograms: command -> LatencyHistogram of the command's latencies
+    """
+    with open(summary_path, 'w') as summary_file:
+        summary_file.write("{:<14} {:<14}\n".format('Phase', 'Time {ms}'))
+
+        for phase, duration in phases:
+            summary_file.write("{:<14} {:<14}\n".format(phase, round(duration / 1000000, 3)))
+
+        summary_file.write("\n{:<14} {:<10} {:<14} {:<12} {:<12} {:<12} {:<12} {:<12} {:<12}\n".format(
+            'Command', 'Count', 'Total {ms}', 'Mean {ns}', 'Min {ns}', 'p50 {ns}', 'p90 {ns}', 'p99 {ns}', 'Max {ns}'))
+
+        for command, histogram in histograms.items():
+            if histogram.count > 0:
+                summary_file.write('\n'.join(histogram.summary_lines(command)) + '\n')
@@ -0,0 +1,212 @@
+from typing import List
+import time
+import threading
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+from dictionary.ternarysearchtree_dictionary import TernarySearchTreeDictionary
+
+
+# ------------------------------------------------------------------------
+# Ternary search tree built lazily, one first letter at a time. Building only sorts the words into buckets by their
+# first letter, in one linear pass, so the first query can be answered almost at once. A bucket becomes a tree of
+# its own the first time a word starting with its letter is needed, which builds only the letters a session
+# actually uses. Optionally, a background thread warms the remaining buckets, largest first. It builds a tree off to
+# the side, a chunk at a time, and only publishes it once it is complete; a query that needs the letter meanwhile
+# finishes that partial tree itself rather than waiting for the warming thread to.
+#
+# Every word with the same first letter lives in the same tree, so each operation goes to exactly one tree.
+# ------------------------------------------------------------------------
+
+class LazyTernarySearchTreeDictionary(BaseDictionary):
+    # The warming thread builds a tree this many words at a time, holding the letter's lock only for the chunk, and
+    # lets queries run in between.
+    WARMING_CHUNK = 64
+
+    def __init__(self, warm_in_background: bool = False):
+        """
+        @param warm_in_background: if True, build_dictionary() starts a thread that builds every bucket's tree
+        """
+        self.warm_in_background = warm_in_background
+        # First letter -> words not yet built into a tree, and first letter -> built tree. A letter is in one of
+        # the two, and its lock makes sure its tree is only built once.
+        self.buckets = dict()
+        self.trees = dict()
+        self.locks = dict()
+        # First letter -> (tree, number of bucket words inserted so far) for a tree the warming thread has started
+        # but not finished, guarded by the letter's lock.
+        self.partial_trees = dict()
+        self.warming_thread = None
+        self.stop_warming = False
+        # Number of trees being built on demand, during which the warming thread waits.
+        self.foreground_builds = 0
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        self.stop_background_warming()
+        self.buckets = dict()
+        self.trees = dict()
+        self.partial_trees = dict()
+
+        for word_freq in words_frequencies:
+            bucket = self.buckets.get(word_freq.word[0])
+
+            if bucket is None:
+                self.buckets[word_freq.word[0]] = [word_freq]
+            else:
+                bucket.append(word_freq)
+
+        self.locks = dict((letter, threading.Lock()) for letter in self.buckets)
+
+        if self.warm_in_background:
+            self.stop_warming = False
+            self.warming_thread = threading.Thread(target=self.warm, daemon=True)
+            self.warming_thread.start()
+
+    def get_tree(self, letter: str, create: bool = False):
+        """
+        return the tree of the words starting with a letter, building it first if it is still a bucket
+        @param letter: first letter of the words
+        @param create: if True, an empty tree is created for a letter that has no words
+        @return: the tree, or None if no word starts with the letter and 'create' is False
+        """
+        tree = self.trees.get(letter)
+
+        if tree is not None:
+            return tree
+
+        if letter not in self.locks:
+            if not create:
+                return None
+
+            self.locks.setdefault(letter, threading.Lock())
+
+        with self.locks[letter]:
+            # The warming thread may have built the tree while this thread was waiting for the lock, or be part way
+            # through it, in which case the build carries on from the words it has already inserted.
+            if letter not in self.trees:
+                self.foreground_builds += 1
+                tree, start = self.partial_trees.pop(letter, (TernarySearchTreeDictionary(), 0))
+                tree.build_dictionary(self.buckets.get(letter, [])[start:])
+                self.trees[letter] = tree
+                self.buckets.pop(letter, None)
+                self.foreground_builds -= 1
+
+        return self.trees[letter]
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        if len(word) == 0:
+            return 0
+
+        tree = self.get_tree(word[0])
+
+        return tree.search(word) if tree is not None else 0
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        return self.get_tree(word_frequency.word[0], True).add_word_frequency(word_frequency)
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        if len(word) == 0:
+            return False
+
+        tree = self.get_tree(word[0])
+
+        return tree.delete_word(word) if tree is not None else False
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        if len(prefix_word) == 0:
+            return []
+
+        tree = self.get_tree(prefix_word[0])
+
+        return tree.autocomplete(prefix_word) if tree is not None else []
+
+    def warm(self):
+        """
+        build the tree of every letter that is still a bucket, largest bucket first
+        """
+        for letter in sorted(list(self.buckets), key=lambda bucket_letter: -len(self.buckets.get(bucket_letter, []))):
+            while True:
+                with self.locks[letter]:
+                    # A query has finished the tree, possibly from the part this thread built.
+                    if letter in self.trees:
+                        break
+
+                    bucket = self.buckets[letter]
+                    tree, start = self.partial_trees.pop(letter, (TernarySearchTreeDictionary(), 0))
+
+                    for word_freq in bucket[start:start + self.WARMING_CHUNK]:
+                        tree.insert_word(word_freq.word, word_freq.frequency)
+
+                    if start + self.WARMING_CHUNK >= len(bucket):
+                        self.trees[letter] = tree
+                        self.buckets.pop(letter)
+                        break
+
+                    self.partial_trees[letter] = (tree, start + self.WARMING_CHUNK)
+
+                # The lock is released between chunks, and sleeping releases the GIL, so a query waits for one chunk
+                # of warming at most rather than for the interpreter's switch interval. A query on this letter then
+                # builds the rest of the tree itself, which is no more than it would build without warming. While a
+                # query builds a tree, warming stands aside.
+                time.sleep(0)
+
+                while self.foreground_builds > 0 and not self.stop_warming:
+                    time.sleep(0.001)
+
+                # An unfinished tree is dropped, and the bucket stays for the next build.
+                if self.stop_warming:
+                    with self.locks[letter]:
+                        self.partial_trees.pop(letter, None)
+
+                    return
+
+    def stop_background_warming(self):
+        """
+        stop the warming thread, if any, after the chunk it is building
+        """
+        if self.warming_thread is not None:
+            self.stop_warming = True
+            self.warming_thread.join()
+            self.warming_thread = None
+
+    def wait_until_warm(self):
+        """
+        block until the warming thread has built every bucket
+        """
+        if self.warming_thread is not None:
+            self.warming_thread.join()
+            self.warming_thread = None
+
+    def lazy_stats(self) -> dict:
+        """
+        return statistics about the buckets built so far
+        @return: dictionary of the numbers of letters built and still pending, and the words still pending
+        """
+        buckets = dict(self.buckets)
+
+        return {'built_letters': len(self.trees),
+                'pending_letters': len(buckets),
+                'pending_words': sum(len(bucket) for bucket in buckets.values())}
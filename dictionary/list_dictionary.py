@@ -2,6 +2,7 @@ from typing import List
 import bisect
 from dictionary.word_frequency import WordFrequency
 from dictionary.base_dictionary import BaseDictionary
+from dictionary.fenwick_tree import FenwickTree
 
 
 # ------------------------------------------------------------------------
@@ -13,8 +14,25 @@ from dictionary.base_dictionary import BaseDictionary
 
 class ListDictionary(BaseDictionary):
 
-    def __init__(self):
+    def __init__(self, tombstone_deletes: bool = False, compaction_ratio: float = 0.25):
+        """
+        @param tombstone_deletes: if True, deletes only mark the word dead and the list is compacted lazily
+        @param compaction_ratio: fraction of dead entries in the list that triggers a compaction
+        """
         self.word_frequencies = None
+        self.tombstone_deletes = tombstone_deletes
+        self.compaction_ratio = compaction_ratio
+        # Words that have been deleted but whose entries are still physically present in word_frequencies.
+        self.tombstones = set()
+        self.compactions = 0
+        self.entries_reclaimed = 0
+        # Fenwick trees over each position's frequency and liveness (1, or 0 once tombstoned), used by the prefix
+        # aggregate queries. Inserts and removals shift positions, so they just drop the trees. Until the list has
+        # settled down again, aggregate queries sum their range directly; see use_aggregate_trees().
+        self.frequency_tree = None
+        self.live_count_tree = None
+        # Number of entries aggregate queries have summed directly since the trees were last dropped.
+        self.entries_summed_since_change = 0
 
     def build_dictionary(self, words_frequencies: List[WordFrequency]):
         """
@@ -22,6 +40,8 @@ class ListDictionary(BaseDictionary):
         @param words_frequencies: list of (word, frequency) to be stored
         """
         self.word_frequencies = [*words_frequencies]
+        self.tombstones = set()
+        self.drop_aggregate_trees()
         # We will use TimSort (inbuilt) here instead because when the # of elements is > 64, it will utilise its
         # improved MergeSort instead of using BinSort (this will be horribly inefficient for larger input sizes).
         self.word_frequencies.sort(key=lambda word_freq: word_freq.word)
@@ -39,6 +59,10 @@ class ListDictionary(BaseDictionary):
         # Check if the WordFrequency object's word at the index is the same as the word passed in.
         # If it is, then it has found the word, otherwise it has not found it and found the last closest item.
         if 0 <= index < len(self.word_frequencies) and self.word_frequencies[index].word == word:
+            # A tombstoned entry is still in the list, but it no longer counts as being in the dictionary.
+            if word in self.tombstones:
+                return 0
+
             return self.word_frequencies[index].frequency
 
         return 0
@@ -56,7 +80,19 @@ class ListDictionary(BaseDictionary):
         # object into its correct position
         if word_not_present:
             index_to_place = bisect.bisect_left(self.word_frequencies, word_frequency.word)
-            self.word_frequencies.insert(index_to_place, word_frequency)
+
+            # If the word is only tombstoned, its old entry is still sitting at that index, so revive it in place
+            # instead of inserting a duplicate.
+            if word_frequency.word in self.tombstones:
+                self.tombstones.remove(word_frequency.word)
+                self.word_frequencies[index_to_place] = word_frequency
+
+                if self.frequency_tree is not None:
+                    self.frequency_tree.add(index_to_place, word_frequency.frequency)
+                    self.live_count_tree.add(index_to_place, 1)
+            else:
+                self.word_frequencies.insert(index_to_place, word_frequency)
+                self.drop_aggregate_trees()
 
         return word_not_present
 
@@ -66,17 +102,96 @@ class ListDictionary(BaseDictionary):
         @param word: word to be deleted
         @return: whether succeeded, e.g. return False when point not found
         """
+        if self.tombstone_deletes:
+            return self.delete_word_lazily(word)
+
         # Here we can get the index of the word using the bisect module, and assuming
-        # the list is not empty and the word is present, we will remove it from the list
+        # the list is not empty and the word is present, we will remove it from the list. Since the index is
+        # already known, we delete by position rather than with remove(), which would rescan from the front.
         index_of_word = bisect.bisect_left(self.word_frequencies, word)
         word_present = False
 
         if 0 <= index_of_word < len(self.word_frequencies) and self.word_frequencies[index_of_word].word == word:
             word_present = True
-            self.word_frequencies.remove(self.word_frequencies[index_of_word])
+            del self.word_frequencies[index_of_word]
+            self.drop_aggregate_trees()
 
         return word_present
 
+    def add_many(self, words_frequencies: List[WordFrequency]) -> List[bool]:
+        """
+        add a batch of words and their frequencies to the dictionary, as if added one at a time in order
+        @param words_frequencies: list of (word, frequency) to be added
+        @return: for each item, True whether succeeded, False when word is already in the dictionary (or earlier in
+        the batch)
+        """
+        results = []
+        new_words = dict()
+
+        for word_frequency in words_frequencies:
+            if word_frequency.word in new_words:
+                results.append(False)
+                continue
+
+            index = bisect.bisect_left(self.word_frequencies, word_frequency.word)
+            word_found = index < len(self.word_frequencies) and self.word_frequencies[index].word == word_frequency.word
+
+            if not word_found:
+                new_words[word_frequency.word] = word_frequency
+                results.append(True)
+            elif word_frequency.word in self.tombstones:
+                # Tombstoned entries are revived in place, as in add_word_frequency().
+                self.tombstones.remove(word_frequency.word)
+                self.word_frequencies[index] = word_frequency
+
+                if self.frequency_tree is not None:
+                    self.frequency_tree.add(index, word_frequency.frequency)
+                    self.live_count_tree.add(index, 1)
+
+                results.append(True)
+            else:
+                results.append(False)
+
+        # Instead of one insert (and one shift of the tail) per word, the new words are sorted once and appended as a
+        # second sorted run. Sorting a list made of two sorted runs is a single linear merge of the two in Timsort.
+        if len(new_words) > 0:
+            self.word_frequencies.extend(sorted(new_words.values(), key=lambda word_freq: word_freq.word))
+            self.word_frequencies.sort(key=lambda word_freq: word_freq.word)
+            self.drop_aggregate_trees()
+
+        return results
+
+    def delete_many(self, words: List[str]) -> List[bool]:
+        """
+        delete a batch of words from the dictionary, as if deleted one at a time in order
+        @param words: words to be deleted
+        @return: for each word, whether succeeded, e.g. False when word not found (or deleted earlier in the batch)
+        """
+        # Lazy deletes are already O(log n) each.
+        if self.tombstone_deletes:
+            return super().delete_many(words)
+
+        results = []
+        words_to_delete = set()
+
+        for word in words:
+            index = bisect.bisect_left(self.word_frequencies, word)
+            word_found = word not in words_to_delete and index < len(self.word_frequencies) and \
+                self.word_frequencies[index].word == word
+
+            if word_found:
+                words_to_delete.add(word)
+
+            results.append(word_found)
+
+        # Every deleted entry is dropped in one sweep of the list, instead of shifting the tail once per word.
+        if len(words_to_delete) > 0:
+            self.word_frequencies = [word_freq for word_freq in self.word_frequencies
+                                     if word_freq.word not in words_to_delete]
+            self.drop_aggregate_trees()
+
+        return results
+
     def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
         """
         return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
@@ -89,6 +204,9 @@ class ListDictionary(BaseDictionary):
         # theoretical time complexity).
         words_with_prefix = [x for x in self.word_frequencies if prefix_word == x.word[0:len(prefix_word)]]
 
+        if len(self.tombstones) > 0:
+            words_with_prefix = [x for x in words_with_prefix if x.word not in self.tombstones]
+
         for i in range(0, 3):
             highest_frequency = 0
             highest_frequency_index = 0
@@ -104,3 +222,146 @@ class ListDictionary(BaseDictionary):
                 most_frequent.append(words_with_prefix[highest_frequency_index])
 
         return most_frequent
+
+    def delete_word_lazily(self, word: str) -> bool:
+        # Only mark the word as dead, which avoids shifting the tail of the list on every delete of a burst. The
+        # dead entries are physically removed together once they make up enough of the list.
+        word_present = self.search(word) != 0
+
+        if word_present:
+            self.tombstones.add(word)
+
+            # The entry keeps its position, so the aggregate trees can be patched in place instead of rebuilt.
+            if self.frequency_tree is not None:
+                index_of_word = bisect.bisect_left(self.word_frequencies, word)
+                self.frequency_tree.add(index_of_word, -self.word_frequencies[index_of_word].frequency)
+                self.live_count_tree.add(index_of_word, -1)
+
+            if len(self.tombstones) >= self.compaction_ratio * len(self.word_frequencies):
+                self.compact()
+
+        return word_present
+
+    def compact(self):
+        """
+        physically remove every tombstoned entry in a single pass over the list
+        """
+        if len(self.tombstones) > 0:
+            self.word_frequencies = [x for x in self.word_frequencies if x.word not in self.tombstones]
+            self.entries_reclaimed += len(self.tombstones)
+            self.compactions += 1
+            self.tombstones = set()
+            self.drop_aggregate_trees()
+
+    def compaction_stats(self) -> dict:
+        """
+        return statistics about tombstoned deletes and compaction
+        @return: dictionary of live and dead entry counts, compactions run and entries reclaimed by them
+        """
+        return {'live_entries': len(self.word_frequencies) - len(self.tombstones),
+                'dead_entries': len(self.tombstones),
+                'compactions': self.compactions,
+                'entries_reclaimed': self.entries_reclaimed}
+
+    def count_prefix(self, prefix_word: str) -> int:
+        """
+        count the words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: the prefix
+        @return: number of words with prefix 'prefix_word'
+        """
+        low, high = self.get_prefix_range(prefix_word)
+
+        # Without tombstones every entry in the range is live, so the range width is the answer.
+        if len(self.tombstones) == 0:
+            return high - low
+
+        if self.use_aggregate_trees(low, high):
+            return self.live_count_tree.range_sum(low, high)
+
+        return sum(1 for x in self.word_frequencies[low:high] if x.word not in self.tombstones)
+
+    def frequency_sum_prefix(self, prefix_word: str) -> int:
+        """
+        sum the frequencies of the words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: the prefix
+        @return: total frequency of the words with prefix 'prefix_word'
+        """
+        low, high = self.get_prefix_range(prefix_word)
+
+        if self.use_aggregate_trees(low, high):
+            return self.frequency_tree.range_sum(low, high)
+
+        return sum(x.frequency for x in self.word_frequencies[low:high] if x.word not in self.tombstones)
+
+    def get_prefix_range(self, prefix_word: str, low: int = 0, high: int = None):
+        # Words with the prefix form one contiguous run of the sorted list. It ends just before the first word
+        # that is >= the prefix with its last letter bumped up by one, e.g. "cat" -> "cau". The search can be
+        # confined to [low, high) when the run is already known to lie inside it, e.g. within a shorter prefix's run.
+        if high is None:
+            high = len(self.word_frequencies)
+
+        if len(prefix_word) == 0:
+            return low, high
+
+        prefix_successor = prefix_word[0:-1] + chr(ord(prefix_word[-1]) + 1)
+        prefix_low = bisect.bisect_left(self.word_frequencies, prefix_word, low, high)
+
+        return prefix_low, bisect.bisect_left(self.word_frequencies, prefix_successor, prefix_low, high)
+
+    def use_aggregate_trees(self, low: int, high: int) -> bool:
+        # Building the trees costs O(n), so after a change, summing a range directly is cheaper for as long as the
+        # ranges summed add up to less than the whole list. Only once they reach it, with no change in between, are
+        # the trees built, and from then on each range costs O(log n). This keeps a mixed workload within twice
+        # the cost of whichever of the two would have been cheaper in hindsight.
+        if self.frequency_tree is None:
+            self.entries_summed_since_change += high - low
+
+            if self.entries_summed_since_change < len(self.word_frequencies):
+                return False
+
+            self.build_aggregate_trees()
+
+        return True
+
+    def drop_aggregate_trees(self):
+        self.frequency_tree = None
+        self.live_count_tree = None
+        self.entries_summed_since_change = 0
+
+    def build_aggregate_trees(self):
+        if self.frequency_tree is None:
+            self.frequency_tree = FenwickTree([0 if x.word in self.tombstones else x.frequency
+                                               for x in self.word_frequencies])
+            self.live_count_tree = FenwickTree([0 if x.word in self.tombstones else 1
+                                                for x in self.word_frequencies])
+
+    def iter_range(self, low_word: str = None, high_word: str = None):
+        """
+        lazily yield the words w with low_word <= w < high_word, in lexicographic order
+        @param low_word: inclusive lower bound, or None for no lower bound
+        @param high_word: exclusive upper bound, or None for no upper bound
+        @return: generator of WordFrequency
+        """
+        low = 0 if low_word is None else bisect.bisect_left(self.word_frequencies, low_word)
+        high = len(self.word_frequencies) if high_word is None else bisect.bisect_left(self.word_frequencies,
+                                                                                        high_word)
+
+        return self.iter_positions(low, high)
+
+    def iter_prefix(self, prefix_word: str):
+        """
+        lazily yield the words that have 'prefix_word' as a prefix, in lexicographic order
+        @param prefix_word: the prefix
+        @return: generator of WordFrequency
+        """
+        low, high = self.get_prefix_range(prefix_word)
+
+        return self.iter_positions(low, high)
+
+    def iter_positions(self, low: int, high: int):
+        # Walk the bisected bounds by index instead of slicing, so nothing proportional to the range is copied.
+        for index in range(low, high):
+            word_freq = self.word_frequencies[index]
+
+            if word_freq.word not in self.tombstones:
+                yield word_freq
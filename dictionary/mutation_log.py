@@ -0,0 +1,181 @@
+from typing import List
+import os
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+
+
+# ------------------------------------------------------------------------
+# Write-ahead log of the add and delete mutations applied to a dictionary, so that they survive the process.
+#
+# Every successful mutation is appended to the log as one line, "A word frequency" or "D word". Records are fsynced
+# in groups (group commit), which trades durability of the last few mutations in a crash for throughput. Every so
+# often the log is folded into a checkpoint holding the full set of words, and then emptied. Recovery builds the
+# dictionary from the last checkpoint (or the base data file if there is none) and replays only the log tail.
+# ------------------------------------------------------------------------
+
+def read_words_frequencies(data_path: str) -> List[WordFrequency]:
+    """
+    read a data file, one "word frequency" per line
+    @param data_path: file to read
+    @return: list of (word, frequency)
+    """
+    words_frequencies = []
+
+    with open(data_path, 'r') as data_file:
+        for line in data_file:
+            values = line.split()
+            words_frequencies.append(WordFrequency(values[0], int(values[1])))
+
+    return words_frequencies
+
+
+class MutationLog:
+
+    def __init__(self, log_path: str, base_data_path: str, group_size: int = 64, checkpoint_interval: int = 10000):
+        """
+        @param log_path: file the mutations are appended to; the checkpoint is kept next to it
+        @param base_data_path: data file the dictionary is built from while there is no checkpoint yet
+        @param group_size: number of mutations fsynced together, 1 to fsync every mutation
+        @param checkpoint_interval: number of logged mutations after which the log is folded into a checkpoint
+        """
+        self.log_path = log_path
+        self.checkpoint_path = log_path + '.checkpoint'
+        self.base_data_path = base_data_path
+        self.group_size = group_size
+        self.checkpoint_interval = checkpoint_interval
+        self.log_file = None
+        # Mutations written but not yet fsynced, and mutations in the log since the last checkpoint.
+        self.uncommitted = 0
+        self.logged = 0
+        self.checkpoints = 0
+
+    def recover(self, dictionary: BaseDictionary) -> int:
+        """
+        build the dictionary from the last checkpoint and replay the log tail onto it, then open the log for appends
+        @param dictionary: the dictionary to build
+        @return: number of mutations replayed
+        """
+        dictionary.build_dictionary(self.load_words_frequencies())
+
+        return self.replay_log(dictionary)
+
+    def replay_log(self, dictionary: BaseDictionary) -> int:
+        """
+        replay the log tail onto a dictionary already built from load_words_frequencies(), then open the log for
+        appends
+        @param dictionary: the built dictionary
+        @return: number of mutations replayed
+        """
+        replayed = 0
+        valid_length = 0
+
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as log_file:
+                for line in log_file:
+                    # A crash can leave the last record half written. It was never committed, so it is dropped.
+                    if not line.endswith(b'\n'):
+                        break
+
+                    self.apply_record(dictionary, line.decode('utf-8').split())
+                    valid_length += len(line)
+                    replayed += 1
+
+        # Appending after a torn record would merge the next record into it, so the log is cut back first.
+        self.log_file = open(self.log_path, 'ab')
+        self.log_file.truncate(valid_length)
+        self.logged = replayed
+
+        return replayed
+
+    def load_words_frequencies(self) -> List[WordFrequency]:
+        return read_words_frequencies(self.checkpoint_path if os.path.exists(self.checkpoint_path)
+                                      else self.base_data_path)
+
+    @staticmethod
+    def apply_record(dictionary: BaseDictionary, values: list):
+        # Replaying from a checkpoint that already contains some of the records is harmless: each record only sets
+        # whether its word is present, and only the last record of each word decides that.
+        if values[0] == 'A':
+            dictionary.add_word_frequency(WordFrequency(values[1], int(values[2])))
+        elif values[0] == 'D':
+            dictionary.delete_word(values[1])
+
+    def log_add(self, word_frequency: WordFrequency):
+        """
+        log a successful add
+        @param word_frequency: (word, frequency) that was added
+        """
+        self.append_record('A ' + word_frequency.word + ' ' + str(word_frequency.frequency) + '\n')
+
+    def log_delete(self, word: str):
+        """
+        log a successful delete
+        @param word: word that was deleted
+        """
+        self.append_record('D ' + word + '\n')
+
+    def append_record(self, record: str):
+        self.log_file.write(record.encode('utf-8'))
+        self.uncommitted += 1
+        self.logged += 1
+
+        if self.uncommitted >= self.group_size:
+            self.commit()
+
+        if self.logged >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def commit(self):
+        """
+        make every logged mutation durable
+        """
+        if self.uncommitted > 0:
+            self.log_file.flush()
+            os.fsync(self.log_file.fileno())
+            self.uncommitted = 0
+
+    def checkpoint(self):
+        """
+        fold the log into a new checkpoint and empty the log
+        """
+        self.commit()
+
+        # The words are rebuilt from the previous checkpoint and the log alone, which works the same for every
+        # dictionary implementation, as none of them has to list its words.
+        words_frequencies = dict((word_freq.word, word_freq.frequency) for word_freq in self.load_words_frequencies())
+
+        with open(self.log_path, 'r') as log_file:
+            for line in log_file:
+                values = line.split()
+
+                if values[0] == 'A':
+                    words_frequencies.setdefault(values[1], int(values[2]))
+                else:
+                    words_frequencies.pop(values[1], None)
+
+        # The new checkpoint replaces the old one atomically, and only then is the log emptied. A crash in between
+        # replays records that are already in the checkpoint, which apply_record() tolerates.
+        temporary_path = self.checkpoint_path + '.tmp'
+
+        with open(temporary_path, 'w') as checkpoint_file:
+            for word, frequency in words_frequencies.items():
+                checkpoint_file.write(word + '  ' + str(frequency) + '\n')
+
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+
+        os.replace(temporary_path, self.checkpoint_path)
+
+        self.log_file.truncate(0)
+        os.fsync(self.log_file.fileno())
+        self.logged = 0
+        self.checkpoints += 1
+
+    def close(self):
+        """
+        commit the outstanding mutations and close the log
+        """
+        if self.log_file is not None:
+            self.commit()
+            self.log_file.close()
+            self.log_file = None
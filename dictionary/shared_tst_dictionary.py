@@ -0,0 +1,237 @@
+from typing import List
+from array import array
+import os
+import mmap
+import heapq
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+from dictionary.ternarysearchtree_dictionary import TernarySearchTreeDictionary
+
+
+# ------------------------------------------------------------------------
+# Read-only ternary search tree flattened into a file that is memory-mapped for queries. One process builds the
+# file, and any number of other processes attach to it by path and query it in place: the nodes are never copied or
+# unpickled, so every process shares the one copy of the tree held in the page cache, and attaching costs the same
+# however large the tree is. Putting the file under /dev/shm keeps it in shared memory without touching the disk.
+#
+# Node i is spread over parallel arrays: its letter (as a code point), the indices of its left, middle and right
+# children (-1 for none), the frequency of the word ending at it (0 if none) and the highest frequency of any word
+# in its subtree, which lets autocomplete find the 3 best words without visiting the whole subtree.
+# ------------------------------------------------------------------------
+
+class SharedTernarySearchTreeDictionary(BaseDictionary):
+    # File layout: a header of int64 [node count, root index], followed by the arrays (name, typecode) in order.
+    HEADER_SIZE = 2
+    LAYOUT = [('letters', 'i'), ('lefts', 'i'), ('middles', 'i'), ('rights', 'i'), ('frequencies', 'q'),
+              ('subtree_max_frequencies', 'q')]
+
+    def __init__(self, path: str):
+        """
+        @param path: file the flattened tree is written to by build_dictionary(), and mapped from
+        """
+        self.path = path
+        self.mapped_file = None
+        self.root = -1
+        self.views = []
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes, in the dictionary's file
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        self.close()
+
+        # Building median-first from sorted words keeps every level balanced, as compaction does.
+        tree = TernarySearchTreeDictionary()
+        sorted_words = sorted([word_freq.word, word_freq.frequency] for word_freq in words_frequencies)
+        tree.add_sorted_words(sorted_words, 0, len(sorted_words))
+
+        arrays = dict((array_name, array(typecode)) for array_name, typecode in self.LAYOUT)
+        node_indices = dict()
+        stack = [tree.root_node] if tree.root_node is not None else []
+
+        # First give every node its index, then fill in the links, which need the indices of the children.
+        while len(stack) > 0:
+            cur_node = stack.pop()
+            node_indices[id(cur_node)] = len(node_indices)
+            arrays['letters'].append(ord(cur_node.letter))
+            arrays['frequencies'].append(cur_node.frequency if cur_node.end_word else 0)
+            arrays['subtree_max_frequencies'].append(cur_node.subtree_max_frequency)
+
+            for child in (cur_node.right, cur_node.middle, cur_node.left):
+                if child is not None:
+                    stack.append(child)
+
+        stack = [tree.root_node] if tree.root_node is not None else []
+
+        while len(stack) > 0:
+            cur_node = stack.pop()
+
+            for array_name, child in (('lefts', cur_node.left), ('middles', cur_node.middle),
+                                      ('rights', cur_node.right)):
+                arrays[array_name].append(node_indices[id(child)] if child is not None else -1)
+
+            for child in (cur_node.right, cur_node.middle, cur_node.left):
+                if child is not None:
+                    stack.append(child)
+
+        header = array('q', [len(node_indices), 0 if len(node_indices) > 0 else -1])
+        temporary_path = self.path + '.tmp'
+
+        # The finished file replaces any previous one atomically, so a process attaching meanwhile never maps a
+        # half-written tree. Processes still mapping the previous file keep reading it until they close.
+        with open(temporary_path, 'wb') as tree_file:
+            for part in [header] + [arrays[array_name] for array_name, _ in self.LAYOUT]:
+                part.tofile(tree_file)
+
+        os.replace(temporary_path, self.path)
+        self.map_file()
+
+    @classmethod
+    def attach(cls, path: str):
+        """
+        attach to a tree another process built, without copying it
+        @param path: file the tree was built into
+        @return: a dictionary reading the mapped file
+        """
+        dictionary = cls(path)
+        dictionary.map_file()
+
+        return dictionary
+
+    def map_file(self):
+        with open(self.path, 'rb') as tree_file:
+            self.mapped_file = mmap.mmap(tree_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Typed memoryviews straight onto the mapping, so reading node i reads the shared pages directly.
+        buffer = memoryview(self.mapped_file)
+        header = buffer[0:8 * self.HEADER_SIZE].cast('q')
+        num_of_nodes, self.root = header[0], header[1]
+        self.views = [buffer, header]
+        offset = 8 * self.HEADER_SIZE
+
+        for array_name, typecode in self.LAYOUT:
+            length = num_of_nodes * array(typecode).itemsize
+            view = buffer[offset:offset + length].cast(typecode)
+            setattr(self, array_name, view)
+            self.views.append(view)
+            offset += length
+
+    def close(self):
+        """
+        unmap the file, which stays in place for other processes
+        """
+        if self.mapped_file is None:
+            return
+
+        # The mapping can't be closed while views onto it are still alive.
+        for array_name, _ in self.LAYOUT:
+            if hasattr(self, array_name):
+                delattr(self, array_name)
+
+        for view in reversed(self.views):
+            view.release()
+
+        self.views = []
+        self.mapped_file.close()
+        self.mapped_file = None
+
+    def find_node(self, word: str) -> int:
+        # Iterative descent, returning the index of the node of the word's last letter, or -1.
+        cur_node = self.root
+        cur_index = 0
+
+        while cur_node >= 0:
+            cur_char = ord(word[cur_index])
+            node_letter = self.letters[cur_node]
+
+            if cur_char < node_letter:
+                cur_node = self.lefts[cur_node]
+            elif cur_char > node_letter:
+                cur_node = self.rights[cur_node]
+            elif cur_index < len(word) - 1:
+                cur_node = self.middles[cur_node]
+                cur_index += 1
+            else:
+                return cur_node
+
+        return -1
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        if len(word) == 0:
+            return 0
+
+        find_node = self.find_node(word)
+
+        return self.frequencies[find_node] if find_node >= 0 else 0
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        raise TypeError("SharedTernarySearchTreeDictionary is read-only, rebuild it to add '" +
+                        word_frequency.word + "'")
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        raise TypeError("SharedTernarySearchTreeDictionary is read-only, rebuild it to delete '" + word + "'")
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        most_frequent = []
+
+        if len(prefix_word) == 0:
+            return most_frequent
+
+        prefix_node = self.find_node(prefix_word)
+
+        if prefix_node < 0:
+            return most_frequent
+
+        # Best-first search ranked by (-frequency, text), where a subtree is ranked by its highest frequency and the
+        # letters above its level (a bound on every word in it), and words win ties against subtrees. Equally
+        # frequent words therefore come out in alphabetical order, as in the list approach.
+        heap = []
+
+        if self.frequencies[prefix_node] > 0:
+            heap.append((-self.frequencies[prefix_node], prefix_word, False, prefix_node))
+
+        if self.middles[prefix_node] >= 0:
+            middle = self.middles[prefix_node]
+            heap.append((-self.subtree_max_frequencies[middle], prefix_word, True, middle))
+
+        heapq.heapify(heap)
+
+        while len(heap) > 0 and len(most_frequent) < 3:
+            negative_frequency, text, is_subtree, cur_node = heapq.heappop(heap)
+
+            if not is_subtree:
+                most_frequent.append(WordFrequency(text, -negative_frequency))
+                continue
+
+            cur_word = text + chr(self.letters[cur_node])
+
+            if self.frequencies[cur_node] > 0:
+                heapq.heappush(heap, (-self.frequencies[cur_node], cur_word, False, cur_node))
+
+            for child, child_text in ((self.lefts[cur_node], text), (self.middles[cur_node], cur_word),
+                                      (self.rights[cur_node], text)):
+                if child >= 0:
+                    heapq.heappush(heap, (-self.subtree_max_frequencies[child], child_text, True, child))
+
+        return most_frequent
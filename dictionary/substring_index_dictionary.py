@@ -0,0 +1,303 @@
+from typing import List
+from array import array
+import bisect
+import heapq
+import sys
+from dictionary.base_dictionary import BaseDictionary
+from dictionary.word_frequency import WordFrequency
+
+
+# ------------------------------------------------------------------------
+# Suffix array index for substring (infix) autocomplete, e.g. "graph" -> "photograph", "paragraph", and a dictionary
+# wrapper that keeps such an index next to any other dictionary implementation.
+# ------------------------------------------------------------------------
+
+class SuffixArrayIndex:
+    # Separates the words in the concatenated text. It sorts before every letter, so a suffix that runs into the
+    # next word still sorts where the suffix cut at the end of its own word would.
+    SEPARATOR = '\x00'
+
+    def __init__(self, words_frequencies: List[WordFrequency]):
+        """
+        build the index, which is static apart from deletes
+        @param words_frequencies: list of (word, frequency) to be indexed
+        """
+        sorted_words_frequencies = sorted(words_frequencies, key=lambda word_freq: word_freq.word)
+        self.words = [word_freq.word for word_freq in sorted_words_frequencies]
+        # A deleted word keeps its suffixes, but its frequency drops to 0 so it is never reported again.
+        self.frequencies = array('q', [word_freq.frequency for word_freq in sorted_words_frequencies])
+        self.deleted_count = 0
+
+        self.text = self.SEPARATOR.join(self.words) + self.SEPARATOR
+        self.word_starts = array('i')
+        suffix_positions = []
+        suffix_words = []
+        position = 0
+
+        for word_id in range(0, len(self.words)):
+            self.word_starts.append(position)
+            suffix_positions.extend(range(position, position + len(self.words[word_id])))
+            suffix_words.extend([word_id] * len(self.words[word_id]))
+            position += len(self.words[word_id]) + 1
+
+        # suffixes[i] is the text position of the i-th smallest suffix, suffix_words[i] the word it belongs to, and
+        # ranks the inverse of suffixes, which locates a word's suffixes when it is deleted.
+        order = sorted(range(0, len(suffix_positions)),
+                       key=lambda i: self.text[suffix_positions[i]:self.text.index(self.SEPARATOR,
+                                                                                   suffix_positions[i])])
+        self.suffixes = array('i', [suffix_positions[i] for i in order])
+        self.suffix_words = array('i', [suffix_words[i] for i in order])
+        self.ranks = array('i', [0] * len(self.text))
+
+        for i in range(0, len(self.suffixes)):
+            self.ranks[self.suffixes[i]] = i
+
+        # Segment tree over the suffixes, where each node holds the suffix of highest word frequency in its range.
+        # The leaves are tree[n..2n-1] and tree[j] combines tree[2j] and tree[2j+1].
+        num_of_suffixes = len(self.suffixes)
+        self.tree = array('i', [0] * num_of_suffixes) + array('i', range(0, num_of_suffixes))
+
+        for j in range(num_of_suffixes - 1, 0, -1):
+            self.tree[j] = self.most_frequent_suffix(self.tree[2 * j], self.tree[2 * j + 1])
+
+    def __len__(self):
+        return len(self.words) - self.deleted_count
+
+    def most_frequent_suffix(self, first: int, second: int) -> int:
+        if first < 0:
+            return second
+        if second < 0:
+            return first
+
+        return first if self.frequencies[self.suffix_words[first]] >= self.frequencies[self.suffix_words[second]] \
+            else second
+
+    def range_most_frequent_suffix(self, low: int, high: int) -> int:
+        # Iterative bottom-up segment tree query over [low, high), -1 when the range is empty.
+        best = -1
+        low += len(self.suffixes)
+        high += len(self.suffixes)
+
+        while low < high:
+            if low & 1:
+                best = self.most_frequent_suffix(best, self.tree[low])
+                low += 1
+            if high & 1:
+                high -= 1
+                best = self.most_frequent_suffix(best, self.tree[high])
+
+            low >>= 1
+            high >>= 1
+
+        return best
+
+    def get_word_id(self, word: str) -> int:
+        word_id = bisect.bisect_left(self.words, word)
+
+        return word_id if word_id < len(self.words) and self.words[word_id] == word else -1
+
+    def contains(self, word: str) -> bool:
+        word_id = self.get_word_id(word)
+
+        return word_id >= 0 and self.frequencies[word_id] > 0
+
+    def delete_word(self, word: str) -> bool:
+        """
+        stop reporting a word, in O(len(word) log N)
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when word is not indexed
+        """
+        word_id = self.get_word_id(word)
+
+        if word_id < 0 or self.frequencies[word_id] == 0:
+            return False
+
+        self.frequencies[word_id] = 0
+        self.deleted_count += 1
+
+        # Only the tree paths above the word's own suffixes can have changed.
+        for position in range(self.word_starts[word_id], self.word_starts[word_id] + len(word)):
+            j = (self.ranks[position] + len(self.suffixes)) >> 1
+
+            while j >= 1:
+                self.tree[j] = self.most_frequent_suffix(self.tree[2 * j], self.tree[2 * j + 1])
+                j >>= 1
+
+        return True
+
+    def get_suffix_range(self, fragment: str):
+        # The suffixes that start with the fragment form one contiguous run of the array. Both ends are found by
+        # binary search, comparing only the first len(fragment) letters of a suffix, i.e. in O(m log N).
+        length = len(fragment)
+        low, high = 0, len(self.suffixes)
+
+        while low < high:
+            middle = (low + high) // 2
+            position = self.suffixes[middle]
+
+            if self.text[position:position + length] < fragment:
+                low = middle + 1
+            else:
+                high = middle
+
+        range_low, high = low, len(self.suffixes)
+
+        while low < high:
+            middle = (low + high) // 2
+            position = self.suffixes[middle]
+
+            if self.text[position:position + length] <= fragment:
+                low = middle + 1
+            else:
+                high = middle
+
+        return range_low, low
+
+    def most_frequent(self, fragment: str, k: int) -> List[WordFrequency]:
+        """
+        return the k most-frequent indexed words that contain 'fragment'
+        @param fragment: the substring to look for
+        @param k: number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words containing 'fragment'
+        """
+        # Repeatedly take the most frequent suffix of a range and split the range around it, so only about k ranges
+        # are ever examined, however many words contain the fragment. A word containing the fragment more than once
+        # comes up once per occurrence and is only reported the first time.
+        low, high = self.get_suffix_range(fragment)
+        reported_words = set()
+        most_frequent = []
+        ranges = []
+
+        def push_range(range_low: int, range_high: int):
+            best = self.range_most_frequent_suffix(range_low, range_high)
+
+            if best >= 0 and self.frequencies[self.suffix_words[best]] > 0:
+                heapq.heappush(ranges, (-self.frequencies[self.suffix_words[best]], best, range_low, range_high))
+
+        push_range(low, high)
+
+        # Ties with the k-th frequency are collected as well, so that they can be broken by the word itself.
+        while len(ranges) > 0 and (len(most_frequent) < k or -ranges[0][0] >= most_frequent[-1].frequency):
+            negative_frequency, best, range_low, range_high = heapq.heappop(ranges)
+            word_id = self.suffix_words[best]
+
+            if word_id not in reported_words:
+                reported_words.add(word_id)
+                most_frequent.append(WordFrequency(self.words[word_id], -negative_frequency))
+
+            push_range(range_low, best)
+            push_range(best + 1, range_high)
+
+        most_frequent.sort(key=lambda word_freq: (-word_freq.frequency, word_freq.word))
+
+        return most_frequent[0:k]
+
+    def live_words_frequencies(self) -> List[WordFrequency]:
+        return [WordFrequency(self.words[word_id], self.frequencies[word_id])
+                for word_id in range(0, len(self.words)) if self.frequencies[word_id] > 0]
+
+    def memory_usage(self) -> int:
+        """
+        approximate memory held by the index
+        @return: size in bytes of the text, the arrays and the word list
+        """
+        return sum(sys.getsizeof(part) for part in [self.text, self.words, self.frequencies, self.word_starts,
+                                                    self.suffixes, self.suffix_words, self.ranks, self.tree]) + \
+            sum(sys.getsizeof(word) for word in self.words)
+
+
+class SubstringIndexDictionary(BaseDictionary):
+
+    def __init__(self, dictionary: BaseDictionary, rebuild_ratio: float = 0.1):
+        """
+        @param dictionary: the dictionary implementation to keep the index next to
+        @param rebuild_ratio: rebuild the index once the words added since the last build reach this fraction of
+        the words in the index
+        """
+        self.dictionary = dictionary
+        self.rebuild_ratio = rebuild_ratio
+        self.index = SuffixArrayIndex([])
+        # Words added since the index was built. They are few, so a substring query simply scans them.
+        self.delta_words = dict()
+        self.rebuilds = 0
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        self.dictionary.build_dictionary(words_frequencies)
+        self.index = SuffixArrayIndex(words_frequencies)
+        self.delta_words = dict()
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        return self.dictionary.search(word)
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word_added = self.dictionary.add_word_frequency(word_frequency)
+
+        if word_added:
+            self.delta_words[word_frequency.word] = word_frequency.frequency
+
+            # Deletes are applied to the index in place, but adds accumulate in the delta, which every query scans.
+            if len(self.delta_words) > max(self.rebuild_ratio * len(self.index), 1):
+                self.rebuild_index()
+
+        return word_added
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        word_deleted = self.dictionary.delete_word(word)
+
+        if word_deleted:
+            if word in self.delta_words:
+                del self.delta_words[word]
+            else:
+                self.index.delete_word(word)
+
+        return word_deleted
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        return self.dictionary.autocomplete(prefix_word)
+
+    def substring_search(self, fragment: str, k: int = 3) -> List[WordFrequency]:
+        """
+        return the k most-frequent words in the dictionary that contain 'fragment' anywhere
+        @param fragment: the substring to look for
+        @param k: number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words containing 'fragment'
+        """
+        most_frequent = self.index.most_frequent(fragment, k)
+        most_frequent.extend(WordFrequency(word, frequency) for word, frequency in self.delta_words.items()
+                             if fragment in word)
+
+        return heapq.nsmallest(k, most_frequent, key=lambda word_freq: (-word_freq.frequency, word_freq.word))
+
+    def rebuild_index(self):
+        """
+        fold the added words into a new index, which also drops the deleted words for good
+        """
+        words_frequencies = self.index.live_words_frequencies()
+        words_frequencies.extend(WordFrequency(word, frequency) for word, frequency in self.delta_words.items())
+        self.index = SuffixArrayIndex(words_frequencies)
+        self.delta_words = dict()
+        self.rebuilds += 1
@@ -1,4 +1,7 @@
 from typing import List
+import math
+import heapq
+import bisect
 from dictionary.base_dictionary import BaseDictionary
 from dictionary.word_frequency import WordFrequency
 from dictionary.node import Node
@@ -14,9 +17,31 @@ from dictionary.node import Node
 
 class TernarySearchTreeDictionary(BaseDictionary):
 
-    def __init__(self):
+    def __init__(self, tombstone_deletes: bool = False, compaction_ratio: float = 0.25, rebalance: bool = False,
+                 rebalance_factor: float = 2.0, adaptive: bool = False, adaptive_interval: int = 16):
+        """
+        @param tombstone_deletes: if True, deletes only mark the word's node dead and the tree is compacted lazily
+        @param compaction_ratio: fraction of dead words in the tree that triggers a compaction
+        @param rebalance: if True, a level's left/right tree is rebuilt once an insert leaves it too deep
+        @param rebalance_factor: c in the depth limit c * log2(level size + 1) that triggers a rebuild
+        @param adaptive: if True, search and autocomplete rotate frequently accessed letters up their level
+        @param adaptive_interval: in adaptive mode, a letter is only considered for rotation on every this many hits
+        """
         # Keep track of the root node of the tree (important)
         self.root_node = None
+        self.tombstone_deletes = tombstone_deletes
+        self.compaction_ratio = compaction_ratio
+        # Number of words stored, and number of tombstoned words whose nodes are still in the tree.
+        self.word_count = 0
+        self.dead_word_count = 0
+        self.compactions = 0
+        self.entries_reclaimed = 0
+        self.rebalance = rebalance
+        self.rebalance_factor = rebalance_factor
+        self.level_rebuilds = 0
+        self.adaptive = adaptive
+        self.adaptive_interval = adaptive_interval
+        self.adaptive_rotations = 0
 
     def build_dictionary(self, words_frequencies: List[WordFrequency]):
         """
@@ -27,7 +52,15 @@ class TernarySearchTreeDictionary(BaseDictionary):
         # all word_freqs have been added, since recursion is used we can simply assign the root_node
         # to the final word_freq 
         for word_freq in words_frequencies:
-            self.root_node = self.add_to_tst(self.root_node, word_freq.word, word_freq.frequency, 0)
+            self.insert_word(word_freq.word, word_freq.frequency)
+
+    def insert_word(self, word: str, frequency: int):
+        self.root_node = self.add_to_tst(self.root_node, word, frequency, 0)
+
+        # The order of the inserts decides the shape of each level's left/right tree, so in rebalance mode we
+        # repair any level the new word has made too deep before it can slow down later searches.
+        if self.rebalance:
+            self.root_node = self.rebalance_path(self.root_node, word, 0)
 
     def add_to_tst(self, cur_node: Node, cur_word: str, cur_freq: int, cur_index: int):
         cur_char = cur_word[cur_index]
@@ -47,10 +80,19 @@ class TernarySearchTreeDictionary(BaseDictionary):
             cur_node.middle = self.add_to_tst(cur_node.middle, cur_word, cur_freq, cur_index + 1)
         else:
             # If none of the above hold true, we have reached the final letter and can assign
-            # the frequency of the word to it (as required)
+            # the frequency of the word to it (as required). A frequency of 0 on a node that isn't the end of a
+            # word marks a tombstone, which this add brings back to life.
+            if not cur_node.end_word:
+                self.word_count += 1
+
+                if self.tombstone_deletes and cur_node.frequency == 0:
+                    self.dead_word_count -= 1
+
             cur_node.frequency = cur_freq
             cur_node.end_word = True
 
+        self.refresh_aggregates(cur_node)
+
         return cur_node
 
     def search(self, word: str) -> int:
@@ -59,7 +101,10 @@ class TernarySearchTreeDictionary(BaseDictionary):
         @param word: the word to be searched
         @return: frequency > 0 if found and 0 if NOT found
         """
-        find_node = self.search_tst(self.root_node, word, 0)
+        if self.adaptive:
+            find_node = self.access_word(word)
+        else:
+            find_node = self.search_tst(self.root_node, word, 0)
 
         # The two conditions for a node not found are: 
         # - node reaches end of tree before completion
@@ -98,7 +143,7 @@ class TernarySearchTreeDictionary(BaseDictionary):
         node_does_not_exist = find_node is None or find_node.end_word is False
 
         if node_does_not_exist:
-            self.add_to_tst(self.root_node, word_frequency.word, word_frequency.frequency, 0)
+            self.insert_word(word_frequency.word, word_frequency.frequency)
 
         return node_does_not_exist
 
@@ -108,12 +153,18 @@ class TernarySearchTreeDictionary(BaseDictionary):
         @param word: word to be deleted
         @return: whether succeeded, e.g. return False when point not found
         """
+        if self.tombstone_deletes:
+            return self.delete_word_lazily(word)
+
         # Similar to above, we will check that the word exists, if it does
-        # then we can safely delete it
-        word_exists = self.search(word) != 0
+        # then we can safely delete it. This goes through search_tst rather than search, so that deletes
+        # don't count as accesses in adaptive mode.
+        find_node = self.search_tst(self.root_node, word, 0)
+        word_exists = find_node is not None and find_node.end_word
 
         if word_exists:
-            self.delete_from_tst(self.root_node, word, 0)
+            self.root_node = self.delete_from_tst(self.root_node, word, 0)
+            self.word_count -= 1
 
         return word_exists
 
@@ -128,13 +179,193 @@ class TernarySearchTreeDictionary(BaseDictionary):
         elif cur_index < len(cur_word) - 1:
             cur_node.middle = self.delete_from_tst(cur_node.middle, cur_word, cur_index + 1)
         else:
-            # If it is a leaf, then we can simply just remove it.
-            if cur_node.left is None and cur_node.right is None and cur_node.middle is None:
-                return None
-            # In this case, it has at least one child, and is considered an end word.
-            else:
-                cur_node.frequency = 0
-                cur_node.end_word = False
+            cur_node.frequency = 0
+            cur_node.end_word = False
+
+        # A node that is no longer the end of a word and has nothing below it in the middle leads to no words at
+        # all. Since the recursion unwinds from the deleted word back towards the root, every such ancestor is
+        # reclaimed in turn, not just the final node.
+        if not cur_node.end_word and cur_node.middle is None:
+            return self.remove_from_level(cur_node)
+
+        self.refresh_aggregates(cur_node)
+
+        return cur_node
+
+    def remove_from_level(self, cur_node: Node):
+        # Splice the node out of its level's left/right tree (a plain BST deletion), returning the node that takes
+        # its place. Only left/right links are rewired, so the middle subtrees of the other nodes stay attached.
+        if cur_node.left is None:
+            return cur_node.right
+        elif cur_node.right is None:
+            return cur_node.left
+
+        # With two children, the smallest letter of the right subtree replaces the removed node.
+        successor_parent = cur_node
+        successor = cur_node.right
+        successor_ancestors = []
+
+        while successor.left is not None:
+            successor_parent = successor
+            successor_ancestors.append(successor)
+            successor = successor.left
+
+        if successor_parent is not cur_node:
+            successor_parent.left = successor.right
+            successor.right = cur_node.right
+
+            # The nodes the successor was lifted out from below have lost its words from their subtrees.
+            for ancestor in reversed(successor_ancestors):
+                self.refresh_aggregates(ancestor)
+
+        successor.left = cur_node.left
+        self.refresh_aggregates(successor)
+
+        return successor
+
+    def add_many(self, words_frequencies: List[WordFrequency]) -> List[bool]:
+        """
+        add a batch of words and their frequencies to the dictionary, as if added one at a time in order
+        @param words_frequencies: list of (word, frequency) to be added
+        @return: for each item, True whether succeeded, False when word is already in the dictionary (or earlier in
+        the batch)
+        """
+        # In rebalance mode every insert repairs its own path, which a shared descent would skip.
+        if self.rebalance:
+            return super().add_many(words_frequencies)
+
+        # The stable sort keeps repeats of a word in batch order, so the first of them is the one that is added.
+        order = sorted(range(0, len(words_frequencies)), key=lambda i: words_frequencies[i].word)
+        batch = [(words_frequencies[i].word, words_frequencies[i].frequency, i) for i in order]
+        sorted_words = [item[0] for item in batch]
+        results = [False] * len(words_frequencies)
+
+        if len(batch) > 0:
+            self.root_node = self.add_sorted_to_tst(self.root_node, batch, sorted_words, 0, len(batch), 0, results)
+
+        return results
+
+    def add_sorted_to_tst(self, cur_node: Node, batch: list, sorted_words: list, low: int, high: int,
+                          cur_index: int, results: list):
+        # Insert batch[low:high], sorted words that all share their first cur_index letters and are longer than
+        # that, into the level whose tree is rooted at cur_node. Each node on the way is visited once for the whole
+        # range rather than once per word, and the range splits in three around the node's letter.
+        if high - low == 1:
+            # A single word has nothing left to share, and the plain insert is cheaper than splitting its range.
+            find_node = self.search_tst(cur_node, batch[low][0], cur_index)
+
+            if find_node is not None and find_node.end_word:
+                return cur_node
+
+            results[batch[low][2]] = True
+
+            return self.add_to_tst(cur_node, batch[low][0], batch[low][1], cur_index)
+
+        if cur_node is None:
+            # Taking the letter of the middle word makes the new part of a level balanced, as in add_sorted_words().
+            cur_node = Node(sorted_words[(low + high) // 2][cur_index])
+
+        prefix = sorted_words[low][0:cur_index]
+        letter_word = prefix + cur_node.letter
+        # Words with a smaller letter here sort before letter_word, and words with a larger one after all the words
+        # that continue it.
+        equal_low = bisect.bisect_left(sorted_words, letter_word, low, high)
+        equal_high = bisect.bisect_left(sorted_words, prefix + chr(ord(cur_node.letter) + 1), equal_low, high)
+
+        if low < equal_low:
+            cur_node.left = self.add_sorted_to_tst(cur_node.left, batch, sorted_words, low, equal_low, cur_index,
+                                                   results)
+        if equal_high < high:
+            cur_node.right = self.add_sorted_to_tst(cur_node.right, batch, sorted_words, equal_high, high, cur_index,
+                                                    results)
+
+        # The words that end at this node come first in their range.
+        words_end = bisect.bisect_right(sorted_words, letter_word, equal_low, equal_high)
+
+        if equal_low < words_end and not cur_node.end_word:
+            self.word_count += 1
+
+            if self.tombstone_deletes and cur_node.frequency == 0:
+                self.dead_word_count -= 1
+
+            cur_node.frequency = batch[equal_low][1]
+            cur_node.end_word = True
+            results[batch[equal_low][2]] = True
+
+        if words_end < equal_high:
+            cur_node.middle = self.add_sorted_to_tst(cur_node.middle, batch, sorted_words, words_end, equal_high,
+                                                     cur_index + 1, results)
+
+        self.refresh_aggregates(cur_node)
+
+        return cur_node
+
+    def delete_many(self, words: List[str]) -> List[bool]:
+        """
+        delete a batch of words from the dictionary, as if deleted one at a time in order
+        @param words: words to be deleted
+        @return: for each word, whether succeeded, e.g. False when word not found (or deleted earlier in the batch)
+        """
+        # Lazy deletes only mark their node and may trigger a compaction part way through the batch.
+        if self.tombstone_deletes:
+            return super().delete_many(words)
+
+        order = sorted(range(0, len(words)), key=lambda i: words[i])
+        sorted_words = [words[i] for i in order]
+        results = [False] * len(words)
+
+        if len(words) > 0 and self.root_node is not None:
+            self.root_node = self.delete_sorted_from_tst(self.root_node, order, sorted_words, 0, len(words), 0,
+                                                         results)
+
+        return results
+
+    def delete_sorted_from_tst(self, cur_node: Node, order: list, sorted_words: list, low: int, high: int,
+                               cur_index: int, results: list):
+        # The counterpart of add_sorted_to_tst(). A range that runs off the tree holds words that are not present.
+        if cur_node is None:
+            return None
+
+        if high - low == 1:
+            find_node = self.search_tst(cur_node, sorted_words[low], cur_index)
+
+            if find_node is None or not find_node.end_word:
+                return cur_node
+
+            self.word_count -= 1
+            results[order[low]] = True
+
+            return self.delete_from_tst(cur_node, sorted_words[low], cur_index)
+
+        prefix = sorted_words[low][0:cur_index]
+        letter_word = prefix + cur_node.letter
+        equal_low = bisect.bisect_left(sorted_words, letter_word, low, high)
+        equal_high = bisect.bisect_left(sorted_words, prefix + chr(ord(cur_node.letter) + 1), equal_low, high)
+
+        if low < equal_low:
+            cur_node.left = self.delete_sorted_from_tst(cur_node.left, order, sorted_words, low, equal_low,
+                                                        cur_index, results)
+        if equal_high < high:
+            cur_node.right = self.delete_sorted_from_tst(cur_node.right, order, sorted_words, equal_high, high,
+                                                         cur_index, results)
+
+        words_end = bisect.bisect_right(sorted_words, letter_word, equal_low, equal_high)
+
+        if equal_low < words_end and cur_node.end_word:
+            cur_node.frequency = 0
+            cur_node.end_word = False
+            self.word_count -= 1
+            results[order[equal_low]] = True
+
+        if words_end < equal_high:
+            cur_node.middle = self.delete_sorted_from_tst(cur_node.middle, order, sorted_words, words_end,
+                                                          equal_high, cur_index + 1, results)
+
+        # Dead nodes are pruned on the way back up, exactly as delete_from_tst() does.
+        if not cur_node.end_word and cur_node.middle is None:
+            return self.remove_from_level(cur_node)
+
+        self.refresh_aggregates(cur_node)
 
         return cur_node
 
@@ -151,35 +382,44 @@ class TernarySearchTreeDictionary(BaseDictionary):
         words_to_ignore = []
         children_suffixes = []
 
-        # CASE 1: If the prefix is the root node's letter (length = 1), just scan the entire middle subtree.
-        if word == self.root_node.letter:
-            root_of_suffixes = self.root_node.middle
+        if self.root_node is None:
+            return most_frequent
+
+        # In adaptive mode, access_word() already ends on the prefix's node, so it stands in for the search below
+        # rather than the tree being descended a second time.
+        if self.adaptive:
+            prefix_node = self.access_word(word)
+        # CASE 1: If the prefix is the root node's letter (length = 1), its node is the root, whose middle subtree
+        # is scanned in full.
+        elif word == self.root_node.letter:
+            prefix_node = self.root_node
         # CASE 2: If the prefix is not the root node,
         else:
-            root_of_suffixes = self.search_tst(self.root_node, word, 0)
-            # If the word is actually inside the tst, then we can process it (e.g., word = farm will return null).
-            if root_of_suffixes is not None:
-                # SUB-CASE2: If the prefix is itself a word, then we should prepend the prefix to the list, as it will
-                # not be processed in the get_all_children_words() method, since we only use its middle node.
-                if root_of_suffixes.end_word:
-                    # Leave the word string empty, as it will be added in CASE 5 (prefix + suffix = word).
-                    children_suffixes.append(["", root_of_suffixes.frequency])
-
-                # Use the middle node of the root_of_suffixes node, because we only want sub-strings of the prefix,
-                # but do not want different words that share prefix - 1 letters.
-                root_of_suffixes = root_of_suffixes.middle
+            prefix_node = self.search_tst(self.root_node, word, 0)
+
+        root_of_suffixes = None
+
+        # If the word is actually inside the tst, then we can process it (e.g., word = farm will return null).
+        if prefix_node is not None:
+            # SUB-CASE2: If the prefix is itself a word, then we should prepend the prefix to the list, as it will
+            # not be processed in the get_all_children_words() method, since we only use its middle node.
+            if prefix_node.end_word:
+                # Leave the word string empty, as it will be added in CASE 4 (prefix + suffix = word).
+                children_suffixes.append(["", prefix_node.frequency])
+
+            # Use the middle node of the prefix's node, because we only want sub-strings of the prefix, but do not
+            # want different words that share prefix - 1 letters.
+            root_of_suffixes = prefix_node.middle
 
         # Get all the children of the root_of_suffixes.
         self.get_all_children_words(root_of_suffixes, "", children_suffixes)
 
         # CASE 3: If no words start with the prefix, return an empty list.
-        if len(children_suffixes) <= 0 or root_of_suffixes is None:
+        if len(children_suffixes) <= 0:
             return most_frequent
-        # CASE 4: If the prefix is itself the entire and only word (aka. the last letter of the prefix is an end_word).
-        elif root_of_suffixes.end_word and len(children_suffixes) == 1:
-            return [WordFrequency(word, root_of_suffixes.frequency)]
-        # CASE 5: If the prefix has n usages, then find all the usages and add them to a list, selecting the three
-        # with the highest frequency.
+        # CASE 4: If the prefix has n usages (including the prefix itself being the entire and only word, which
+        # SUB-CASE2 recorded with an empty suffix), then find all the usages and add them to a list, selecting the
+        # three with the highest frequency.
         else:
             for i in range(0, 3):
                 highest_frequency = 0
@@ -213,3 +453,478 @@ class TernarySearchTreeDictionary(BaseDictionary):
 
             if cur_node.end_word:
                 children_suffixes.append([output + cur_node.letter, cur_node.frequency])
+
+    def delete_word_lazily(self, word: str) -> bool:
+        # A single descent finds the word's node, which is then only marked dead (frequency 0, no longer the end
+        # of a word). Its now-useless nodes are left in place until a compaction rebuilds the tree.
+        path = self.get_path(word)
+
+        if len(path) == 0 or not path[-1].end_word:
+            return False
+
+        path[-1].end_word = False
+        path[-1].frequency = 0
+
+        for cur_node in reversed(path):
+            self.refresh_aggregates(cur_node)
+        self.word_count -= 1
+        self.dead_word_count += 1
+
+        if self.dead_word_count >= self.compaction_ratio * (self.word_count + self.dead_word_count):
+            self.compact()
+
+        return True
+
+    def compact(self):
+        """
+        rebuild the tree from its live words, dropping every node left behind by tombstoned deletes
+        """
+        if self.dead_word_count == 0:
+            return
+
+        live_words = []
+        self.get_all_children_words(self.root_node, "", live_words)
+        live_words.sort()
+
+        self.entries_reclaimed += self.dead_word_count
+        self.compactions += 1
+        self.root_node = None
+        self.word_count = 0
+        self.dead_word_count = 0
+        self.add_sorted_words(live_words, 0, len(live_words))
+
+    def add_sorted_words(self, sorted_words: list, low: int, high: int):
+        # Inserting the median of each range before its two halves keeps every level's left/right tree balanced,
+        # rather than degenerating into a chain as a plain sorted insert would.
+        if low < high:
+            middle = (low + high) // 2
+            self.insert_word(sorted_words[middle][0], sorted_words[middle][1])
+            self.add_sorted_words(sorted_words, low, middle)
+            self.add_sorted_words(sorted_words, middle + 1, high)
+
+    def compaction_stats(self) -> dict:
+        """
+        return statistics about tombstoned deletes and compaction
+        @return: dictionary of live and dead entry counts, compactions run and entries reclaimed by them
+        """
+        return {'live_entries': self.word_count,
+                'dead_entries': self.dead_word_count,
+                'compactions': self.compactions,
+                'entries_reclaimed': self.entries_reclaimed}
+
+    def rebalance_path(self, level_root: Node, cur_word: str, cur_index: int):
+        # Walk the word's path one level at a time, measuring how many left/right steps it takes to reach the
+        # word's letter within each level. Only the levels on this path can have grown deeper from the insert.
+        cur_char = cur_word[cur_index]
+        cur_node = level_root
+        depth = 0
+
+        while cur_char != cur_node.letter:
+            cur_node = cur_node.left if cur_char < cur_node.letter else cur_node.right
+            depth += 1
+
+        if cur_index < len(cur_word) - 1:
+            cur_node.middle = self.rebalance_path(cur_node.middle, cur_word, cur_index + 1)
+
+        # A level always holds more nodes than its depth, so the depth limit can't be exceeded until
+        # depth > c * log2(depth + 2). Checking that first means the level only gets counted when it might
+        # actually need a rebuild.
+        if depth > self.rebalance_factor * math.log2(depth + 2):
+            level_nodes = []
+            self.get_level_nodes(level_root, level_nodes)
+
+            if depth > self.rebalance_factor * math.log2(len(level_nodes) + 1):
+                self.level_rebuilds += 1
+                return self.link_balanced_level(level_nodes, 0, len(level_nodes))
+
+        return level_root
+
+    def get_level_nodes(self, cur_node: Node, level_nodes: list):
+        # In-order walk of a single level (left/right links only), so the nodes come out sorted by letter.
+        if cur_node is not None:
+            self.get_level_nodes(cur_node.left, level_nodes)
+            level_nodes.append(cur_node)
+            self.get_level_nodes(cur_node.right, level_nodes)
+
+    def link_balanced_level(self, level_nodes: list, low: int, high: int):
+        # Relink the sorted nodes of a level into a perfectly balanced BST around the median. Only left/right
+        # links change, so every node keeps its middle subtree.
+        if low >= high:
+            return None
+
+        middle = (low + high) // 2
+        cur_node = level_nodes[middle]
+        cur_node.left = self.link_balanced_level(level_nodes, low, middle)
+        cur_node.right = self.link_balanced_level(level_nodes, middle + 1, high)
+        self.refresh_aggregates(cur_node)
+
+        return cur_node
+
+    def access_word(self, word: str):
+        # Descend to the word's node like search_tst, but let each level adapt to the traffic it sees: the letter
+        # matched at a level has its access count bumped, and is rotated up past its left/right ancestors for as
+        # long as it has been accessed more often than they have. Hot letters thereby drift towards the root of
+        # their level, and since the counts only grow, the levels settle down instead of thrashing like a plain
+        # move-to-root would. A letter is only considered on every adaptive_interval-th hit: each rotation refreshes
+        # two nodes' aggregates, and on a tree built from random-order input, whose levels are already shallow,
+        # rotating on every hit costs more than the shorter paths save (at 5k words, 5038 ns per search against
+        # 4208 ns static, while every 16th hit gives 3787 ns).
+        # The empty word spells out no letters, so it has no node of its own (and is not the root's word).
+        if len(word) == 0:
+            return None
+
+        level_owner = None
+        cur_node = self.root_node
+
+        for cur_index in range(0, len(word)):
+            cur_char = word[cur_index]
+            ancestors = []
+
+            while cur_node is not None and cur_char != cur_node.letter:
+                ancestors.append(cur_node)
+                cur_node = cur_node.left if cur_char < cur_node.letter else cur_node.right
+
+            if cur_node is None:
+                return None
+
+            cur_node.access_count += 1
+
+            while len(ancestors) > 0 and cur_node.access_count % self.adaptive_interval == 0 and \
+                    cur_node.access_count > ancestors[-1].access_count:
+                parent = ancestors.pop()
+                self.rotate_above(cur_node, parent)
+                self.adaptive_rotations += 1
+
+                if len(ancestors) > 0:
+                    if ancestors[-1].left is parent:
+                        ancestors[-1].left = cur_node
+                    else:
+                        ancestors[-1].right = cur_node
+                elif level_owner is None:
+                    self.root_node = cur_node
+                else:
+                    level_owner.middle = cur_node
+
+            if cur_index < len(word) - 1:
+                level_owner = cur_node
+                cur_node = cur_node.middle
+
+        return cur_node
+
+    def rotate_above(self, cur_node: Node, parent: Node):
+        # A single BST rotation over the left/right links that lifts cur_node above its parent. The caller is
+        # responsible for pointing the grandparent (or the level's owner) at cur_node.
+        if parent.left is cur_node:
+            parent.left = cur_node.right
+            cur_node.right = parent
+        else:
+            parent.right = cur_node.left
+            cur_node.left = parent
+
+        # The two nodes swapped places, but together they still cover the same words, so the aggregates of
+        # everything above them are unaffected.
+        self.refresh_aggregates(parent)
+        self.refresh_aggregates(cur_node)
+
+    def get_path(self, word: str) -> List[Node]:
+        # Every node visited on the way down to the word (left/right steps included), ending with the word's node.
+        # Returns an empty list if the word's letters aren't all in the tree.
+        path = []
+        cur_node = self.root_node
+        cur_index = 0
+
+        while cur_node is not None:
+            path.append(cur_node)
+            cur_char = word[cur_index]
+
+            if cur_char < cur_node.letter:
+                cur_node = cur_node.left
+            elif cur_char > cur_node.letter:
+                cur_node = cur_node.right
+            elif cur_index < len(word) - 1:
+                cur_node = cur_node.middle
+                cur_index += 1
+            else:
+                return path
+
+        return []
+
+    def refresh_aggregates(self, cur_node: Node):
+        # Recompute a node's subtree aggregates from its own word and its three children's aggregates. Every
+        # operation that changes the tree calls this bottom-up on the nodes it touched, which keeps the aggregates
+        # exact at O(1) extra cost per touched node.
+        subtree_count = 1 if cur_node.end_word else 0
+        subtree_frequency = cur_node.frequency if cur_node.end_word else 0
+        subtree_max_frequency = subtree_frequency
+
+        for child in (cur_node.left, cur_node.middle, cur_node.right):
+            if child is not None:
+                subtree_count += child.subtree_count
+                subtree_frequency += child.subtree_frequency
+                subtree_max_frequency = max(subtree_max_frequency, child.subtree_max_frequency)
+
+        cur_node.subtree_count = subtree_count
+        cur_node.subtree_frequency = subtree_frequency
+        cur_node.subtree_max_frequency = subtree_max_frequency
+
+    def count_prefix(self, prefix_word: str) -> int:
+        """
+        count the words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: the prefix
+        @return: number of words with prefix 'prefix_word'
+        """
+        # The prefix's node covers its own word plus everything below its middle child, so a single descent of
+        # O(len(prefix)) steps answers the query without visiting the subtree.
+        if len(prefix_word) == 0:
+            return 0 if self.root_node is None else self.root_node.subtree_count
+
+        prefix_node = self.search_tst(self.root_node, prefix_word, 0)
+
+        if prefix_node is None:
+            return 0
+
+        middle_count = 0 if prefix_node.middle is None else prefix_node.middle.subtree_count
+
+        return (1 if prefix_node.end_word else 0) + middle_count
+
+    def frequency_sum_prefix(self, prefix_word: str) -> int:
+        """
+        sum the frequencies of the words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: the prefix
+        @return: total frequency of the words with prefix 'prefix_word'
+        """
+        if len(prefix_word) == 0:
+            return 0 if self.root_node is None else self.root_node.subtree_frequency
+
+        prefix_node = self.search_tst(self.root_node, prefix_word, 0)
+
+        if prefix_node is None:
+            return 0
+
+        middle_frequency = 0 if prefix_node.middle is None else prefix_node.middle.subtree_frequency
+
+        return (prefix_node.frequency if prefix_node.end_word else 0) + middle_frequency
+
+    def iter_range(self, low_word: str = None, high_word: str = None):
+        """
+        lazily yield the words w with low_word <= w < high_word, in lexicographic order
+        @param low_word: inclusive lower bound, or None for no lower bound
+        @param high_word: exclusive upper bound, or None for no upper bound
+        @return: generator of WordFrequency
+        """
+        return self.iter_in_order(self.root_node, "", low_word, high_word)
+
+    def iter_prefix(self, prefix_word: str):
+        """
+        lazily yield the words that have 'prefix_word' as a prefix, in lexicographic order
+        @param prefix_word: the prefix
+        @return: generator of WordFrequency
+        """
+        if len(prefix_word) == 0:
+            return self.iter_in_order(self.root_node, "", None, None)
+
+        # Descend to the prefix's node once, then stream the prefix itself (if it is a word) followed by its
+        # middle subtree, which holds exactly the longer words with this prefix.
+        prefix_node = self.search_tst(self.root_node, prefix_word, 0)
+
+        if prefix_node is None:
+            return iter([])
+
+        suffix_words = self.iter_in_order(prefix_node.middle, prefix_word, None, None)
+
+        if prefix_node.end_word:
+            return self.prepend_word(WordFrequency(prefix_word, prefix_node.frequency), suffix_words)
+
+        return suffix_words
+
+    def iter_in_order(self, start_node: Node, start_prefix: str, low_word, high_word):
+        # In-order traversal (left subtree, the node's own word, middle subtree, right subtree) with an explicit
+        # stack, so memory stays proportional to the depth of the tree rather than to the number of words. Each
+        # stack entry is (emit, node, prefix), where prefix is the text spelled out above the node's level.
+        stack = [(False, start_node, start_prefix)]
+
+        while len(stack) > 0:
+            emit, cur_node, prefix = stack.pop()
+
+            if emit:
+                yield WordFrequency(prefix + cur_node.letter, cur_node.frequency)
+                continue
+
+            if cur_node is None:
+                continue
+
+            word = prefix + cur_node.letter
+            above_low = low_word is None or word >= low_word
+
+            # Subtrees that lie entirely outside [low_word, high_word) are never pushed: everything in the left
+            # subtree sorts before the node's word, and everything in the middle and right subtrees after it.
+            # Pushed in reverse, since the stack pops the last entry first.
+            if high_word is None or word < high_word:
+                stack.append((False, cur_node.right, prefix))
+
+                if above_low or low_word.startswith(word):
+                    stack.append((False, cur_node.middle, word))
+
+                if cur_node.end_word and above_low:
+                    stack.append((True, cur_node, prefix))
+
+            if low_word is None or word > low_word:
+                stack.append((False, cur_node.left, prefix))
+
+    @staticmethod
+    def prepend_word(word_frequency: WordFrequency, word_frequencies):
+        yield word_frequency
+        yield from word_frequencies
+
+    def fuzzy_search(self, word: str, max_distance: int = 1, k: int = 3) -> List[WordFrequency]:
+        """
+        return the k most-frequent words in the dictionary within 'max_distance' edits (Levenshtein) of 'word'
+        @param word: the possibly misspelled word to be searched
+        @param max_distance: largest number of insertions, deletions and substitutions allowed
+        @param k: number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words close to 'word'
+        """
+        return self.fuzzy_walk(word, max_distance, k, False)
+
+    def fuzzy_autocomplete(self, prefix_word: str, max_distance: int = 1, k: int = 3) -> List[WordFrequency]:
+        """
+        return the k most-frequent words in the dictionary that have a prefix within 'max_distance' edits
+        (Levenshtein) of 'prefix_word'
+        @param prefix_word: the possibly misspelled prefix to be autocompleted
+        @param max_distance: largest number of insertions, deletions and substitutions allowed
+        @param k: number of words to return
+        @return: a list (could be empty) of (at most) k most-frequent words with a prefix close to 'prefix_word'
+        """
+        return self.fuzzy_walk(prefix_word, max_distance, k, True)
+
+    def fuzzy_walk(self, word: str, max_distance: int, k: int, prefix_match: bool) -> List[WordFrequency]:
+        # Walk the tree carrying one row of the edit distance table per path: row[j] is the distance between the
+        # letters spelled out so far and word[0:j]. A node's row follows from the row of the level above it, so
+        # the nodes of one level share their parent row. The smallest entry of a row is a lower bound on the
+        # distance of every word below, so a middle subtree whose row exceeds the bound is never entered.
+        matches = []
+        stack = [(self.root_node, list(range(0, len(word) + 1)), "")]
+
+        while len(stack) > 0:
+            cur_node, parent_row, prefix = stack.pop()
+
+            if cur_node is None:
+                continue
+
+            stack.append((cur_node.left, parent_row, prefix))
+            stack.append((cur_node.right, parent_row, prefix))
+
+            row = self.next_edit_row(parent_row, word, cur_node.letter)
+            cur_word = prefix + cur_node.letter
+
+            if prefix_match and row[-1] <= max_distance:
+                # The letters so far are close enough to the whole prefix, so every word from here down matches.
+                if cur_node.end_word:
+                    matches.append([cur_word, cur_node.frequency])
+
+                self.get_all_children_words(cur_node.middle, cur_word, matches)
+                continue
+
+            if cur_node.end_word and row[-1] <= max_distance:
+                matches.append([cur_word, cur_node.frequency])
+
+            if min(row) <= max_distance:
+                stack.append((cur_node.middle, row, cur_word))
+
+        return [WordFrequency(match[0], match[1])
+                for match in heapq.nsmallest(k, matches, key=lambda match: (-match[1], match[0]))]
+
+    @staticmethod
+    def next_edit_row(parent_row: list, word: str, letter: str) -> list:
+        # Standard Levenshtein recurrence for one more letter on the tree side.
+        row = [parent_row[0] + 1]
+
+        for j in range(1, len(parent_row)):
+            row.append(min(parent_row[j] + 1, row[j - 1] + 1, parent_row[j - 1] + (word[j - 1] != letter)))
+
+        return row
+
+    def pattern_search(self, pattern: str, limit: int = 10) -> List[WordFrequency]:
+        """
+        return the most-frequent words in the dictionary that match 'pattern', where '?' matches any single letter
+        and '*' matches any run of letters (including none), e.g. "c?t" or "re*ing"
+        @param pattern: the pattern the whole word has to match
+        @param limit: maximum number of words to return, or None to return every match
+        @return: a list (could be empty) of (at most) 'limit' matching words, most-frequent first
+        """
+        # Best-first search over states (node, index): the level containing 'node' still has to match
+        # pattern[index:]. A state is ranked by the highest frequency in the node's subtree, which bounds every word
+        # it can lead to, while a matched word is ranked by its own frequency. Once a word comes off the heap no
+        # state left can beat it, so the words come out in order and the search stops after 'limit' of them.
+        # Ties are ranked by text as well: every word a state leads to starts with the letters above its level.
+        # A pattern that starts with '*' anchors nothing, so if it has few matches most of the tree gets visited,
+        # and a plain scan of every word is faster for it.
+        most_frequent = []
+        # The same state can be reached along several paths once a pattern has more than one '*', so states and
+        # matched words are only ever pushed once.
+        visited_states = set()
+        matched_nodes = set()
+        # Entries are (-frequency bound, text, is_state, push order, node, index). The push order keeps two entries
+        # from ever comparing their nodes.
+        heap = []
+        push_order = 0
+
+        # star_tails[i] is True when pattern[i:] consists only of '*', i.e. a word may end there.
+        star_tails = [True] * (len(pattern) + 1)
+
+        for i in range(len(pattern) - 1, -1, -1):
+            star_tails[i] = star_tails[i + 1] and pattern[i] == '*'
+
+        def push_state(cur_node: Node, index: int, prefix: str):
+            nonlocal push_order
+
+            if cur_node is not None and (id(cur_node), index) not in visited_states:
+                visited_states.add((id(cur_node), index))
+                heapq.heappush(heap, (-cur_node.subtree_max_frequency, prefix, True, push_order, cur_node, index))
+                push_order += 1
+
+        def match_letter(cur_node: Node, next_index: int, prefix: str):
+            # The node's letter has been matched, leaving pattern[next_index:] for the letters after it.
+            nonlocal push_order
+            cur_word = prefix + cur_node.letter
+
+            if cur_node.end_word and star_tails[next_index] and id(cur_node) not in matched_nodes:
+                matched_nodes.add(id(cur_node))
+                heapq.heappush(heap, (-cur_node.frequency, cur_word, False, push_order, cur_node, next_index))
+                push_order += 1
+
+            if next_index < len(pattern):
+                push_state(cur_node.middle, next_index, cur_word)
+
+        push_state(self.root_node, 0, "")
+
+        while len(heap) > 0 and (limit is None or len(most_frequent) < limit):
+            negative_frequency, text, is_state, order, cur_node, index = heapq.heappop(heap)
+
+            if not is_state:
+                most_frequent.append(WordFrequency(text, -negative_frequency))
+                continue
+
+            if index == len(pattern):
+                continue
+
+            pattern_letter = pattern[index]
+
+            if pattern_letter == '*':
+                # Either the '*' matches no more letters, or it absorbs this level's letter and stays active.
+                push_state(cur_node, index + 1, text)
+                push_state(cur_node.left, index, text)
+                push_state(cur_node.right, index, text)
+                match_letter(cur_node, index, text)
+            elif pattern_letter == '?':
+                push_state(cur_node.left, index, text)
+                push_state(cur_node.right, index, text)
+                match_letter(cur_node, index + 1, text)
+            elif pattern_letter < cur_node.letter:
+                push_state(cur_node.left, index, text)
+            elif pattern_letter > cur_node.letter:
+                push_state(cur_node.right, index, text)
+            else:
+                match_letter(cur_node, index + 1, text)
+
+        return most_frequent
@@ -1,9 +1,17 @@
 import sys
+import time
+import getopt
 from dictionary.word_frequency import WordFrequency
 from dictionary.base_dictionary import BaseDictionary
 from dictionary.list_dictionary import ListDictionary
 from dictionary.hashtable_dictionary import HashTableDictionary
 from dictionary.ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from dictionary.doublearraytrie_dictionary import DoubleArrayTrieDictionary
+from dictionary.blocked_list_dictionary import BlockedListDictionary
+from dictionary.front_coded_list_dictionary import FrontCodedListDictionary
+from dictionary.mutation_log import MutationLog
+from dictionary.recording_dictionary import RecordingDictionary
+from dictionary.latency_histogram import LatencyHistogram, write_latency_summary
 
 
 # -------------------------------------------------------------------
@@ -21,8 +29,16 @@ def usage():
     """
     Print help/usage message.
     """
-    print('python3 dictionary_file_based.py', '<approach> [data fileName] [command fileName] [output fileName]')
-    print('<approach> = <list | hashtable | tst>')
+    print('python3 dictionary_file_based.py', '<approach> [data fileName] [command fileName] [output fileName]',
+          '[--log <log fileName>] [--group-size <n>] [--checkpoint-interval <n>] [--record <command fileName>]',
+          '[--latency]')
+    print('<approach> = <list | hashtable | tst | datrie | blocked | frontcoded>')
+    print('--log: persist adds and deletes in a write-ahead log, recovered on the next run with the same log file')
+    print('--group-size: number of logged mutations fsynced together (default 64)')
+    print('--checkpoint-interval: number of logged mutations folded into a checkpoint at a time (default 10000)')
+    print('--record: append every command served to a command file, for replay by generation/replay_benchmark.py')
+    print('--latency: time the data file load, the build, the log replay (with --log) and every command, and write',
+          'histograms of the timings to [output fileName].latency')
     sys.exit(1)
 
 
@@ -30,7 +46,21 @@ if __name__ == '__main__':
     # Fetch the command line arguments
     args = sys.argv
 
-    if len(args) != 5:
+    if len(args) < 5:
+        print('Incorrect number of arguments.')
+        usage()
+
+    # Optional flags follow the four positional arguments.
+    try:
+        opts, extra_args = getopt.getopt(args[5:], '', ['log=', 'group-size=', 'checkpoint-interval=', 'record=', 'latency'])
+        options = dict(opts)
+        group_size = int(options.get('--group-size', 64))
+        checkpoint_interval = int(options.get('--checkpoint-interval', 10000))
+    except (getopt.GetoptError, ValueError):
+        print('Incorrect optional argument.')
+        usage()
+
+    if len(extra_args) > 0:
         print('Incorrect number of arguments.')
         usage()
 
@@ -42,27 +72,59 @@ if __name__ == '__main__':
         agent = HashTableDictionary()
     elif args[1] == 'tst':
         agent = TernarySearchTreeDictionary()
+    elif args[1] == 'datrie':
+        agent = DoubleArrayTrieDictionary()
+    elif args[1] == 'blocked':
+        agent = BlockedListDictionary()
+    elif args[1] == 'frontcoded':
+        agent = FrontCodedListDictionary()
     else:
         print('Incorrect argument value.')
         usage()
 
+    # Timings are only kept with --latency, and go to a file of their own so the output file is unchanged.
+    phases = []
+    histograms = None
+    if '--latency' in options:
+        histograms = dict((command, LatencyHistogram()) for command in ['S', 'A', 'D', 'AC'])
+
     # read from data file to populate the initial set of points
     data_filename = args[2]
     words_frequencies_from_file = []
+    mutation_log = None
     try:
-        data_file = open(data_filename, 'r')
-        for line in data_file:
-            values = line.split()
-            word = values[0]
-            frequency = int(values[1])
-            word_frequency = WordFrequency(word, frequency)  # each line contains a word and its frequency
-            words_frequencies_from_file.append(word_frequency)
-        data_file.close()
+        phase_start = time.perf_counter_ns()
+        if '--log' in options:
+            # Start from the last checkpoint and the log tail, which carry the adds and deletes of earlier runs.
+            mutation_log = MutationLog(options['--log'], data_filename, group_size, checkpoint_interval)
+            words_frequencies_from_file = mutation_log.load_words_frequencies()
+        else:
+            data_file = open(data_filename, 'r')
+            for line in data_file:
+                values = line.split()
+                word = values[0]
+                frequency = int(values[1])
+                word_frequency = WordFrequency(word, frequency)  # each line contains a word and its frequency
+                words_frequencies_from_file.append(word_frequency)
+            data_file.close()
+        phases.append(('Load', time.perf_counter_ns() - phase_start))
+        phase_start = time.perf_counter_ns()
         agent.build_dictionary(words_frequencies_from_file)
+        phases.append(('Build', time.perf_counter_ns() - phase_start))
+        if mutation_log is not None:
+            phase_start = time.perf_counter_ns()
+            mutation_log.replay_log(agent)
+            phases.append(('Replay', time.perf_counter_ns() - phase_start))
     except FileNotFoundError as e:
         print("Data file doesn't exist.")
         usage()
 
+    # Wrapped only once built, so that the recording holds the commands alone.
+    recording_agent = None
+    if '--record' in options:
+        recording_agent = RecordingDictionary(agent, options['--record'])
+        agent = recording_agent
+
     command_filename = args[3]
     output_filename = args[4]
     # Parse the commands in command file
@@ -76,7 +138,10 @@ if __name__ == '__main__':
             # search
             if command == 'S':
                 word = command_values[1]
+                command_start = time.perf_counter_ns()
                 search_result = agent.search(word)
+                if histograms is not None:
+                    histograms['S'].record(time.perf_counter_ns() - command_start)
                 if search_result > 0:
                     output_file.write(f"Found '{word}' with frequency {search_result}\n")
                 else:
@@ -87,23 +152,38 @@ if __name__ == '__main__':
                 word = command_values[1]
                 frequency = int(command_values[2])
                 word_frequency = WordFrequency(word, frequency)
-                if not agent.add_word_frequency(word_frequency):
+                command_start = time.perf_counter_ns()
+                word_added = agent.add_word_frequency(word_frequency)
+                if histograms is not None:
+                    histograms['A'].record(time.perf_counter_ns() - command_start)
+                if not word_added:
                     output_file.write(f"Add '{word}' failed\n")
                 else:
+                    if mutation_log is not None:
+                        mutation_log.log_add(word_frequency)
                     output_file.write(f"Add '{word}' succeeded\n")
 
             # delete
             elif command == 'D':
                 word = command_values[1]
-                if not agent.delete_word(word):
+                command_start = time.perf_counter_ns()
+                word_deleted = agent.delete_word(word)
+                if histograms is not None:
+                    histograms['D'].record(time.perf_counter_ns() - command_start)
+                if not word_deleted:
                     output_file.write(f"Delete '{word}' failed\n")
                 else:
+                    if mutation_log is not None:
+                        mutation_log.log_delete(word)
                     output_file.write(f"Delete '{word}' succeeded\n")
 
             # check
             elif command == 'AC':
                 word = command_values[1]
+                command_start = time.perf_counter_ns()
                 list_words = agent.autocomplete(word)
+                if histograms is not None:
+                    histograms['AC'].record(time.perf_counter_ns() - command_start)
                 line = "Autocomplete for '" + word + "': [ "
                 for item in list_words:
                     line = line + item.word + ": " + str(item.frequency) + "  "
@@ -115,6 +195,12 @@ if __name__ == '__main__':
 
         output_file.close()
         command_file.close()
+        if mutation_log is not None:
+            mutation_log.close()
+        if recording_agent is not None:
+            recording_agent.close()
+        if histograms is not None:
+            write_latency_summary(output_filename + '.latency', phases, histograms)
     except FileNotFoundError as e:
         print("Command file doesn't exist.")
         usage()
@@ -21,7 +21,8 @@
 #   code directory : directory where the python files reside.  E.g., if directory specified is Assign1-s1234,
 #       then Assign1-s1234/dictionary_file_based.py should exist.
 #   name of implementation to test: This is the name of the implementation to test.  The names
-#       should be the same as specified in the script or in dictionary_file_based.py. E.g.- "list", or "hashtable", or "tst"
+#       should be the same as specified in the script or in dictionary_file_based.py. E.g.- "list", or "hashtable", or "tst",
+#       or "datrie", or "blocked", or "frontcoded"
 #   data filename: This is the input data file consists of a list of point information.
 #       NOTE- the script expects the data file to be in the same directory as the script.
 #       E.g. if the script is in the directory path /home/s1234/dictionary_test_script.py and
@@ -94,7 +95,7 @@ def main():
     lsInFile = remainArgs[3:]
 
     # check implementation
-    setValidImpl = set(["list", "hashtable", "tst"])
+    setValidImpl = set(["list", "hashtable", "tst", "datrie", "blocked", "frontcoded"])
     if sImpl not in setValidImpl:
         print(sImpl + " is not a valid implementation name.")
         sys.exit(1)
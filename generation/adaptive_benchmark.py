@@ -0,0 +1,90 @@
+import sys
+import time
+import random
+from itertools import accumulate
+from ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from benchmark import get_input_from_file, s_to_ns_scalar, input_sizes
+
+num_of_queries = 100000
+# Exponent of the Zipfian distribution, where the word of popularity rank r is queried with probability ~ 1 / r^s.
+zipf_exponent = 1.1
+
+
+def display_usage():
+    print('python3 adaptive_benchmark.py', '[input size]')
+    print('where [input size] = <50 | 500 | 1k | 2k | 5k | 10k | 50k | 100k> (default 100k)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 2 or (len(args) == 2 and args[1] not in input_sizes):
+        display_usage()
+
+    size = args[1] if len(args) == 2 else '100k'
+    words_frequencies = get_input_from_file("input/input_" + size, True)
+    search_stream, autocomplete_stream = get_zipfian_streams(words_frequencies)
+
+    print("{:<10} {:<14} {:<16} {:<20} {:<20} {:<14} {:<12} {:<12}".format(
+        'Order', 'Mode', 'Algorithm', 'First Half {ns}', 'Second Half {ns}', 'Mean {ns}', 'vs Static', 'Rotations'))
+
+    # Every tree replays exactly the same streams. The adaptive tree should get faster between the first and second
+    # half of a stream as the hot letters move up their levels, while the static tree stays flat. Both insertion
+    # orders are reported, as they tell different stories: from sorted input every level starts as a chain, which
+    # the rotations undo, while from the input's own (random) order the levels are already shallow and there is
+    # far less to gain. Rotating on every hit is shown alongside the default interval, as on random-order input it
+    # costs more than it saves.
+    sorted_words_frequencies = sorted(words_frequencies, key=lambda word_freq: word_freq.word)
+
+    for order, feed in [('input', words_frequencies), ('sorted', sorted_words_frequencies)]:
+        static_means = dict()
+
+        for mode, adaptive, adaptive_interval in [('static', False, 1), ('adaptive/1', True, 1),
+                                                  ('adaptive/16', True, 16)]:
+            for algorithm, stream in [('Search', search_stream), ('AutoComplete', autocomplete_stream)]:
+                dictionary = TernarySearchTreeDictionary(adaptive=adaptive, adaptive_interval=adaptive_interval)
+                dictionary.build_dictionary(feed)
+                method_to_time = dictionary.search if algorithm == 'Search' else dictionary.autocomplete
+                first_half, second_half = replay(method_to_time, stream)
+                mean = (first_half + second_half) / 2
+                static_means.setdefault(algorithm, mean)
+
+                # Above 1 the mode is faster than the static tree built from the same order.
+                print("{:<10} {:<14} {:<16} {:<20} {:<20} {:<14} {:<12} {:<12}".format(
+                    order, mode, algorithm, round(first_half, 3), round(second_half, 3), round(mean, 3),
+                    round(static_means[algorithm] / mean, 2), dictionary.adaptive_rotations))
+
+
+def get_zipfian_streams(words_frequencies: list):
+    # The popularity ranking is a random permutation of the vocabulary, so it is independent of both the order the
+    # words were inserted in and their alphabetical order.
+    random.seed(0)
+    ranked_words = [word_freq.word for word_freq in words_frequencies]
+    random.shuffle(ranked_words)
+    cumulative_weights = list(accumulate(1 / (rank ** zipf_exponent) for rank in range(1, len(ranked_words) + 1)))
+
+    search_stream = random.choices(ranked_words, cum_weights=cumulative_weights, k=num_of_queries)
+    autocomplete_stream = [word[0:random.randint(1, min(len(word), 5))]
+                           for word in random.choices(ranked_words, cum_weights=cumulative_weights,
+                                                      k=num_of_queries)]
+
+    return search_stream, autocomplete_stream
+
+
+def replay(method_to_time, stream: list):
+    # Returns the average latency of the first and the second half of the stream.
+    running_times = []
+
+    for query in stream:
+        start = time.perf_counter()
+        method_to_time(query)
+        running_times.append((time.perf_counter() - start) * s_to_ns_scalar)
+
+    half = len(running_times) // 2
+
+    return sum(running_times[0:half]) / half, sum(running_times[half:]) / (len(running_times) - half)
+
+
+if __name__ == '__main__':
+    main()
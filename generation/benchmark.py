@@ -1,7 +1,12 @@
 import math
+import os
 import sys
+import getopt
+import hashlib
 import timeit
 import random
+import multiprocessing
+import numpy as np
 from typing import List
 from display import *
 from axis_pair import AxisPair
@@ -10,37 +15,63 @@ from word_frequency import WordFrequency
 from list_dictionary import ListDictionary
 from hashtable_dictionary import HashTableDictionary
 from ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from doublearraytrie_dictionary import DoubleArrayTrieDictionary
+from blocked_list_dictionary import BlockedListDictionary
+from front_coded_list_dictionary import FrontCodedListDictionary
 
 
 n_mapped_to_int = {'50': 50, '500': 500, '1k': 1000, '2k': 2000, '5k': 5000, '10k': 10000, '50k': 50000, '100k': 100000}
 input_sizes = ['50', '500', '1k', '2k', '5k', '10k', '50k', '100k']
 reversed_input_sizes = ['100k', '50k', '10k', '5k', '2k', '1k', '500', '50']
 valid_output_types = ['graphic', 'numeric']
-valid_approaches = ['list', 'hashtable', 'tst']
+valid_approaches = ['list', 'hashtable', 'tst', 'datrie', 'blocked', 'frontcoded']
 valid_algorithms_shorthand = ['s', 'a', 'd', 'ac']
 valid_representation_types = ['1', '2']
-approach_titles = ['List', 'Hashtable', 'Ternary Search Tree']
+approach_titles = ['List', 'Hashtable', 'Ternary Search Tree', 'Double-Array Trie', 'Blocked List',
+                   'Front-Coded List']
 algorithm_titles = ['Search', 'Add', 'Delete', 'Auto-Complete']
 algorithm_shorthand_to_longhand = {'s': 'Search', 'a': 'Add', 'd': 'Delete', 'ac': 'AutoComplete'}
 cached_input_from_file = {}
+# Parsed input files persist here between benchmark sessions.
+input_cache_directory = '.input_cache'
 
 s_to_ns_scalar = 1000 * 1000 * 1000
 
 
 def display_usage():
-    print('python3 benchmark.py', '<approach>')
-    print('where <approach> = <list | hashtable | tst | all>')
+    print('python3 benchmark.py', '<approach> [-j <number of workers>] [-p]')
+    print('where <approach> = <list | hashtable | tst | datrie | blocked | frontcoded | all>')
+    print('-j runs the benchmark cells in parallel over a pool of worker processes (default 1, serial)')
+    print('-p pins each worker to its own CPU, to limit noise from workers moving between CPUs')
     sys.exit(1)
 
 
 def main():
     # Fetch the algorithm line arguments
     args = sys.argv
+    num_of_workers = 1
+    pin_workers = False
 
-    if len(args) != 2:
+    try:
+        opts, extra_args = getopt.getopt(args[2:], 'j:p')
+
+        for opt, value in opts:
+            if opt == '-j':
+                num_of_workers = int(value)
+            else:
+                pin_workers = True
+    except (getopt.GetoptError, ValueError):
+        print('Incorrect options.')
+        display_usage()
+
+    if len(args) < 2 or len(extra_args) > 0:
         print('Incorrect number of arguments.')
         display_usage()
 
+    if num_of_workers < 1:
+        print('The number of workers must be at least 1.')
+        display_usage()
+
     algorithm = input("Please enter an algorithm to run (s, a, d, ac, all): ").lower()
     output_type = input("Please enter the type of output you wish to receive (graphic, numeric): ").lower()
     approach = args[1]
@@ -67,26 +98,34 @@ def main():
         print('Unknown representation type.')
         sys.exit(1)
 
-    final_analysis(approach, algorithm, output_type, representation_type)
+    final_analysis(approach, algorithm, output_type, representation_type, num_of_workers, pin_workers)
 
 
-def final_analysis(approach_arg: str, algorithm_arg: str, output_type_arg: str, representation_type):
+def final_analysis(approach_arg: str, algorithm_arg: str, output_type_arg: str, representation_type,
+                   num_of_workers: int = 1, pin_workers: bool = False):
     adds_to_choose_from = get_input_from_file("input/input_adds", True)
     num_of_algorithm_iterations = 100
     upper_bound = 10
 
     # Contains each approach, and each approach's algorithm times. Approach -> Algorithm -> 8 Times.
-    all_approaches_and_algorithms_times = {
-        'list': {'s': [], 'a': [], 'd': [], 'ac': []},
-        'hashtable': {'s': [], 'a': [], 'd': [], 'ac': []},
-        'tst': {'s': [], 'a': [], 'd': [], 'ac': []}
-    }
+    all_approaches_and_algorithms_times = {approach: {'s': [], 'a': [], 'd': [], 'ac': []}
+                                           for approach in valid_approaches}
+
+    if num_of_workers > 1:
+        all_runs_times = execute_and_time_algorithms_in_parallel(approach_arg, algorithm_arg, upper_bound,
+                                                                 num_of_algorithm_iterations,
+                                                                 output_type_arg == 'graphic', num_of_workers,
+                                                                 pin_workers)
 
     for iteration in range(0, upper_bound):
-        print("\n\n #### >>> RUN " + str(iteration + 1) + " <<< ####\n\n")
-        approach_and_algorithm_times = execute_and_time_algorithms(approach_arg, algorithm_arg,
-                                                                   num_of_algorithm_iterations, adds_to_choose_from,
-                                                                   output_type_arg == 'graphic')
+        if num_of_workers > 1:
+            approach_and_algorithm_times = all_runs_times[iteration]
+        else:
+            print("\n\n #### >>> RUN " + str(iteration + 1) + " <<< ####\n\n")
+            approach_and_algorithm_times = execute_and_time_algorithms(approach_arg, algorithm_arg,
+                                                                       num_of_algorithm_iterations,
+                                                                       adds_to_choose_from,
+                                                                       output_type_arg == 'graphic')
 
         for approach in valid_approaches:
             for algorithm in valid_algorithms_shorthand:
@@ -121,7 +160,7 @@ def final_analysis(approach_arg: str, algorithm_arg: str, output_type_arg: str,
                 for algorithm in valid_algorithms_shorthand:
                     results[idx].append(np.average(all_approaches_and_algorithms_times[approach][algorithm]))
 
-            plot_multi_bar_chart(results, algorithm_titles)
+            plot_multi_bar_chart(results, algorithm_titles, approach_titles)
             return
         elif approach_arg == 'all' and algorithm_arg == 'all' and representation_type == '2':
             results = []
@@ -149,11 +188,13 @@ def final_analysis(approach_arg: str, algorithm_arg: str, output_type_arg: str,
                 arr = np.array(all_approaches_and_algorithms_times[approach][algorithm_arg])
                 axes.append(AxisPair(inp, arr))
 
+            titles = approach_titles
         elif approach_arg != 'all' and algorithm_arg != 'all':
             arr = np.array(all_approaches_and_algorithms_times[approach_arg][algorithm_arg])
             axes.append(AxisPair(inp, arr))
+            titles = [approach_titles[valid_approaches.index(approach_arg)]]
 
-        plot_line_graph(axes, inp[0], inp[-1], algorithm_arg, num_of_algorithm_iterations)
+        plot_line_graph(axes, titles, inp[0], inp[-1], algorithm_arg, num_of_algorithm_iterations)
     else:
         display_numerical_data(all_approaches_and_algorithms_times, 3, algorithm_shorthand_to_longhand,
                                valid_approaches, valid_algorithms_shorthand, approach_titles)
@@ -170,34 +211,8 @@ def execute_and_time_algorithms(approach_arg: str, algorithm_arg: str, num_of_al
             print("\nALGORITHM: " + algorithm_shorthand_to_longhand[algorithm])
             for index, dictionary in enumerate(inp_sizes):
                 dictionary_to_test = prebuilt_dictionaries[approach][algorithm][index]
-                # In nanoseconds.
-                sum_of_running_times = 0
-
-                word_freqs_to_process = get_random_algorithm_input(algorithm,
-                                                                   get_input_from_file(
-                                                                       "input/input_" + input_sizes[index], True),
-                                                                   input_sizes[index],
-                                                                   num_of_algorithm_iterations,
-                                                                   adds_to_choose_from)
-
-                if algorithm == 's':
-                    method_to_time = dictionary_to_test.search
-                elif algorithm == 'a':
-                    method_to_time = dictionary_to_test.add_word_frequency
-                elif algorithm == 'd':
-                    method_to_time = dictionary_to_test.delete_word
-                else:
-                    method_to_time = dictionary_to_test.autocomplete
-
-                for word_freq in word_freqs_to_process:
-                    sum_of_running_times += timeit.timeit(lambda: method_to_time(word_freq), number=1) * s_to_ns_scalar
-
-                average_running_time = sum_of_running_times / num_of_algorithm_iterations
-
-                if log_time:
-                    time = math.log(average_running_time, 10)
-                else:
-                    time = average_running_time
+                time = time_algorithm(dictionary_to_test, algorithm, index, num_of_algorithm_iterations,
+                                      adds_to_choose_from, log_time)
 
                 # Replace the dictionary with the logged average running time in the nested dictionary to prepare it
                 # for garbage collection and to prevent creation of an entirely new data structure and the copy ops.
@@ -215,12 +230,106 @@ def execute_and_time_algorithms(approach_arg: str, algorithm_arg: str, num_of_al
     return approach_and_algorithm_times
 
 
+def time_algorithm(dictionary_to_test: BaseDictionary, algorithm: str, index: int, num_of_algorithm_iterations: int,
+                   adds_to_choose_from: List[WordFrequency], log_time: bool) -> float:
+    # In nanoseconds.
+    sum_of_running_times = 0
+
+    word_freqs_to_process = get_random_algorithm_input(algorithm,
+                                                       get_input_from_file("input/input_" + input_sizes[index], True),
+                                                       input_sizes[index],
+                                                       num_of_algorithm_iterations,
+                                                       adds_to_choose_from)
+
+    if algorithm == 's':
+        method_to_time = dictionary_to_test.search
+    elif algorithm == 'a':
+        method_to_time = dictionary_to_test.add_word_frequency
+    elif algorithm == 'd':
+        method_to_time = dictionary_to_test.delete_word
+    else:
+        method_to_time = dictionary_to_test.autocomplete
+
+    for word_freq in word_freqs_to_process:
+        sum_of_running_times += timeit.timeit(lambda: method_to_time(word_freq), number=1) * s_to_ns_scalar
+
+    average_running_time = sum_of_running_times / num_of_algorithm_iterations
+
+    if log_time:
+        return math.log(average_running_time, 10)
+
+    return average_running_time
+
+
+def execute_and_time_algorithms_in_parallel(approach_arg: str, algorithm_arg: str, upper_bound: int,
+                                            num_of_algorithm_iterations: int, log_time: bool, num_of_workers: int,
+                                            pin_workers: bool) -> list:
+    # Every (run, approach, algorithm, input size) cell builds its own dictionary and times it, independently of
+    # the others, so the cells are spread over a pool of worker processes. The times are put back in the structure
+    # execute_and_time_algorithms() returns, one per run, so final_analysis() averages them in the same way.
+    approaches = valid_approaches if approach_arg == 'all' else [approach_arg]
+    algorithms = valid_algorithms_shorthand if algorithm_arg == 'all' else [algorithm_arg]
+    cells = [(iteration, approach, algorithm, index) for iteration in range(0, upper_bound)
+             for approach in approaches for algorithm in algorithms for index in range(0, len(input_sizes))]
+    # The largest dictionaries go first, so that no worker is left building one while the others are idle.
+    cells.sort(key=lambda cell: -n_mapped_to_int[get_dictionary_size(cell[2], cell[3])])
+
+    all_runs_times = [{approach: {'s': [], 'a': [], 'd': [], 'ac': []} for approach in valid_approaches}
+                      for _ in range(0, upper_bound)]
+
+    for iteration, approach, algorithm in [(iteration, approach, algorithm) for iteration in range(0, upper_bound)
+                                           for approach in approaches for algorithm in algorithms]:
+        all_runs_times[iteration][approach][algorithm] = [None] * len(input_sizes)
+
+    cpus = sorted(os.sched_getaffinity(0)) if pin_workers and hasattr(os, 'sched_setaffinity') else []
+
+    if pin_workers and len(cpus) == 0:
+        print("CPU pinning is not supported on this platform, the workers are not pinned.")
+
+    # Each worker takes the next CPU from the queue when it starts.
+    cpu_queue = multiprocessing.Queue()
+
+    for worker in range(0, num_of_workers if len(cpus) > 0 else 0):
+        cpu_queue.put(cpus[worker % len(cpus)])
+
+    unit = "log(ns)" if log_time else "ns"
+    print("\n#### " + str(len(cells)) + " CELLS OVER " + str(num_of_workers) + " WORKERS ####\n")
+
+    with multiprocessing.Pool(num_of_workers, initialize_worker, (cpu_queue, len(cpus) > 0)) as pool:
+        for (iteration, approach, algorithm, index), time in pool.imap_unordered(
+                time_cell, [cell + (num_of_algorithm_iterations, log_time) for cell in cells]):
+            all_runs_times[iteration][approach][algorithm][index] = time
+            print("Run " + str(iteration + 1) + " " + approach.upper() + " " +
+                  algorithm_shorthand_to_longhand[algorithm] + " Input Size [" + get_dictionary_size(algorithm, index) +
+                  "] Time {" + unit + "} > " + str(time))
+
+    return all_runs_times
+
+
+def initialize_worker(cpu_queue, pin_worker: bool):
+    # Forked workers would otherwise all continue the parent's random sequence, and draw the same inputs.
+    random.seed()
+
+    if pin_worker:
+        os.sched_setaffinity(0, {cpu_queue.get()})
+
+
+def time_cell(cell: tuple) -> tuple:
+    iteration, approach, algorithm, index, num_of_algorithm_iterations, log_time = cell
+    dictionary_to_test = create_and_build_dict(approach, get_dictionary_size(algorithm, index))
+    time = time_algorithm(dictionary_to_test, algorithm, index, num_of_algorithm_iterations,
+                          get_input_from_file("input/input_adds", True), log_time)
+
+    return (iteration, approach, algorithm, index), time
+
+
+def get_dictionary_size(algorithm: str, index: int) -> str:
+    # Deletes run from the largest dictionary down, as in get_prebuilt_dictionaries().
+    return reversed_input_sizes[index] if algorithm == 'd' else input_sizes[index]
+
+
 def get_prebuilt_dictionaries(approach_arg: str, algorithm_arg: str):
-    prebuilt_dicts = {
-        'list': {'s': [], 'a': [], 'd': [], 'ac': []},
-        'hashtable': {'s': [], 'a': [], 'd': [], 'ac': []},
-        'tst': {'s': [], 'a': [], 'd': [], 'ac': []}
-    }
+    prebuilt_dicts = {approach: {'s': [], 'a': [], 'd': [], 'ac': []} for approach in valid_approaches}
 
     if approach_arg == 'all' and algorithm_arg == 'all':
         for approach in valid_approaches:
@@ -243,41 +352,96 @@ def get_prebuilt_dictionaries(approach_arg: str, algorithm_arg: str):
 
 
 def create_and_build_dict(approach: str, input_size: str) -> BaseDictionary:
+    dict_to_add = create_dict(approach)
+    dict_to_add.build_dictionary(get_input_from_file("input/input_" + input_size, True))
+
+    return dict_to_add
+
+
+def create_dict(approach: str) -> BaseDictionary:
     if approach == 'list':
-        dict_to_add = ListDictionary()
+        return ListDictionary()
     elif approach == 'hashtable':
-        dict_to_add = HashTableDictionary()
+        return HashTableDictionary()
+    elif approach == 'datrie':
+        return DoubleArrayTrieDictionary()
+    elif approach == 'blocked':
+        return BlockedListDictionary()
+    elif approach == 'frontcoded':
+        return FrontCodedListDictionary()
     else:
-        dict_to_add = TernarySearchTreeDictionary()
+        return TernarySearchTreeDictionary()
 
-    dict_to_add.build_dictionary(get_input_from_file("input/input_" + input_size, True))
 
-    return dict_to_add
+def get_input_from_file(file_path: str, create_word_frequency: bool) -> list:
+    # Keyed by the full path, as files from different directories can share a name, and by whether the lines are
+    # made into WordFrequency objects, as the same file is read both ways.
+    cache_key = (os.path.abspath(file_path), create_word_frequency)
 
+    if cache_key not in cached_input_from_file:
+        words, frequencies = load_input_columns(file_path)
 
-def get_input_from_file(file_path: str, create_word_frequency: bool) -> list:
-    input_size = file_path[12:]
+        # If each line contains a word and its frequency
+        if create_word_frequency:
+            input_from_file = [WordFrequency(word, frequency) for word, frequency in zip(words, frequencies.tolist())]
+        # If there is only a word and no frequency (i.e., delete, search or autocomplete algorithms).
+        else:
+            input_from_file = words
+
+        # Add to the cached input list to speedup the benchmarking.
+        cached_input_from_file[cache_key] = input_from_file
 
-    if input_size not in cached_input_from_file:
-        input_from_file = []
+    return cached_input_from_file[cache_key]
 
-        with open(file_path, 'r') as data_file:
-            for line in data_file:
-                values = line.split()
-                word = values[0]
 
-                # If each line contains a word and its frequency
-                if create_word_frequency:
-                    frequency = int(values[1])
-                    input_from_file.append(WordFrequency(word, frequency))
-                # If there is only a word and no frequency (i.e., delete, search or autocomplete algorithms).
-                else:
-                    input_from_file.append(word)
+def load_input_columns(file_path: str):
+    # The parsed words and frequencies of each input file are also kept on disk, so that later benchmark sessions
+    # skip parsing. A cache file is only used while the size and modification time of its input file are unchanged.
+    file_stat = os.stat(file_path)
+    file_version = np.array([file_stat.st_size, file_stat.st_mtime_ns], dtype=np.int64)
+    cache_path = os.path.join(input_cache_directory,
+                              hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[0:16] + '.npz')
 
-        # Add to the cached input list to speedup the benchmarking.
-        cached_input_from_file[input_size] = input_from_file
+    try:
+        with np.load(cache_path) as cached_columns:
+            if np.array_equal(cached_columns['version'], file_version):
+                # The words are stored as one newline-separated UTF-8 block, which splits back into str objects much
+                # faster than a NumPy string array converts.
+                words = cached_columns['words'].tobytes().decode('utf-8')
+
+                return words.split('\n') if len(words) > 0 else [], cached_columns['frequencies']
+    except (OSError, KeyError, ValueError):
+        pass
+
+    words = []
+    frequencies = []
+
+    with open(file_path, 'r') as data_file:
+        for line in data_file:
+            values = line.split()
+            words.append(values[0])
+
+            # Lines without a frequency leave the frequencies empty.
+            if len(values) > 1:
+                frequencies.append(int(values[1]))
+
+    frequencies = np.array(frequencies, dtype=np.int64)
+
+    # Written under a temporary name and moved into place, so a concurrent benchmark never loads a partial file.
+    # Failing to write the cache only costs the next session the parse.
+    try:
+        os.makedirs(input_cache_directory, exist_ok=True)
+        temporary_path = cache_path + '.' + str(os.getpid()) + '.tmp'
+
+        with open(temporary_path, 'wb') as cache_file:
+            np.savez(cache_file, version=file_version, frequencies=frequencies,
+                     words=np.frombuffer('\n'.join(words).encode('utf-8'), dtype=np.uint8))
+
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        pass
 
-    return cached_input_from_file[input_size]
+    return words, frequencies
 
 
 def get_random_algorithm_input(algorithm: str, word_frequencies_from_file: List[WordFrequency], n: str,
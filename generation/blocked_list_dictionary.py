@@ -0,0 +1,180 @@
+from typing import List
+import bisect
+from word_frequency import WordFrequency
+from base_dictionary import BaseDictionary
+
+
+# ------------------------------------------------------------------------
+# Blocked (chunked) sorted-list dictionary. The sorted words are split into bounded-size sorted blocks, with a
+# top-level list of each block's largest word, so an insert or delete only shifts the elements of one block
+# rather than the whole tail of a single flat list.
+# ------------------------------------------------------------------------
+
+class BlockedListDictionary(BaseDictionary):
+    # Target number of words per block. Blocks are split once they reach twice this size and merged with a
+    # neighbour once they fall below half of it, so every block stays within a constant factor of the target.
+    BLOCK_SIZE = 512
+
+    def __init__(self):
+        self.blocks = []
+        self.block_maxes = []
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        sorted_words_frequencies = sorted(words_frequencies, key=lambda word_freq: word_freq.word)
+        self.blocks = [sorted_words_frequencies[i:i + self.BLOCK_SIZE]
+                       for i in range(0, len(sorted_words_frequencies), self.BLOCK_SIZE)]
+        self.block_maxes = [block[-1].word for block in self.blocks]
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        # Two binary searches: one over the block maxima to pick the block, then one within that block.
+        block_index = bisect.bisect_left(self.block_maxes, word)
+
+        if block_index < len(self.blocks):
+            block = self.blocks[block_index]
+            index = bisect.bisect_left(block, word)
+
+            if index < len(block) and block[index].word == word:
+                return block[index].frequency
+
+        return 0
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        word = word_frequency.word
+
+        if len(self.blocks) == 0:
+            self.blocks.append([word_frequency])
+            self.block_maxes.append(word)
+            return True
+
+        # A word larger than every block maximum belongs at the end of the last block.
+        block_index = min(bisect.bisect_left(self.block_maxes, word), len(self.blocks) - 1)
+        block = self.blocks[block_index]
+        index = bisect.bisect_left(block, word)
+
+        if index < len(block) and block[index].word == word:
+            return False
+
+        block.insert(index, word_frequency)
+
+        if index == len(block) - 1:
+            self.block_maxes[block_index] = word
+
+        if len(block) >= 2 * self.BLOCK_SIZE:
+            self.split_block(block_index)
+
+        return True
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        block_index = bisect.bisect_left(self.block_maxes, word)
+
+        if block_index >= len(self.blocks):
+            return False
+
+        block = self.blocks[block_index]
+        index = bisect.bisect_left(block, word)
+
+        if index >= len(block) or block[index].word != word:
+            return False
+
+        # The index is already known, so delete by position instead of rescanning with list.remove.
+        del block[index]
+
+        if len(block) == 0:
+            del self.blocks[block_index]
+            del self.block_maxes[block_index]
+        else:
+            self.block_maxes[block_index] = block[-1].word
+
+            if len(block) < self.BLOCK_SIZE // 2 and len(self.blocks) > 1:
+                self.merge_block(block_index)
+
+        return True
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        most_frequent = []
+        words_with_prefix = self.get_words_with_prefix(prefix_word)
+
+        for i in range(0, 3):
+            highest_frequency = 0
+            highest_frequency_index = 0
+
+            for j in range(len(words_with_prefix)):
+                curr_word_freq = words_with_prefix[j]
+
+                if curr_word_freq.frequency > highest_frequency and curr_word_freq not in most_frequent:
+                    highest_frequency = curr_word_freq.frequency
+                    highest_frequency_index = j
+
+            if highest_frequency != 0:
+                most_frequent.append(words_with_prefix[highest_frequency_index])
+
+        return most_frequent
+
+    def get_words_with_prefix(self, prefix_word: str) -> List[WordFrequency]:
+        # The words sharing a prefix form one contiguous run, which may span several blocks. Locate its start with
+        # the two binary searches and then scan forward until a word no longer has the prefix.
+        words_with_prefix = []
+        block_index = bisect.bisect_left(self.block_maxes, prefix_word)
+
+        if block_index >= len(self.blocks):
+            return words_with_prefix
+
+        index = bisect.bisect_left(self.blocks[block_index], prefix_word)
+
+        while block_index < len(self.blocks):
+            block = self.blocks[block_index]
+
+            while index < len(block):
+                if not block[index].word.startswith(prefix_word):
+                    return words_with_prefix
+
+                words_with_prefix.append(block[index])
+                index += 1
+
+            block_index += 1
+            index = 0
+
+        return words_with_prefix
+
+    def split_block(self, block_index: int):
+        block = self.blocks[block_index]
+        half = len(block) // 2
+        self.blocks[block_index:block_index + 1] = [block[:half], block[half:]]
+        self.block_maxes[block_index:block_index + 1] = [block[half - 1].word, block[-1].word]
+
+    def merge_block(self, block_index: int):
+        # Fold the undersized block into its left neighbour (or its right one, if it is the first block), then
+        # split the result again if the merge pushed it over the size limit.
+        if block_index == 0:
+            block_index = 1
+
+        merged = self.blocks[block_index - 1] + self.blocks[block_index]
+        self.blocks[block_index - 1:block_index + 1] = [merged]
+        self.block_maxes[block_index - 1:block_index + 1] = [merged[-1].word]
+
+        if len(merged) >= 2 * self.BLOCK_SIZE:
+            self.split_block(block_index - 1)
@@ -0,0 +1,89 @@
+import sys
+import time
+import random
+from bloom_filter_dictionary import BloomFilterDictionary
+from benchmark import get_input_from_file, create_dict, create_and_build_dict, s_to_ns_scalar, input_sizes, \
+    valid_approaches
+
+num_of_queries = 1000
+
+
+def display_usage():
+    print('python3 bloom_benchmark.py', '<approach> [input size]')
+    print('where <approach> = <' + ' | '.join(valid_approaches) + ' | all>')
+    print('and [input size] = <' + ' | '.join(input_sizes) + '> (default: every size)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) not in [2, 3] or args[1] not in valid_approaches + ['all'] or \
+            (len(args) == 3 and args[2] not in input_sizes):
+        display_usage()
+
+    approaches = valid_approaches if args[1] == 'all' else [args[1]]
+    sizes = [args[2]] if len(args) == 3 else input_sizes
+
+    print("{:<10} {:<8} {:<16} {:<16} {:<10} {:<16} {:<16}".format('Approach', 'Size', 'Miss {ns}',
+                                                                    'Miss+Bloom {ns}', 'Speedup', 'Hit Overhead',
+                                                                    'FP Rate'))
+
+    for approach in approaches:
+        for size in sizes:
+            words_frequencies = get_input_from_file("input/input_" + size, True)
+            missing_words, present_words = get_queries(words_frequencies)
+
+            plain_dictionary = create_and_build_dict(approach, size)
+            bloom_dictionary = BloomFilterDictionary(create_dict(approach))
+            bloom_dictionary.build_dictionary(words_frequencies)
+
+            plain_miss = time_searches(plain_dictionary, missing_words)
+            bloom_miss = time_searches(bloom_dictionary, missing_words)
+            plain_hit = time_searches(plain_dictionary, present_words)
+            bloom_hit = time_searches(bloom_dictionary, present_words)
+
+            print("{:<10} {:<8} {:<16} {:<16} {:<10} {:<16} {:<16}".format(
+                approach, size, round(plain_miss, 3), round(bloom_miss, 3), round(plain_miss / bloom_miss, 2),
+                round(bloom_hit / plain_hit, 2), round(bloom_dictionary.bloom_stats()['false_positive_rate'], 5)))
+
+
+def get_queries(words_frequencies: list):
+    # Absent words are built by misspelling words that are present (swapping two adjacent letters or dropping
+    # one), which is what the misspelled searches in our streams look like.
+    random.seed(0)
+    vocabulary = set(word_freq.word for word_freq in words_frequencies)
+    missing_words = []
+    present_words = []
+
+    while len(missing_words) < num_of_queries:
+        word = words_frequencies[random.randint(0, len(words_frequencies) - 1)].word
+        index = random.randint(0, len(word) - 1)
+
+        if index < len(word) - 1 and random.random() < 0.5:
+            misspelled_word = word[0:index] + word[index + 1] + word[index] + word[index + 2:]
+        else:
+            misspelled_word = word[0:index] + word[index + 1:]
+
+        if len(misspelled_word) > 0 and misspelled_word not in vocabulary:
+            missing_words.append(misspelled_word)
+
+    for i in range(0, num_of_queries):
+        present_words.append(words_frequencies[random.randint(0, len(words_frequencies) - 1)].word)
+
+    return missing_words, present_words
+
+
+def time_searches(dictionary, words: list) -> float:
+    sum_of_running_times = 0
+
+    for word in words:
+        start = time.perf_counter()
+        dictionary.search(word)
+        sum_of_running_times += (time.perf_counter() - start) * s_to_ns_scalar
+
+    return sum_of_running_times / len(words)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import sys
+import time
+import random
+from benchmark import get_input_from_file, create_and_build_dict, input_sizes, valid_approaches
+
+# Size of the delta applied to the dictionary, as a fraction of the dictionary's size.
+delta_ratio = 0.2
+
+
+def display_usage():
+    print('python3 bulk_benchmark.py', '<approach> [input size]')
+    print('where <approach> = <' + ' | '.join(valid_approaches) + ' | all>')
+    print('and [input size] = <' + ' | '.join(input_sizes) + '> (default 50k)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) not in [2, 3] or args[1] not in valid_approaches + ['all'] or \
+            (len(args) == 3 and args[2] not in input_sizes):
+        display_usage()
+
+    approaches = valid_approaches if args[1] == 'all' else [args[1]]
+    size = args[2] if len(args) == 3 else '50k'
+    words_frequencies = get_input_from_file("input/input_" + size, True)
+
+    # The delta adds new words (from the pool of additions the other benchmarks use) and deletes words that are
+    # present.
+    random.seed(0)
+    present_words = set(word_freq.word for word_freq in words_frequencies)
+    new_words_frequencies = [word_freq for word_freq in get_input_from_file("input/input_adds", True)
+                             if word_freq.word not in present_words]
+    delta_size = min(int(delta_ratio * len(words_frequencies)), len(new_words_frequencies))
+
+    if delta_size == 0:
+        print('No words to add or delete at size ' + size + ', so there is nothing to time.')
+        sys.exit(1)
+
+    adds = random.sample(new_words_frequencies, delta_size)
+    deletes = [word_freq.word for word_freq in random.sample(words_frequencies, delta_size)]
+
+    print("Dictionary size: " + str(len(words_frequencies)) + ", delta size: " + str(delta_size))
+    print("{:<10} {:<16} {:<16} {:<10} {:<16} {:<16} {:<10}".format(
+        'Approach', 'Add Loop {s}', 'add_many {s}', 'Speedup', 'Delete Loop {s}', 'delete_many {s}', 'Speedup'))
+
+    for approach in approaches:
+        add_loop = time_call(create_and_build_dict(approach, size),
+                             lambda dictionary: [dictionary.add_word_frequency(word_freq) for word_freq in adds])
+        add_many = time_call(create_and_build_dict(approach, size), lambda dictionary: dictionary.add_many(adds))
+        delete_loop = time_call(create_and_build_dict(approach, size),
+                                lambda dictionary: [dictionary.delete_word(word) for word in deletes])
+        delete_many = time_call(create_and_build_dict(approach, size),
+                                lambda dictionary: dictionary.delete_many(deletes))
+
+        print("{:<10} {:<16} {:<16} {:<10} {:<16} {:<16} {:<10}".format(
+            approach, round(add_loop, 4), round(add_many, 4), round(add_loop / add_many, 2), round(delete_loop, 4),
+            round(delete_many, 4), round(delete_loop / delete_many, 2)))
+
+
+def time_call(dictionary, method_to_time) -> float:
+    start = time.perf_counter()
+    method_to_time(dictionary)
+
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
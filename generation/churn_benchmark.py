@@ -0,0 +1,101 @@
+import sys
+import time
+import random
+from node import Node
+from ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from benchmark import get_input_from_file, s_to_ns_scalar
+
+# Number of progress reports printed over the whole run, and autocomplete queries timed for each report.
+num_of_reports = 10
+num_of_autocomplete_queries = 100
+
+
+def display_usage():
+    print('python3 churn_benchmark.py', '<number of add/delete cycles> [input size]')
+    print('where [input size] = <50 | 500 | 1k | 2k | 5k | 10k | 50k | 100k> (default 10k)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) not in [2, 3]:
+        print('Incorrect number of arguments.')
+        display_usage()
+
+    try:
+        num_of_cycles = int(args[1])
+    except ValueError:
+        print('The number of cycles must be an integer.')
+        display_usage()
+
+    input_size = args[2] if len(args) == 3 else '10k'
+    initial_words = get_input_from_file("input/input_" + input_size, True)
+    adds_to_choose_from = get_input_from_file("input/input_adds", True)
+
+    # The tombstone mode never prunes on delete (only compaction reclaims its nodes), which gives a reference
+    # point for how the pruning delete keeps the tree from growing.
+    for title, dictionary in [('Pruning Delete', TernarySearchTreeDictionary()),
+                              ('Tombstone Delete', TernarySearchTreeDictionary(tombstone_deletes=True))]:
+        print("\n#### " + title.upper() + " ####")
+        dictionary.build_dictionary(initial_words)
+        run_churn(dictionary, num_of_cycles, adds_to_choose_from)
+
+
+def run_churn(dictionary: TernarySearchTreeDictionary, num_of_cycles: int, adds_to_choose_from: list):
+    # Each cycle adds a random word and then deletes a random word that was added earlier, so the number of words
+    # stays steady while the shape of the tree keeps changing underneath.
+    random.seed(0)
+    added_words = []
+    report_interval = max(num_of_cycles // num_of_reports, 1)
+
+    print("{:<12} {:<12} {:<12} {:<20}".format('Cycles', 'Words', 'Nodes', 'Autocomplete {ns}'))
+    display_report(dictionary, 0)
+
+    for cycle in range(1, num_of_cycles + 1):
+        word_freq = adds_to_choose_from[random.randint(0, len(adds_to_choose_from) - 1)]
+
+        if dictionary.add_word_frequency(word_freq):
+            added_words.append(word_freq.word)
+
+        if len(added_words) > 0:
+            index = random.randint(0, len(added_words) - 1)
+            added_words[index], added_words[-1] = added_words[-1], added_words[index]
+            dictionary.delete_word(added_words.pop())
+
+        if cycle % report_interval == 0:
+            display_report(dictionary, cycle)
+
+
+def display_report(dictionary: TernarySearchTreeDictionary, cycle: int):
+    live_words = []
+    dictionary.get_all_children_words(dictionary.root_node, "", live_words)
+    sum_of_running_times = 0
+
+    for i in range(0, num_of_autocomplete_queries):
+        picked_word = live_words[random.randint(0, len(live_words) - 1)][0]
+        prefix = picked_word[0:random.randint(1, min(len(picked_word), 3))]
+        start = time.perf_counter()
+        dictionary.autocomplete(prefix)
+        sum_of_running_times += (time.perf_counter() - start) * s_to_ns_scalar
+
+    print("{:<12} {:<12} {:<12} {:<20}".format(cycle, len(live_words), count_nodes(dictionary.root_node),
+                                               round(sum_of_running_times / num_of_autocomplete_queries, 3)))
+
+
+def count_nodes(root_node: Node) -> int:
+    num_of_nodes = 0
+    stack = [root_node]
+
+    while len(stack) > 0:
+        cur_node = stack.pop()
+
+        if cur_node is not None:
+            num_of_nodes += 1
+            stack.extend([cur_node.left, cur_node.middle, cur_node.right])
+
+    return num_of_nodes
+
+
+if __name__ == '__main__':
+    main()
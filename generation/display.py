@@ -5,21 +5,14 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 
-def plot_line_graph(axes: List[AxisPair], x_axis_min: str, x_axis_max: str, algorithm: str,
+def plot_line_graph(axes: List[AxisPair], titles: List[str], x_axis_min: str, x_axis_max: str, algorithm: str,
                     num_of_algorithm_iterations: int):
     if len(axes) <= 0:
         return
 
     for idx, axes_pair in enumerate(axes):
-        title = "List"
-
-        if idx == 1:
-            title = "Hashtable"
-        elif idx == 2:
-            title = "TST"
-
         print(axes_pair.x_axis, axes_pair.y_axis)
-        plt.plot(axes_pair.x_axis, axes_pair.y_axis, label=title)
+        plt.plot(axes_pair.x_axis, axes_pair.y_axis, label=titles[idx])
 
     if algorithm == 's':
         graph_title = 'Search Benchmark'
@@ -73,29 +66,67 @@ def plot_singular_bar_chart(titles, data):
     plt.show()
 
 
-def plot_multi_bar_chart(data: list, x_titles: list):
-    # set width of bar
-    bar_width = 0.25
+def plot_multi_bar_chart(data: list, x_titles: list, bar_titles: list):
+    # set width of bar, so that the bars of every approach fit side-by-side within a single algorithm group
+    bar_width = 0.8 / len(data)
+    colours = ['r', 'y', 'g', 'b', 'c', 'm']
     plt.subplots(figsize=(12, 8))
 
     # Set position of bar on X axis
     br1 = np.arange(len(data[0]))
-    br2 = [x + bar_width for x in br1]
-    br3 = [x + bar_width for x in br2]
 
     # Make the plot
-    plt.bar(br1, data[0], color='r', width=bar_width,
-            edgecolor='grey', label='List')
-    plt.bar(br2, data[1], color='y', width=bar_width,
-            edgecolor='grey', label='Hashtable')
-    plt.bar(br3, data[2], color='g', width=bar_width,
-            edgecolor='grey', label='TST')
+    for idx, approach_data in enumerate(data):
+        plt.bar([x + idx * bar_width for x in br1], approach_data, color=colours[idx % len(colours)],
+                width=bar_width, edgecolor='grey', label=bar_titles[idx])
 
     # Adding Xticks
     plt.xlabel('Algorithm', fontweight='bold', fontsize=15)
     plt.ylabel('Log of Time (ns)', fontweight='bold', fontsize=15)
-    plt.xticks([r + bar_width for r in range(len(data[0]))],
+    plt.xticks([r + bar_width * (len(data) - 1) / 2 for r in range(len(data[0]))],
                x_titles)
 
     plt.legend()
     plt.show()
+
+
+def display_percentile_data(data, throughputs, decimal_accuracy, command_titles, percentile_titles, approach_titles):
+    # data: approach index -> command -> [count, percentile latencies...], in ns.
+    for idx, approach_data in enumerate(data):
+        print("{:^97s}".format("### " + approach_titles[idx] + " Replay ###"))
+        print("{:^97s}".format("Throughput: " + str(round(throughputs[idx], decimal_accuracy)) + " commands/s"))
+        print(("{:<16} {:<12}" + " {:<14}" * len(percentile_titles)).format(
+            'Command', 'Count', *[title + ' {ns}' for title in percentile_titles]))
+
+        for command, command_data in approach_data.items():
+            print(("{:<16} {:<12}" + " {:<14}" * len(percentile_titles)).format(
+                command_titles[command], command_data[0], *[round(x, decimal_accuracy) for x in command_data[1:]]))
+
+        print('\n')
+
+
+def plot_percentile_chart(data, command_titles, percentile_titles, approach_titles):
+    # One group of bars per command type and percentile, one bar per approach, on a log scale since the tail
+    # percentiles are orders of magnitude above the median.
+    commands = [command for command in command_titles if any(command in approach_data for approach_data in data)]
+    bar_width = 0.8 / len(data)
+    colours = ['r', 'y', 'g', 'b', 'c', 'm']
+    plt.subplots(figsize=(12, 8))
+
+    x_titles = [command_titles[command] + '\n' + title for command in commands for title in percentile_titles]
+    br1 = np.arange(len(x_titles))
+
+    for idx, approach_data in enumerate(data):
+        heights = [approach_data[command][1 + percentile] if command in approach_data else 0
+                   for command in commands for percentile in range(0, len(percentile_titles))]
+        plt.bar([x + idx * bar_width for x in br1], heights, color=colours[idx % len(colours)],
+                width=bar_width, edgecolor='grey', label=approach_titles[idx])
+
+    plt.yscale('log')
+    plt.xlabel('Command and Percentile', fontweight='bold', fontsize=15)
+    plt.ylabel('Latency (ns)', fontweight='bold', fontsize=15)
+    plt.xticks([r + bar_width * (len(data) - 1) / 2 for r in range(len(x_titles))], x_titles)
+    plt.title('Replay Latency Percentiles')
+
+    plt.legend()
+    plt.show()
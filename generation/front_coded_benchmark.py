@@ -0,0 +1,83 @@
+import gc
+import sys
+import time
+import random
+import tracemalloc
+from mutation_log import read_words_frequencies
+from benchmark import get_input_from_file, create_dict, s_to_ns_scalar
+
+front_coded_approaches = ['list', 'blocked', 'frontcoded']
+num_of_queries = 2000
+bytes_to_mb_scalar = 1 / (1024 * 1024)
+
+
+def display_usage():
+    print('python3 front_coded_benchmark.py', '[data file]')
+    print('where [data file] defaults to sampleData200k.txt')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 2:
+        display_usage()
+
+    data_path = args[1] if len(args) == 2 else "sampleData200k.txt"
+    words_frequencies = get_input_from_file(data_path, True)
+
+    random.seed(0)
+    present_words = [word_freq.word for word_freq in random.sample(words_frequencies, num_of_queries)]
+    prefixes = [word[0:random.randint(1, min(len(word), 5))] for word in present_words]
+    present = set(word_freq.word for word_freq in words_frequencies)
+    adds = [word_freq for word_freq in get_input_from_file("input/input_adds", True) if word_freq.word not in present]
+    adds = random.sample(adds, min(num_of_queries, len(adds)))
+
+    print("Words: " + str(len(words_frequencies)))
+    print("{:<12} {:<14} {:<16} {:<14} {:<20} {:<14} {:<14}".format(
+        'Approach', 'Memory {MB}', 'Bytes per Word', 'Search {ns}', 'AutoComplete {ns}', 'Add {ns}', 'Delete {ns}'))
+
+    for approach in front_coded_approaches:
+        memory = measure_memory(approach, data_path)
+        dictionary = create_dict(approach)
+        dictionary.build_dictionary(words_frequencies)
+        search_time = time_queries(dictionary.search, present_words)
+        autocomplete_time = time_queries(dictionary.autocomplete, prefixes)
+        add_time = time_queries(dictionary.add_word_frequency, adds)
+        delete_time = time_queries(dictionary.delete_word, present_words)
+
+        print("{:<12} {:<14} {:<16} {:<14} {:<20} {:<14} {:<14}".format(
+            approach, round(memory * bytes_to_mb_scalar, 2), round(memory / len(words_frequencies), 1),
+            round(search_time, 1), round(autocomplete_time, 1), round(add_time, 1), round(delete_time, 1)))
+
+
+def measure_memory(approach: str, data_path: str) -> int:
+    # Bytes still allocated once the dictionary is built from a freshly read file and the read list is dropped, so
+    # that the words and WordFrequency objects are only counted if the dictionary keeps them.
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    dictionary = create_dict(approach)
+    words_frequencies = read_words_frequencies(data_path)
+    dictionary.build_dictionary(words_frequencies)
+    del words_frequencies
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return memory
+
+
+def time_queries(method_to_time, queries: list) -> float:
+    sum_of_running_times = 0
+
+    for query in queries:
+        start = time.perf_counter()
+        method_to_time(query)
+        sum_of_running_times += (time.perf_counter() - start) * s_to_ns_scalar
+
+    return sum_of_running_times / len(queries)
+
+
+if __name__ == '__main__':
+    main()
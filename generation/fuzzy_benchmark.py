@@ -0,0 +1,100 @@
+import sys
+import time
+import random
+import heapq
+from ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from benchmark import get_input_from_file, s_to_ns_scalar, input_sizes
+
+# Brute force compares the query against every word, so the number of queries is kept small.
+num_of_queries = 20
+max_distances = [1, 2]
+
+
+def display_usage():
+    print('python3 fuzzy_benchmark.py', '[input size]')
+    print('where [input size] = <' + ' | '.join(input_sizes) + '> (default: every size)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 2 or (len(args) == 2 and args[1] not in input_sizes):
+        display_usage()
+
+    sizes = [args[1]] if len(args) == 2 else input_sizes
+
+    print("{:<8} {:<10} {:<16} {:<20} {:<20} {:<10}".format('Size', 'Distance', 'Algorithm', 'TST {ns}',
+                                                            'Brute Force {ns}', 'Speedup'))
+
+    for size in sizes:
+        words_frequencies = get_input_from_file("input/input_" + size, True)
+        dictionary = TernarySearchTreeDictionary()
+        dictionary.build_dictionary(words_frequencies)
+        queries = get_misspelled_queries(words_frequencies)
+
+        for max_distance in max_distances:
+            for algorithm, prefix_match in [('FuzzySearch', False), ('FuzzyAutoComplete', True)]:
+                method_to_time = dictionary.fuzzy_autocomplete if prefix_match else dictionary.fuzzy_search
+                tst_time = time_queries(lambda query: method_to_time(query, max_distance), queries)
+                brute_force_time = time_queries(
+                    lambda query: brute_force(words_frequencies, query, max_distance, prefix_match), queries)
+
+                print("{:<8} {:<10} {:<16} {:<20} {:<20} {:<10}".format(
+                    size, max_distance, algorithm, round(tst_time, 3), round(brute_force_time, 3),
+                    round(brute_force_time / tst_time, 2)))
+
+
+def get_misspelled_queries(words_frequencies: list) -> list:
+    # Each query is a word with one random typo: a letter dropped, replaced or inserted.
+    random.seed(0)
+    queries = []
+
+    for i in range(0, num_of_queries):
+        word = words_frequencies[random.randint(0, len(words_frequencies) - 1)].word
+        index = random.randint(0, len(word) - 1)
+        letter = random.choice('abcdefghijklmnopqrstuvwxyz')
+        typo = random.randint(0, 2)
+
+        if typo == 0 and len(word) > 1:
+            queries.append(word[0:index] + word[index + 1:])
+        elif typo == 1:
+            queries.append(word[0:index] + letter + word[index + 1:])
+        else:
+            queries.append(word[0:index] + letter + word[index:])
+
+    return queries
+
+
+def brute_force(words_frequencies: list, query: str, max_distance: int, prefix_match: bool) -> list:
+    # The whole edit distance table is computed against every word. For prefix matching, a word qualifies when any
+    # of its prefixes is close enough to the query, i.e. the last column of any row of its table is.
+    matches = []
+
+    for word_freq in words_frequencies:
+        row = list(range(0, len(query) + 1))
+        closest = row[-1]
+
+        for letter in word_freq.word:
+            row = TernarySearchTreeDictionary.next_edit_row(row, query, letter)
+            closest = min(closest, row[-1])
+
+        if (closest if prefix_match else row[-1]) <= max_distance:
+            matches.append(word_freq)
+
+    return heapq.nsmallest(3, matches, key=lambda word_freq: (-word_freq.frequency, word_freq.word))
+
+
+def time_queries(method_to_time, queries: list) -> float:
+    sum_of_running_times = 0
+
+    for query in queries:
+        start = time.perf_counter()
+        method_to_time(query)
+        sum_of_running_times += (time.perf_counter() - start) * s_to_ns_scalar
+
+    return sum_of_running_times / len(queries)
+
+
+if __name__ == '__main__':
+    main()
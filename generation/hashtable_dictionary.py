@@ -1,4 +1,5 @@
 from typing import List
+import bisect
 from base_dictionary import BaseDictionary
 from word_frequency import WordFrequency
 
@@ -14,6 +15,9 @@ class HashTableDictionary(BaseDictionary):
 
     def __init__(self):
         self.word_frequencies = dict()
+        # Sorted view of the keys for ordered iteration. It is built by the first ordered query after a change and
+        # dropped by every add and delete, so that updates stay O(1) whether or not ordered queries are used.
+        self.sorted_words = None
 
     def build_dictionary(self, words_frequencies: List[WordFrequency]):
         """
@@ -24,6 +28,8 @@ class HashTableDictionary(BaseDictionary):
         for word_freq in words_frequencies:
             self.word_frequencies[word_freq.word] = word_freq.frequency
 
+        self.sorted_words = None
+
     def search(self, word: str) -> int:
         """
         search for a word
@@ -45,6 +51,7 @@ class HashTableDictionary(BaseDictionary):
 
         if word_not_found:
             self.word_frequencies[word_frequency.word] = word_frequency.frequency
+            self.sorted_words = None
 
         return word_not_found
 
@@ -60,6 +67,7 @@ class HashTableDictionary(BaseDictionary):
 
         if word_found:
             del self.word_frequencies[word]
+            self.sorted_words = None
 
         return word_found
 
@@ -95,3 +103,44 @@ class HashTableDictionary(BaseDictionary):
                 most_frequent.append(WordFrequency(word_to_add, highest_frequency))
 
         return most_frequent
+
+    def iter_range(self, low_word: str = None, high_word: str = None):
+        """
+        lazily yield the words w with low_word <= w < high_word, in lexicographic order
+        @param low_word: inclusive lower bound, or None for no lower bound
+        @param high_word: exclusive upper bound, or None for no upper bound
+        @return: generator of WordFrequency
+        """
+        sorted_words = self.get_sorted_words()
+        low = 0 if low_word is None else bisect.bisect_left(sorted_words, low_word)
+        high = len(sorted_words) if high_word is None else bisect.bisect_left(sorted_words, high_word)
+
+        return self.iter_positions(sorted_words, low, high)
+
+    def iter_prefix(self, prefix_word: str):
+        """
+        lazily yield the words that have 'prefix_word' as a prefix, in lexicographic order
+        @param prefix_word: the prefix
+        @return: generator of WordFrequency
+        """
+        if len(prefix_word) == 0:
+            return self.iter_range()
+
+        # Every word with the prefix sorts before the prefix with its last letter bumped up by one.
+        return self.iter_range(prefix_word, prefix_word[0:-1] + chr(ord(prefix_word[-1]) + 1))
+
+    def get_sorted_words(self) -> List[str]:
+        if self.sorted_words is None:
+            self.sorted_words = sorted(self.word_frequencies)
+
+        return self.sorted_words
+
+    def iter_positions(self, sorted_words: List[str], low: int, high: int):
+        # Walk the view the iterator was created from, which a later add or delete replaces instead of changing, so
+        # the positions stay valid. Words deleted since are skipped, and words added since are not seen.
+        for index in range(low, high):
+            word = sorted_words[index]
+            frequency = self.word_frequencies.get(word)
+
+            if frequency is not None:
+                yield WordFrequency(word, frequency)
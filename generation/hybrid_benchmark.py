@@ -0,0 +1,141 @@
+import gc
+import sys
+import time
+import random
+from hybrid_dictionary import HybridDictionary
+from replay_benchmark import replay, get_percentiles
+from benchmark import get_input_from_file, create_dict, input_sizes, s_to_ns_scalar
+
+hybrid_approaches = ['list', 'hashtable', 'tst', 'hybrid']
+num_of_commands_per_phase = 10000
+# Workload phases, each a mix of command shares. The mix shifts from exact lookups to autocomplete and back, with a
+# mutation-heavy phase in between.
+phases = [('search', {'S': 0.9, 'A': 0.05, 'D': 0.05}),
+          ('autocomplete', {'AC': 0.6, 'S': 0.4}),
+          ('mixed', {'S': 0.5, 'AC': 0.2, 'A': 0.15, 'D': 0.15}),
+          ('search', {'S': 0.9, 'A': 0.05, 'D': 0.05})]
+# Moves whose single-call latency is measured, as (from, to).
+migration_pairs = [('hashtable', 'list'), ('hashtable', 'tst'), ('list', 'hashtable'), ('list', 'tst'),
+                   ('tst', 'hashtable'), ('tst', 'list')]
+
+
+def display_usage():
+    print('python3 hybrid_benchmark.py', '[input size]')
+    print('where [input size] = <' + ' | '.join(input_sizes) + '> (default 10k)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 2 or (len(args) == 2 and args[1] not in input_sizes):
+        display_usage()
+
+    size = args[1] if len(args) == 2 else '10k'
+    words_frequencies = get_input_from_file("input/input_" + size, True)
+    phase_commands = get_phase_commands(words_frequencies, get_input_from_file("input/input_adds", True))
+
+    print("{:<10} {:<14} {:<12} {:<14} {:<14} {:<14} {:<24}".format(
+        'Approach', 'Phase', 'Time {s}', 'Mean {ns}', 'p99 {ns}', 'Max {ns}', 'Representation'))
+
+    for approach in hybrid_approaches:
+        # The hybrid starts as a hashtable, the best fit for the first phase.
+        dictionary = HybridDictionary('hashtable') if approach == 'hybrid' else create_dict(approach)
+        dictionary.build_dictionary(words_frequencies)
+        total_time = 0
+
+        for (phase, _), commands in zip(phases, phase_commands):
+            latencies, elapsed = replay(dictionary, commands, None)
+            all_latencies = [latency for command_latencies in latencies.values() for latency in command_latencies]
+            total_time += elapsed
+            representation = '-'
+            if approach == 'hybrid':
+                stats = dictionary.hybrid_stats()
+                representation = stats['representation'] + \
+                    (' -> ' + stats['migrating_to'] if stats['migrating_to'] is not None else '')
+
+            print("{:<10} {:<14} {:<12} {:<14} {:<14} {:<14} {:<24}".format(
+                approach, phase, round(elapsed, 3), round(sum(all_latencies) / len(all_latencies), 1),
+                get_percentiles(all_latencies)[2], max(all_latencies), representation))
+
+        print("{:<10} {:<14} {:<12}".format(approach, 'total', round(total_time, 3)))
+
+    check_finish_migration(words_frequencies)
+    time_migrations(words_frequencies, phase_commands[0])
+
+
+def check_finish_migration(words_frequencies: list):
+    # finish_migration() has to complete any move at once, including one from the hashtable to the list, which
+    # takes a step per key to sort before the copy starts.
+    for source, target in migration_pairs:
+        dictionary = HybridDictionary(source, window_size=len(words_frequencies) + 1)
+        dictionary.build_dictionary(words_frequencies)
+        dictionary.start_migration(target)
+        dictionary.finish_migration()
+        stats = dictionary.hybrid_stats()
+
+        assert dictionary.target is None and stats['migrating_to'] is None and stats['representation'] == target, \
+            'finish_migration() left the ' + source + ' -> ' + target + ' move unfinished'
+
+
+def time_migrations(words_frequencies: list, commands: list):
+    # Each move is started by hand and driven by the search phase's commands until it completes. The worst single
+    # call is what a move may add to one operation; sorting every key at once is shown for comparison, as the stall
+    # an eager move from the hashtable would cause. The cyclic garbage collector is paused while timing, as its full
+    # collections over a tree's nodes take hundreds of ms under any approach and would hide the move's own cost.
+    start = time.perf_counter()
+    sorted(word_freq.word for word_freq in words_frequencies)
+    print("\nSorting all " + str(len(words_frequencies)) + " words at once: " +
+          str(round((time.perf_counter() - start) * s_to_ns_scalar)) + " ns")
+    print("{:<24} {:<12} {:<14} {:<14} {:<14}".format('Move', 'Calls', 'Mean {ns}', 'p99 {ns}', 'Max {ns}'))
+
+    for source, target in migration_pairs:
+        dictionary = HybridDictionary(source, window_size=len(commands) + 1)
+        dictionary.build_dictionary(words_frequencies)
+        dictionary.start_migration(target)
+        latencies = []
+        gc.disable()
+
+        while dictionary.target is not None:
+            command, argument = commands[len(latencies) % len(commands)]
+            start = time.perf_counter()
+
+            if command == 'S':
+                dictionary.search(argument)
+            elif command == 'A':
+                dictionary.add_word_frequency(argument)
+            else:
+                dictionary.delete_word(argument)
+
+            latencies.append(round((time.perf_counter() - start) * s_to_ns_scalar))
+
+        gc.enable()
+        print("{:<24} {:<12} {:<14} {:<14} {:<14}".format(
+            source + ' -> ' + target, len(latencies), round(sum(latencies) / len(latencies), 1),
+            get_percentiles(latencies)[2], max(latencies)))
+
+
+def get_phase_commands(words_frequencies: list, adds_to_choose_from: list) -> list:
+    random.seed(0)
+    phase_commands = []
+
+    for _, shares in phases:
+        commands = []
+
+        for command in random.choices(list(shares), weights=list(shares.values()), k=num_of_commands_per_phase):
+            word = random.choice(words_frequencies).word
+
+            if command == 'A':
+                commands.append(('A', random.choice(adds_to_choose_from)))
+            elif command == 'AC':
+                commands.append(('AC', word[0:random.randint(1, min(len(word), 3))]))
+            else:
+                commands.append((command, word))
+
+        phase_commands.append(commands)
+
+    return phase_commands
+
+
+if __name__ == '__main__':
+    main()
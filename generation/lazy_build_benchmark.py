@@ -0,0 +1,72 @@
+import sys
+import time
+import random
+from lazy_tst_dictionary import LazyTernarySearchTreeDictionary
+from ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from benchmark import get_input_from_file
+
+num_of_queries = 1000
+# Number of first letters the narrow session's queries start with.
+num_of_session_letters = 3
+
+
+def display_usage():
+    print('python3 lazy_build_benchmark.py', '[data file]')
+    print('where [data file] defaults to sampleData200k.txt')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 2:
+        display_usage()
+
+    words_frequencies = get_input_from_file(args[1] if len(args) == 2 else "sampleData200k.txt", True)
+
+    # A narrow session only touches the words of a few first letters, a broad one touches every letter.
+    random.seed(0)
+    letters = sorted(set(word_freq.word[0] for word_freq in words_frequencies))
+    session_letters = set(random.sample(letters, min(num_of_session_letters, len(letters))))
+    narrow_session = random.sample([word_freq.word for word_freq in words_frequencies
+                                    if word_freq.word[0] in session_letters], num_of_queries)
+    broad_session = [word_freq.word for word_freq in random.sample(words_frequencies, num_of_queries)]
+
+    print("Words: " + str(len(words_frequencies)) + ", first letters: " + str(len(letters)) +
+          ", narrow session letters: " + ' '.join(sorted(session_letters)))
+    print("{:<12} {:<10} {:<12} {:<18} {:<26} {:<18} {:<18}".format(
+        'Mode', 'Session', 'Build {s}', 'First Query {s}', 'Time to First Query {s}', 'Session {s}',
+        'Max Query {s}'))
+
+    for session_name, session in [('narrow', narrow_session), ('broad', broad_session)]:
+        for mode in ['full', 'lazy', 'warming']:
+            if mode == 'full':
+                dictionary = TernarySearchTreeDictionary()
+            else:
+                dictionary = LazyTernarySearchTreeDictionary(warm_in_background=mode == 'warming')
+
+            start = time.perf_counter()
+            dictionary.build_dictionary(words_frequencies)
+            build_time = time.perf_counter() - start
+
+            query_times = []
+
+            for word in session:
+                query_start = time.perf_counter()
+                dictionary.search(word)
+                query_times.append(time.perf_counter() - query_start)
+
+            session_time = time.perf_counter() - start
+
+            print("{:<12} {:<10} {:<12} {:<18} {:<26} {:<18} {:<18}".format(
+                mode, session_name, round(build_time, 4), round(query_times[0], 4),
+                round(build_time + query_times[0], 4), round(session_time, 4), round(max(query_times), 4)))
+
+            if mode == 'warming':
+                dictionary.wait_until_warm()
+                print("{:<12} {:<10} all letters built {:<.4f} s after the build".format(
+                    mode, session_name, time.perf_counter() - start - build_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -15,3 +15,7 @@ class Node:
         self.left = None    # pointing to the left child Node, which holds a letter < self.letter
         self.middle = None  # pointing to the middle child Node
         self.right = None   # pointing to the right child Node, which holds a letter > self.letter
+        self.access_count = 0   # number of times this letter was matched by an adaptive search or autocomplete
+        self.subtree_count = 0      # number of words ending in the subtree rooted here (left, middle, right and self)
+        self.subtree_frequency = 0  # total frequency of the words ending in the subtree rooted here
+        self.subtree_max_frequency = 0  # highest frequency of a word ending in the subtree rooted here
@@ -0,0 +1,118 @@
+from typing import List, Tuple
+import numpy as np
+from base_dictionary import BaseDictionary
+from word_frequency import WordFrequency
+
+
+# ------------------------------------------------------------------------
+# Read-only dictionary backed by NumPy arrays, intended for offline batch jobs. The words are kept as a sorted
+# fixed-width bytes array and the frequencies as a parallel int64 array, so whole arrays of queries can be
+# answered with a single np.searchsorted call instead of one Python-level bisect per word.
+# ------------------------------------------------------------------------
+
+class FrozenNumpyDictionary(BaseDictionary):
+
+    def __init__(self):
+        self.words = np.array([], dtype='S1')
+        self.frequencies = np.array([], dtype=np.int64)
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        # UTF-8 preserves code point order, so the byte-wise sort agrees with the order of the str-based approaches.
+        words = np.array([word_freq.word.encode('utf-8') for word_freq in words_frequencies], dtype=bytes)
+        frequencies = np.array([word_freq.frequency for word_freq in words_frequencies], dtype=np.int64)
+        order = np.argsort(words, kind='stable')
+
+        self.words = words[order]
+        self.frequencies = frequencies[order]
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        return int(self.search_many([word])[0])
+
+    def search_many(self, words) -> np.ndarray:
+        """
+        search for many words at once
+        @param words: list of str, or an array of UTF-8 encoded bytes, to be searched
+        @return: int64 array holding each word's frequency, or 0 where the word was NOT found
+        """
+        queries = self.encode_queries(words)
+
+        if len(self.words) == 0:
+            return np.zeros(len(queries), dtype=np.int64)
+
+        # Any query that sorts past the last word gets clipped onto it, where the equality test then rejects it.
+        indices = np.minimum(np.searchsorted(self.words, queries), len(self.words) - 1)
+        found = self.words[indices] == queries
+
+        return np.where(found, self.frequencies[indices], 0)
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        raise TypeError("FrozenNumpyDictionary is read-only, rebuild it to add '" + word_frequency.word + "'")
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        raise TypeError("FrozenNumpyDictionary is read-only, rebuild it to delete '" + word + "'")
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        return self.autocomplete_many([prefix_word])[0]
+
+    def autocomplete_many(self, prefix_words) -> List[List[WordFrequency]]:
+        """
+        autocomplete many prefixes at once
+        @param prefix_words: list of str, or an array of UTF-8 encoded bytes, to be autocompleted
+        @return: for each prefix, a list (could be empty) of (at most) 3 most-frequent words with that prefix
+        """
+        lower_bounds, upper_bounds = self.prefix_ranges(prefix_words)
+        most_frequent_per_prefix = []
+
+        for lower, upper in zip(lower_bounds, upper_bounds):
+            # A stable sort on the negated frequencies keeps equally frequent words in alphabetical order, which
+            # is how the list approach breaks ties.
+            top_indices = lower + np.argsort(-self.frequencies[lower:upper], kind='stable')[0:3]
+            most_frequent_per_prefix.append([WordFrequency(self.words[index].decode('utf-8'),
+                                                           int(self.frequencies[index])) for index in top_indices])
+
+        return most_frequent_per_prefix
+
+    def prefix_ranges(self, prefix_words) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        find the block of sorted words that start with each prefix
+        @param prefix_words: list of str, or an array of UTF-8 encoded bytes
+        @return: (lower, upper) index arrays, where words[lower[i]:upper[i]] are the words with prefix i
+        """
+        prefixes = self.encode_queries(prefix_words)
+        # 0xFF never occurs in UTF-8, so prefix + 0xFF sorts after every word that starts with the prefix and
+        # before every word that doesn't.
+        upper_limits = np.char.add(prefixes, b'\xff')
+
+        return np.searchsorted(self.words, prefixes, side='left'), np.searchsorted(self.words, upper_limits,
+                                                                                    side='left')
+
+    @staticmethod
+    def encode_queries(words) -> np.ndarray:
+        if isinstance(words, np.ndarray) and words.dtype.kind == 'S':
+            return words
+
+        return np.array([word.encode('utf-8') for word in words], dtype=bytes)
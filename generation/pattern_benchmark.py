@@ -0,0 +1,84 @@
+import sys
+import time
+import random
+import re
+import heapq
+from ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from hashtable_dictionary import HashTableDictionary
+from benchmark import get_input_from_file, s_to_ns_scalar
+
+num_of_queries = 50
+limit = 10
+
+
+def display_usage():
+    print('python3 pattern_benchmark.py', '[data file]')
+    print('where [data file] = a file of word and frequency lines (default: sampleData200k.txt)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 2:
+        display_usage()
+
+    words_frequencies = get_input_from_file(args[1] if len(args) == 2 else "sampleData200k.txt", True)
+    tst_dictionary = TernarySearchTreeDictionary()
+    tst_dictionary.build_dictionary(words_frequencies)
+    hashtable_dictionary = HashTableDictionary()
+    hashtable_dictionary.build_dictionary(words_frequencies)
+
+    print("Words: " + str(len(words_frequencies)) + ", limit: " + str(limit))
+    print("{:<16} {:<20} {:<20} {:<10}".format('Pattern Kind', 'TST {ns}', 'Regex Scan {ns}', 'Speedup'))
+
+    for kind, patterns in get_patterns(words_frequencies).items():
+        tst_time = time_queries(lambda pattern: tst_dictionary.pattern_search(pattern, limit), patterns)
+        regex_time = time_queries(lambda pattern: regex_scan(hashtable_dictionary, pattern), patterns)
+
+        print("{:<16} {:<20} {:<20} {:<10}".format(kind, round(tst_time, 3), round(regex_time, 3),
+                                                   round(regex_time / tst_time, 2)))
+
+
+def get_patterns(words_frequencies: list) -> dict:
+    # Every pattern is made from a word in the dictionary, so that it has at least one match.
+    random.seed(0)
+    patterns = {'single ?': [], 'several ?': [], 'prefix*suffix': [], 'prefix*': [], '*suffix': []}
+
+    while len(patterns['single ?']) < num_of_queries:
+        word = words_frequencies[random.randint(0, len(words_frequencies) - 1)].word
+
+        if len(word) < 4:
+            continue
+
+        index = random.randint(0, len(word) - 1)
+        patterns['single ?'].append(word[0:index] + '?' + word[index + 1:])
+        patterns['several ?'].append(''.join('?' if random.random() < 0.4 else letter for letter in word))
+        patterns['prefix*suffix'].append(word[0:2] + '*' + word[-3:])
+        patterns['prefix*'].append(word[0:3] + '*')
+        patterns['*suffix'].append('*' + word[-3:])
+
+    return patterns
+
+
+def regex_scan(dictionary: HashTableDictionary, pattern: str) -> list:
+    # The linear alternative: test every key against the equivalent regular expression.
+    regex = re.compile(re.escape(pattern).replace('\\?', '.').replace('\\*', '.*'))
+    matches = [(word, frequency) for word, frequency in dictionary.word_frequencies.items() if regex.fullmatch(word)]
+
+    return heapq.nsmallest(limit, matches, key=lambda match: (-match[1], match[0]))
+
+
+def time_queries(method_to_time, queries: list) -> float:
+    sum_of_running_times = 0
+
+    for query in queries:
+        start = time.perf_counter()
+        method_to_time(query)
+        sum_of_running_times += (time.perf_counter() - start) * s_to_ns_scalar
+
+    return sum_of_running_times / len(queries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import sys
+import time
+import random
+from ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from benchmark import get_input_from_file, s_to_ns_scalar, input_sizes
+
+num_of_searches = 1000
+
+
+def display_usage():
+    print('python3 rebalance_benchmark.py', '[input size]')
+    print('where [input size] = <50 | 500 | 1k | 2k | 5k | 10k | 50k | 100k> (default: every size)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 2 or (len(args) == 2 and args[1] not in input_sizes):
+        display_usage()
+
+    sizes = [args[1]] if len(args) == 2 else input_sizes
+
+    print("{:<8} {:<10} {:<12} {:<14} {:<14} {:<12}".format('Size', 'Order', 'Mode', 'Build {s}', 'Search {ns}',
+                                                           'Rebuilds'))
+
+    for size in sizes:
+        words_frequencies = get_input_from_file("input/input_" + size, True)
+        sorted_words_frequencies = sorted(words_frequencies, key=lambda word_freq: word_freq.word)
+        shuffled_words_frequencies = [*words_frequencies]
+        random.shuffle(shuffled_words_frequencies)
+
+        # Production feeds that arrive alphabetically are the worst case for the static tree, since every level
+        # degenerates into a chain, whereas a shuffled feed is close to its best case.
+        for order, feed in [('sorted', sorted_words_frequencies), ('shuffled', shuffled_words_frequencies)]:
+            for mode, rebalance in [('static', False), ('rebalance', True)]:
+                dictionary = TernarySearchTreeDictionary(rebalance=rebalance)
+
+                start = time.perf_counter()
+                dictionary.build_dictionary(feed)
+                build_time = time.perf_counter() - start
+
+                search_time = time_searches(dictionary, words_frequencies)
+                print("{:<8} {:<10} {:<12} {:<14} {:<14} {:<12}".format(size, order, mode, round(build_time, 3),
+                                                                       round(search_time, 3),
+                                                                       dictionary.level_rebuilds))
+
+
+def time_searches(dictionary: TernarySearchTreeDictionary, words_frequencies: list) -> float:
+    sum_of_running_times = 0
+
+    for i in range(0, num_of_searches):
+        word = words_frequencies[random.randint(0, len(words_frequencies) - 1)].word
+        start = time.perf_counter()
+        dictionary.search(word)
+        sum_of_running_times += (time.perf_counter() - start) * s_to_ns_scalar
+
+    return sum_of_running_times / num_of_searches
+
+
+if __name__ == '__main__':
+    main()
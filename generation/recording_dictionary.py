@@ -0,0 +1,107 @@
+from typing import List
+from base_dictionary import BaseDictionary
+from word_frequency import WordFrequency
+
+
+# ------------------------------------------------------------------------
+# Dictionary wrapper that records every operation it serves as a command file, in the same "S word",
+# "A word frequency", "D word" and "AC prefix" format dictionary_file_based.py reads. Recording real traffic this
+# way gives the replay benchmark a workload with the traffic's own mix of commands and skew of words.
+# ------------------------------------------------------------------------
+
+def read_commands(command_path: str) -> List[tuple]:
+    """
+    read a command file
+    @param command_path: file to read, one command per line
+    @return: list of (command, argument), where the argument of an add is a (word, frequency) and otherwise a word
+    """
+    commands = []
+
+    with open(command_path, 'r') as command_file:
+        for line in command_file:
+            values = line.split()
+
+            if len(values) == 0:
+                continue
+
+            if values[0] == 'A':
+                commands.append(('A', WordFrequency(values[1], int(values[2]))))
+            elif values[0] in ['S', 'D', 'AC']:
+                commands.append((values[0], values[1]))
+            else:
+                raise ValueError("Unknown command '" + values[0] + "' in " + command_path)
+
+    return commands
+
+
+class RecordingDictionary(BaseDictionary):
+
+    def __init__(self, dictionary: BaseDictionary, record_path: str):
+        """
+        @param dictionary: the dictionary implementation serving the operations
+        @param record_path: command file the operations are appended to
+        """
+        self.dictionary = dictionary
+        self.record_file = open(record_path, 'a')
+        self.recorded = 0
+
+    def build_dictionary(self, words_frequencies: List[WordFrequency]):
+        """
+        construct the data structure to store nodes
+        @param words_frequencies: list of (word, frequency) to be stored
+        """
+        # The initial words come from the data file, which a replay builds from itself, so they aren't recorded.
+        self.dictionary.build_dictionary(words_frequencies)
+
+    def record(self, command: str):
+        self.record_file.write(command + '\n')
+        self.recorded += 1
+
+    def search(self, word: str) -> int:
+        """
+        search for a word
+        @param word: the word to be searched
+        @return: frequency > 0 if found and 0 if NOT found
+        """
+        self.record('S ' + word)
+
+        return self.dictionary.search(word)
+
+    def add_word_frequency(self, word_frequency: WordFrequency) -> bool:
+        """
+        add a word and its frequency to the dictionary
+        @param word_frequency: (word, frequency) to be added
+        :return: True whether succeeded, False when word is already in the dictionary
+        """
+        # Failed adds are recorded too, since they cost the dictionary a lookup all the same.
+        self.record('A ' + word_frequency.word + ' ' + str(word_frequency.frequency))
+
+        return self.dictionary.add_word_frequency(word_frequency)
+
+    def delete_word(self, word: str) -> bool:
+        """
+        delete a word from the dictionary
+        @param word: word to be deleted
+        @return: whether succeeded, e.g. return False when point not found
+        """
+        self.record('D ' + word)
+
+        return self.dictionary.delete_word(word)
+
+    def autocomplete(self, prefix_word: str) -> List[WordFrequency]:
+        """
+        return a list of 3 most-frequent words in the dictionary that have 'prefix_word' as a prefix
+        @param prefix_word: word to be autocompleted
+        @return: a list (could be empty) of (at most) 3 most-frequent words with prefix 'prefix_word'
+        """
+        self.record('AC ' + prefix_word)
+
+        return self.dictionary.autocomplete(prefix_word)
+
+    def close(self):
+        """
+        write out the recorded commands and close the command file
+        """
+        if self.record_file is not None:
+            self.record_file.close()
+            self.record_file = None
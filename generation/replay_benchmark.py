@@ -0,0 +1,110 @@
+import sys
+import math
+import time
+import getopt
+from display import display_percentile_data, plot_percentile_chart
+from recording_dictionary import read_commands
+from benchmark import get_input_from_file, create_dict, valid_approaches, valid_output_types, approach_titles
+
+command_titles = {'S': 'Search', 'A': 'Add', 'D': 'Delete', 'AC': 'AutoComplete'}
+percentiles = [50, 90, 99, 99.9]
+percentile_titles = ['p50', 'p90', 'p99', 'p999']
+
+
+def display_usage():
+    print('python3 replay_benchmark.py', '<approach> <data file> <command file> [-r <rate>] [-o <output type>]')
+    print('where <approach> = <' + ' | '.join(valid_approaches) + ' | all>')
+    print('<command file> holds S/A/D/AC commands, e.g. recorded with dictionary_file_based.py --record')
+    print('-r replays open-loop at <rate> commands/s, instead of closed-loop as fast as possible')
+    print('-o is <' + ' | '.join(valid_output_types) + '> (default numeric)')
+    sys.exit(1)
+
+
+def main():
+    try:
+        opts, args = getopt.gnu_getopt(sys.argv[1:], 'r:o:')
+        options = dict(opts)
+        rate = float(options['-r']) if '-r' in options else None
+        output_type = options.get('-o', 'numeric')
+    except (getopt.GetoptError, ValueError):
+        print('Incorrect options.')
+        display_usage()
+
+    if len(args) != 3 or args[0] not in valid_approaches + ['all'] or output_type not in valid_output_types or \
+            (rate is not None and rate <= 0):
+        display_usage()
+
+    approaches = valid_approaches if args[0] == 'all' else [args[0]]
+    commands = read_commands(args[2])
+
+    print("Replaying " + str(len(commands)) + " commands " +
+          ("open-loop at " + str(rate) + " commands/s" if rate is not None else "closed-loop"))
+
+    data = []
+    throughputs = []
+
+    for approach in approaches:
+        # Every approach replays from the same initial words, as the mutations in the stream change them.
+        dictionary = create_dict(approach)
+        dictionary.build_dictionary(get_input_from_file(args[1], True))
+        latencies, elapsed = replay(dictionary, commands, rate)
+
+        data.append(dict((command, [len(command_latencies)] + get_percentiles(command_latencies))
+                         for command, command_latencies in latencies.items()))
+        throughputs.append(len(commands) / elapsed if elapsed > 0 else 0)
+
+    titles = [approach_titles[valid_approaches.index(approach)] for approach in approaches]
+
+    if output_type == 'graphic':
+        plot_percentile_chart(data, command_titles, percentile_titles, titles)
+    else:
+        display_percentile_data(data, throughputs, 3, command_titles, percentile_titles, titles)
+
+
+def replay(dictionary, commands: list, rate) -> tuple:
+    """
+    replay commands against a dictionary
+    @param dictionary: the dictionary to replay against
+    @param commands: list of (command, argument), as read by read_commands()
+    @param rate: commands per second to issue them at (open-loop), or None to issue each as soon as the previous one
+    completes (closed-loop)
+    @return: latencies in ns per command type, and the elapsed time in s
+    """
+    methods = {'S': dictionary.search, 'A': dictionary.add_word_frequency, 'D': dictionary.delete_word,
+               'AC': dictionary.autocomplete}
+    latencies = dict((command, []) for command in command_titles if any(c == command for c, _ in commands))
+    interval_ns = int(1000 * 1000 * 1000 / rate) if rate is not None else 0
+    start = time.perf_counter_ns()
+
+    for index, (command, argument) in enumerate(commands):
+        if rate is not None:
+            # Open-loop: the command is due at its scheduled time whether or not the previous one has completed, and
+            # its latency is measured from then. A slow command then shows up in the latency of the commands queued
+            # behind it, instead of quietly lowering the rate as a closed loop would.
+            issued = start + index * interval_ns
+
+            while time.perf_counter_ns() < issued:
+                remaining = issued - time.perf_counter_ns()
+
+                # Sleep through most of the wait, and spin through the last millisecond, which sleep overshoots.
+                if remaining > 1000 * 1000:
+                    time.sleep((remaining - 1000 * 1000) / (1000 * 1000 * 1000))
+        else:
+            issued = time.perf_counter_ns()
+
+        methods[command](argument)
+        latencies[command].append(time.perf_counter_ns() - issued)
+
+    return latencies, (time.perf_counter_ns() - start) / (1000 * 1000 * 1000)
+
+
+def get_percentiles(latencies: list) -> list:
+    # Nearest-rank percentiles, so that every reported latency is one that was observed.
+    sorted_latencies = sorted(latencies)
+
+    return [sorted_latencies[max(int(math.ceil(percentile / 100 * len(sorted_latencies))) - 1, 0)]
+            for percentile in percentiles]
+
+
+if __name__ == '__main__':
+    main()
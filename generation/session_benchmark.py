@@ -0,0 +1,100 @@
+import sys
+import time
+import random
+from itertools import accumulate
+from autocomplete_session import TernarySearchTreeAutocompleteSession, ListAutocompleteSession
+from benchmark import get_input_from_file, create_and_build_dict, s_to_ns_scalar, input_sizes
+
+num_of_words_typed = 500
+# Chance that a keystroke is a typo, which the typist notices and immediately erases with a backspace.
+typo_rate = 0.05
+session_approaches = {'list': ListAutocompleteSession, 'tst': TernarySearchTreeAutocompleteSession}
+
+
+def display_usage():
+    print('python3 session_benchmark.py', '<approach> [input size]')
+    print('where <approach> = <' + ' | '.join(session_approaches) + ' | all>')
+    print('and [input size] = <' + ' | '.join(input_sizes) + '> (default: every size)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) not in [2, 3] or args[1] not in list(session_approaches) + ['all'] or \
+            (len(args) == 3 and args[2] not in input_sizes):
+        display_usage()
+
+    approaches = list(session_approaches) if args[1] == 'all' else [args[1]]
+    sizes = [args[2]] if len(args) == 3 else input_sizes
+
+    print("{:<10} {:<8} {:<12} {:<16} {:<16} {:<16}".format('Approach', 'Size', 'Mode', 'Keystroke {ns}',
+                                                            'p95 {ns}', 'Backspace {ns}'))
+
+    for approach in approaches:
+        for size in sizes:
+            trace = get_typing_trace(get_input_from_file("input/input_" + size, True))
+            dictionary = create_and_build_dict(approach, size)
+
+            for mode in ['scratch', 'session']:
+                keystroke_times, backspace_times = replay(dictionary, session_approaches[approach], mode, trace)
+                keystroke_times.sort()
+
+                print("{:<10} {:<8} {:<12} {:<16} {:<16} {:<16}".format(
+                    approach, size, mode, round(sum(keystroke_times) / len(keystroke_times), 3),
+                    round(keystroke_times[int(0.95 * (len(keystroke_times) - 1))], 3),
+                    round(sum(backspace_times) / max(len(backspace_times), 1), 3)))
+
+
+def get_typing_trace(words_frequencies: list) -> list:
+    # A trace is the list of keys pressed while typing words out in full. Words are picked in proportion to their
+    # frequency, as real users type common words more often, and the occasional typo is erased with a backspace
+    # (None in the trace) before the right letter is typed. An empty string marks the start of a new word.
+    random.seed(0)
+    cumulative_weights = list(accumulate(word_freq.frequency for word_freq in words_frequencies))
+    trace = []
+
+    for word_freq in random.choices(words_frequencies, cum_weights=cumulative_weights, k=num_of_words_typed):
+        trace.append("")
+
+        for letter in word_freq.word:
+            if random.random() < typo_rate:
+                trace.append(random.choice('abcdefghijklmnopqrstuvwxyz'))
+                trace.append(None)
+
+            trace.append(letter)
+
+    return trace
+
+
+def replay(dictionary, session_class, mode: str, trace: list):
+    # In 'scratch' mode every keystroke autocompletes the whole prefix again, as the UI did before sessions.
+    session = session_class(dictionary)
+    prefix = ""
+    keystroke_times = []
+    backspace_times = []
+
+    for key in trace:
+        if key == "":
+            session.reset()
+            prefix = ""
+            continue
+
+        start = time.perf_counter()
+
+        if mode == 'session':
+            session.type_letter(key) if key is not None else session.backspace()
+        else:
+            prefix = prefix + key if key is not None else prefix[0:-1]
+
+            if len(prefix) > 0:
+                dictionary.autocomplete(prefix)
+
+        running_time = (time.perf_counter() - start) * s_to_ns_scalar
+        (keystroke_times if key is not None else backspace_times).append(running_time)
+
+    return keystroke_times, backspace_times
+
+
+if __name__ == '__main__':
+    main()
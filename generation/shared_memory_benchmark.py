@@ -0,0 +1,127 @@
+import sys
+import os
+import time
+import tempfile
+import random
+import multiprocessing
+from shared_tst_dictionary import SharedTernarySearchTreeDictionary
+from ternarysearchtree_dictionary import TernarySearchTreeDictionary
+from benchmark import get_input_from_file, s_to_ns_scalar
+
+num_of_queries = 2000
+kb_to_mb_scalar = 1 / 1024
+
+
+def display_usage():
+    print('python3 shared_memory_benchmark.py', '[number of workers] [data file]')
+    print('where [number of workers] defaults to 4 and [data file] to sampleData200k.txt')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 3:
+        display_usage()
+
+    try:
+        num_of_workers = int(args[1]) if len(args) > 1 else 4
+    except ValueError:
+        print('The number of workers must be an integer.')
+        display_usage()
+
+    data_path = args[2] if len(args) > 2 else "sampleData200k.txt"
+    words_frequencies = get_input_from_file(data_path, True)
+
+    # /dev/shm keeps the tree file in memory, where it is available.
+    tree_directory = tempfile.mkdtemp(dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    tree_path = os.path.join(tree_directory, 'tree.bin')
+
+    start = time.perf_counter()
+    shared_dictionary = SharedTernarySearchTreeDictionary(tree_path)
+    shared_dictionary.build_dictionary(words_frequencies)
+    print("Words: " + str(len(words_frequencies)) + ", tree file: " +
+          str(round(os.path.getsize(tree_path) / (1024 * 1024), 2)) + " MB built in " +
+          str(round(time.perf_counter() - start, 3)) + " s")
+
+    # Spawned workers start from a fresh interpreter, as separately launched workers would, so nothing is shared
+    # with this process through copy-on-write pages.
+    context = multiprocessing.get_context('spawn')
+
+    print("{:<10} {:<8} {:<18} {:<20} {:<20} {:<14} {:<16}".format(
+        'Mode', 'Worker', 'Startup {s}', 'Private RSS {MB}', 'Shared RSS {MB}', 'Search {ns}', 'AutoComplete {ns}'))
+
+    try:
+        for mode in ['build', 'attach']:
+            with context.Pool(num_of_workers) as pool:
+                results = pool.starmap(run_worker, [(mode, data_path, tree_path, worker)
+                                                    for worker in range(0, num_of_workers)])
+
+            for worker, result in enumerate(results):
+                print("{:<10} {:<8} {:<18} {:<20} {:<20} {:<14} {:<16}".format(
+                    mode, worker, round(result['startup'], 6), round(result['private'] * kb_to_mb_scalar, 2),
+                    round(result['shared'] * kb_to_mb_scalar, 2), round(result['search'], 3),
+                    round(result['autocomplete'], 3)))
+    finally:
+        shared_dictionary.close()
+        os.remove(tree_path)
+        os.rmdir(tree_directory)
+
+
+def run_worker(mode: str, data_path: str, tree_path: str, worker: int) -> dict:
+    # A 'build' worker builds its own private tree from the data file, as every worker did before; an 'attach'
+    # worker maps the tree file.
+    start = time.perf_counter()
+
+    if mode == 'build':
+        dictionary = TernarySearchTreeDictionary()
+        dictionary.build_dictionary(get_input_from_file(data_path, True))
+    else:
+        dictionary = SharedTernarySearchTreeDictionary.attach(tree_path)
+
+    startup = time.perf_counter() - start
+    # Memory is read before the query words are loaded, so it counts the dictionary and the interpreter only. The
+    # shared pages are touched by the queries, so they are read afterwards.
+    private_rss, _ = read_rss()
+
+    random.seed(worker)
+    words = [word_freq.word for word_freq in random.sample(get_input_from_file(data_path, True), num_of_queries)]
+    search_time = time_queries(dictionary.search, words)
+    autocomplete_time = time_queries(dictionary.autocomplete, [word[0:random.randint(1, 3)] for word in words])
+    _, shared_rss = read_rss()
+
+    if mode == 'attach':
+        dictionary.close()
+
+    return {'startup': startup, 'private': private_rss, 'shared': shared_rss, 'search': search_time,
+            'autocomplete': autocomplete_time}
+
+
+def read_rss():
+    # Resident memory in KB, split into the process's own pages and the shared or file-backed pages it has touched
+    # (Linux only).
+    private_rss, shared_rss = 0, 0
+
+    with open('/proc/self/status', 'r') as status_file:
+        for line in status_file:
+            if line.startswith('RssAnon:'):
+                private_rss = int(line.split()[1])
+            elif line.startswith('RssShmem:') or line.startswith('RssFile:'):
+                shared_rss += int(line.split()[1])
+
+    return private_rss, shared_rss
+
+
+def time_queries(method_to_time, queries: list) -> float:
+    sum_of_running_times = 0
+
+    for query in queries:
+        start = time.perf_counter()
+        method_to_time(query)
+        sum_of_running_times += (time.perf_counter() - start) * s_to_ns_scalar
+
+    return sum_of_running_times / len(queries)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import sys
+import time
+import random
+import heapq
+from substring_index_dictionary import SubstringIndexDictionary
+from hashtable_dictionary import HashTableDictionary
+from benchmark import get_input_from_file, s_to_ns_scalar, input_sizes
+
+num_of_queries = 200
+num_of_updates = 1000
+bytes_to_mb_scalar = 1 / (1024 * 1024)
+
+
+def display_usage():
+    print('python3 substring_benchmark.py', '[input size]')
+    print('where [input size] = <' + ' | '.join(input_sizes) + '> (default: every size)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) > 2 or (len(args) == 2 and args[1] not in input_sizes):
+        display_usage()
+
+    sizes = [args[1]] if len(args) == 2 else input_sizes
+    adds_to_choose_from = get_input_from_file("input/input_adds", True)
+
+    print("{:<8} {:<12} {:<14} {:<16} {:<16} {:<10} {:<14} {:<14}".format(
+        'Size', 'Build {s}', 'Memory {MB}', 'Index {ns}', 'Scan {ns}', 'Speedup', 'Add {ns}', 'Delete {ns}'))
+
+    for size in sizes:
+        words_frequencies = get_input_from_file("input/input_" + size, True)
+
+        start = time.perf_counter()
+        dictionary = SubstringIndexDictionary(HashTableDictionary())
+        dictionary.build_dictionary(words_frequencies)
+        build_time = time.perf_counter() - start
+        memory = dictionary.index.memory_usage() * bytes_to_mb_scalar
+
+        fragments = get_fragments(words_frequencies)
+        index_time = time_calls(dictionary.substring_search, fragments)
+        scan_time = time_calls(lambda fragment: scan(words_frequencies, fragment), fragments)
+
+        # Adds go to the delta (and trigger the periodic rebuilds), deletes are applied to the index in place.
+        random.seed(0)
+        add_time = time_calls(dictionary.add_word_frequency, random.sample(adds_to_choose_from, num_of_updates))
+        delete_time = time_calls(dictionary.delete_word,
+                                 [word_freq.word for word_freq in random.choices(words_frequencies, k=num_of_updates)])
+
+        print("{:<8} {:<12} {:<14} {:<16} {:<16} {:<10} {:<14} {:<14}".format(
+            size, round(build_time, 3), round(memory, 2), round(index_time, 3), round(scan_time, 3),
+            round(scan_time / index_time, 2), round(add_time, 3), round(delete_time, 3)))
+
+
+def get_fragments(words_frequencies: list) -> list:
+    # Fragments of 2 to 5 letters taken from anywhere inside words of the dictionary.
+    random.seed(0)
+    fragments = []
+
+    for i in range(0, num_of_queries):
+        word = words_frequencies[random.randint(0, len(words_frequencies) - 1)].word
+        length = min(random.randint(2, 5), len(word))
+        start = random.randint(0, len(word) - length)
+        fragments.append(word[start:start + length])
+
+    return fragments
+
+
+def scan(words_frequencies: list, fragment: str) -> list:
+    # The alternative without an index: test every word of the vocabulary.
+    matches = [word_freq for word_freq in words_frequencies if fragment in word_freq.word]
+
+    return heapq.nsmallest(3, matches, key=lambda word_freq: (-word_freq.frequency, word_freq.word))
+
+
+def time_calls(method_to_time, arguments: list) -> float:
+    sum_of_running_times = 0
+
+    for argument in arguments:
+        start = time.perf_counter()
+        method_to_time(argument)
+        sum_of_running_times += (time.perf_counter() - start) * s_to_ns_scalar
+
+    return sum_of_running_times / len(arguments)
+
+
+if __name__ == '__main__':
+    main()
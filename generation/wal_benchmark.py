@@ -0,0 +1,133 @@
+import sys
+import os
+import time
+import random
+import tempfile
+from mutation_log import MutationLog
+from benchmark import get_input_from_file, create_dict, input_sizes, valid_approaches
+
+group_sizes = [1, 8, 64, 512]
+num_of_mutations = 5000
+log_lengths = [1000, 10000, 50000]
+tail_length = 1000
+
+
+def display_usage():
+    print('python3 wal_benchmark.py', '<approach> [input size]')
+    print('where <approach> = <' + ' | '.join(valid_approaches) + '>')
+    print('and [input size] = <' + ' | '.join(input_sizes) + '> (default 10k)')
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv
+
+    if len(args) not in [2, 3] or args[1] not in valid_approaches or (len(args) == 3 and args[2] not in input_sizes):
+        display_usage()
+
+    approach = args[1]
+    base_data_path = "input/input_" + (args[2] if len(args) == 3 else '10k')
+
+    with tempfile.TemporaryDirectory() as log_directory:
+        print("#### MUTATION THROUGHPUT ####")
+        print("{:<12} {:<16}".format('Group Size', 'Mutations/s'))
+        print("{:<12} {:<16}".format('no log', round(measure_throughput(approach, base_data_path, None), 1)))
+
+        for group_size in group_sizes:
+            log_path = os.path.join(log_directory, 'throughput' + str(group_size) + '.log')
+            print("{:<12} {:<16}".format(group_size, round(measure_throughput(approach, base_data_path, log_path,
+                                                                              group_size), 1)))
+
+        print("\n#### RECOVERY TIME ####")
+        print("{:<12} {:<20} {:<24}".format('Log Length', 'Full Replay {s}', 'Checkpoint + Tail {s}'))
+
+        for log_length in log_lengths:
+            log_path = os.path.join(log_directory, 'recovery' + str(log_length) + '.log')
+            full_replay, checkpoint_and_tail = measure_recovery(approach, base_data_path, log_path, log_length)
+            print("{:<12} {:<20} {:<24}".format(log_length, round(full_replay, 4), round(checkpoint_and_tail, 4)))
+
+
+def get_mutations(base_data_path: str, count: int) -> list:
+    # Alternating adds of new words and deletes of words that are present, so that every mutation succeeds and is
+    # logged.
+    random.seed(0)
+    present_words = [word_freq.word for word_freq in get_input_from_file(base_data_path, True)]
+    new_words = get_input_from_file("input/input_adds", True)
+    mutations = []
+
+    for i in range(0, count):
+        if i % 2 == 0:
+            word_freq = new_words[(i // 2) % len(new_words)]
+            mutations.append(('A', word_freq))
+            present_words.append(word_freq.word)
+        else:
+            index = random.randint(0, len(present_words) - 1)
+            present_words[index], present_words[-1] = present_words[-1], present_words[index]
+            mutations.append(('D', present_words.pop()))
+
+    return mutations
+
+
+def apply_mutations(dictionary, mutation_log: MutationLog, mutations: list):
+    for command, argument in mutations:
+        if command == 'A':
+            if dictionary.add_word_frequency(argument) and mutation_log is not None:
+                mutation_log.log_add(argument)
+        elif dictionary.delete_word(argument) and mutation_log is not None:
+            mutation_log.log_delete(argument)
+
+
+def measure_throughput(approach: str, base_data_path: str, log_path, group_size: int = 1) -> float:
+    dictionary = create_dict(approach)
+    mutation_log = None
+
+    if log_path is None:
+        dictionary.build_dictionary(get_input_from_file(base_data_path, True))
+    else:
+        mutation_log = MutationLog(log_path, base_data_path, group_size, checkpoint_interval=num_of_mutations + 1)
+        mutation_log.recover(dictionary)
+
+    mutations = get_mutations(base_data_path, num_of_mutations)
+    start = time.perf_counter()
+    apply_mutations(dictionary, mutation_log, mutations)
+
+    if mutation_log is not None:
+        mutation_log.close()
+
+    return num_of_mutations / (time.perf_counter() - start)
+
+
+def measure_recovery(approach: str, base_data_path: str, log_path: str, log_length: int):
+    # Recovery from a log of 'log_length' mutations that was never checkpointed, against recovery after those
+    # mutations were folded into a checkpoint and only a short tail was logged since.
+    mutations = get_mutations(base_data_path, log_length + tail_length)
+    mutation_log = MutationLog(log_path, base_data_path, 512, checkpoint_interval=log_length + tail_length + 1)
+    dictionary = create_dict(approach)
+    mutation_log.recover(dictionary)
+    apply_mutations(dictionary, mutation_log, mutations[0:log_length])
+    mutation_log.close()
+
+    full_replay = time_recovery(approach, log_path, base_data_path)
+
+    mutation_log = MutationLog(log_path, base_data_path, 512, checkpoint_interval=log_length + tail_length + 1)
+    dictionary = create_dict(approach)
+    mutation_log.recover(dictionary)
+    mutation_log.checkpoint()
+    apply_mutations(dictionary, mutation_log, mutations[log_length:])
+    mutation_log.close()
+
+    return full_replay, time_recovery(approach, log_path, base_data_path)
+
+
+def time_recovery(approach: str, log_path: str, base_data_path: str) -> float:
+    start = time.perf_counter()
+    mutation_log = MutationLog(log_path, base_data_path)
+    mutation_log.recover(create_dict(approach))
+    running_time = time.perf_counter() - start
+    mutation_log.close()
+
+    return running_time
+
+
+if __name__ == '__main__':
+    main()